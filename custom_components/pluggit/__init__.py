@@ -5,11 +5,36 @@ import logging
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.helpers.typing import ConfigType
 
-from .const import CONFIG_HOST, DOMAIN, SERIAL_NUMBER
+from .const import (
+    CAPTURE,
+    CONFIG_HOST,
+    CONFIG_PROXY_MAX_AGE,
+    CONFIG_PROXY_PORT,
+    CONFIG_PROFILES,
+    DEVICE_INFO,
+    DOMAIN,
+    POLLER,
+    PROXY,
+    REFRESH,
+    RELOAD_OPTIONS,
+    SERIAL_NUMBER,
+    UNREADABLE_INDEX,
+)
 from .pypluggit.pluggit import Pluggit
+from .pypluggit.poller import Poller
+from .pypluggit.proxy import ModbusProxy
+from .pypluggit.unreadable import UnreadableIndex
+from .refresh import PluggitRefresh
+from .services import async_setup_services
+from .util import device_info, help_time
+from .websocket_api import async_setup_websocket
 
 PLATFORMS = [
+    Platform.BINARY_SENSOR,
     Platform.BUTTON,
     Platform.FAN,
     Platform.NUMBER,
@@ -21,17 +46,57 @@ PLATFORMS = [
 ]
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up pluggit services."""
+
+    async_setup_services(hass)
+    async_setup_websocket(hass)
+
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up pluggit from a config entry."""
 
     hass.data.setdefault(DOMAIN, {})
+    index = hass.data.setdefault(
+        UNREADABLE_INDEX,
+        UnreadableIndex(hass.config.path(STORAGE_DIR, "pluggit.unreadable")),
+    )
 
+    pluggit = Pluggit(
+        entry.data[CONFIG_HOST], local_time=help_time, unreadable_index=index
+    )
+    # Shared by every entity instead of one DeviceInfo each.
+    device = await hass.async_add_executor_job(
+        device_info, pluggit, entry.data[SERIAL_NUMBER]
+    )
+    poller = Poller(pluggit)
     hass.data[DOMAIN][entry.entry_id] = {
-        DOMAIN: Pluggit(entry.data[CONFIG_HOST]),
+        DOMAIN: pluggit,
         SERIAL_NUMBER: entry.data[SERIAL_NUMBER],
+        DEVICE_INFO: device,
+        POLLER: poller,
+        REFRESH: PluggitRefresh(hass, poller),
+        RELOAD_OPTIONS: reload_options(entry),
     }
 
+    if port := entry.options.get(CONFIG_PROXY_PORT):
+        proxy = ModbusProxy(
+            pluggit, port=port, max_age=entry.options.get(CONFIG_PROXY_MAX_AGE, 30)
+        )
+        try:
+            await proxy.start()
+        except OSError as err:
+            _LOGGER.error("Modbus proxy can't listen on port %s: %s", port, err)
+        else:
+            hass.data[DOMAIN][entry.entry_id][PROXY] = proxy
+
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     return True
@@ -43,6 +108,30 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        if CAPTURE in data:
+            data[CAPTURE].set()
+        if PROXY in data:
+            await data[PROXY].stop()
+        await hass.async_add_executor_job(data[POLLER].stop)
+        await hass.async_add_executor_job(data[DOMAIN].close)
 
     return unload_ok
+
+
+def reload_options(entry: ConfigEntry) -> dict:
+    """Get the options the entry has to be reloaded for."""
+    return {
+        key: value for key, value in entry.options.items() if key != CONFIG_PROFILES
+    }
+
+
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload pluggit config entry after its settings changed.
+
+    Saving a profile changes the options too, that doesn't need a reload.
+    """
+
+    data = hass.data[DOMAIN].get(entry.entry_id)
+    if data is not None and data[RELOAD_OPTIONS] != reload_options(entry):
+        await hass.config_entries.async_reload(entry.entry_id)
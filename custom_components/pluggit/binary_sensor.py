@@ -0,0 +1,149 @@
+"""Binary sensors."""
+
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import ANOMALY, DEVICE_INFO, DOMAIN, POLLER, SERIAL_NUMBER
+from .pypluggit.anomaly import CHANNELS, PROBLEMS, AnomalyDetector, sample_row
+from .pypluggit.const import Registers
+from .pypluggit.poller import Poller
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds between samples of the anomaly detection.
+ANOMALY_INTERVAL = 30
+
+ICONS = {
+    "tacho_imbalance": "mdi:fan-alert",
+    "rpm_drift": "mdi:chart-bell-curve-cumulative",
+    "temperature_implausible": "mdi:thermometer-alert",
+}
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddConfigEntryEntitiesCallback,
+) -> None:
+    """Set up binary sensors from a config entry."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    poller: Poller = data[POLLER]
+    device = data[DEVICE_INFO]
+
+    sensors = [
+        PluggitProblemSensor(
+            problem=problem, serial_number=data[SERIAL_NUMBER], device=device
+        )
+        for problem in PROBLEMS
+    ]
+    async_add_entities(sensors)
+
+    if (anomalies := hass.data.get(ANOMALY)) is None:
+        anomalies = hass.data[ANOMALY] = PluggitAnomalies(hass)
+    entry.async_on_unload(anomalies.add_unit(entry.entry_id, poller, sensors))
+
+
+class PluggitAnomalies:
+    """Anomaly detection of all loaded units in one detector.
+
+    Every unit's poller hands its samples over, and one update per
+    ANOMALY_INTERVAL checks all units in the same array operations and
+    sets the problem sensors of each unit.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialise anomaly detection."""
+        self._hass = hass
+        self.detector = AnomalyDetector(units=0)
+        self._sensors: dict[str, list[PluggitProblemSensor]] = {}
+        self._samples: dict[str, list[float]] = {}
+        self._cancel: Callable[[], None] | None = None
+
+    @callback
+    def add_unit(
+        self, entry_id: str, poller: Poller, sensors: list["PluggitProblemSensor"]
+    ) -> Callable[[], None]:
+        """Check the samples of a unit, return remove."""
+
+        def sample(values: dict[Registers, Any]) -> None:
+            """Hand a sample from the poller thread to the event loop."""
+            row = sample_row(values)
+            self._hass.loop.call_soon_threadsafe(self._add, entry_id, row)
+
+        unsubscribe = poller.subscribe(
+            CHANNELS, sample, ANOMALY_INTERVAL, changes_only=False
+        )
+        self._sensors[entry_id] = sensors
+        self.detector.add(entry_id)
+        if self._cancel is None:
+            self._cancel = async_track_time_interval(
+                self._hass, self._async_update, timedelta(seconds=ANOMALY_INTERVAL)
+            )
+
+        @callback
+        def remove() -> None:
+            unsubscribe()
+            del self._sensors[entry_id]
+            self._samples.pop(entry_id, None)
+            self.detector.remove(entry_id)
+            if not self._sensors:
+                if self._cancel is not None:
+                    self._cancel()
+                    self._cancel = None
+                self._hass.data.pop(ANOMALY, None)
+
+        return remove
+
+    @callback
+    def _add(self, entry_id: str, row: list[float]) -> None:
+        if entry_id in self._sensors:
+            self._samples[entry_id] = row
+
+    @callback
+    def _async_update(self, _now: datetime) -> None:
+        if not self._samples:
+            return
+        samples, self._samples = self._samples, {}
+        problems = self.detector.update_units(samples)
+        for entry_id, sensors in self._sensors.items():
+            for sensor, problem in zip(sensors, problems[entry_id], strict=True):
+                if sensor.is_on is not bool(problem):
+                    sensor.set_problem(bool(problem))
+
+
+class PluggitProblemSensor(BinarySensorEntity):
+    """Problem found by the anomaly detection."""
+
+    _attr_should_poll = False
+
+    def __init__(self, problem: str, serial_number: int, device: DeviceInfo) -> None:
+        """Initialise problem sensor."""
+
+        self._attr_unique_id = f"{serial_number}_{problem}"
+        self._attr_translation_key = problem
+        self._attr_icon = ICONS[problem]
+        self._attr_has_entity_name = True
+        self._attr_device_class = BinarySensorDeviceClass.PROBLEM
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_is_on = None
+        self._attr_device_info = device
+
+    @callback
+    def set_problem(self, is_on: bool) -> None:
+        """Set the state from the last check."""
+        self._attr_is_on = is_on
+        if self.hass is not None:
+            self.async_write_ha_state()
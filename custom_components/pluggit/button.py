@@ -10,10 +10,10 @@ from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
-from homeassistant.util.dt import as_timestamp, now
 
-from .const import DOMAIN, SERIAL_NUMBER
+from .const import DEVICE_INFO, DOMAIN
 from .pypluggit.pluggit import Pluggit
+from .util import help_time
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -49,12 +49,6 @@ BUTTONS: tuple[PluggitButtonEntityDescription, ...] = (
 )
 
 
-def help_time() -> int:
-    """Get local time in seconds."""
-    time = now()
-    return int(as_timestamp(time) + time.utcoffset().total_seconds())
-
-
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -63,13 +57,11 @@ async def async_setup_entry(
     """Set up buttons from a config entry."""
     data = hass.data[DOMAIN][entry.entry_id]
     pluggit: Pluggit = data[DOMAIN]
-    serial_number = data[SERIAL_NUMBER]
+    device = data[DEVICE_INFO]
 
     async_add_entities(
         (
-            PluggitButton(
-                pluggit=pluggit, serial_number=serial_number, description=description
-            )
+            PluggitButton(pluggit=pluggit, device=device, description=description)
             for description in BUTTONS
         ),
         update_before_add=True,
@@ -82,20 +74,17 @@ class PluggitButton(ButtonEntity):
     def __init__(
         self,
         pluggit: Pluggit,
-        serial_number: int,
+        device: DeviceInfo,
         description: PluggitButtonEntityDescription,
     ) -> None:
         """Initialise Pluggit button."""
         self._pluggit = pluggit
         self.entity_description = description
-        self._serial_number = str(serial_number)
         self._attr_unique_id = description.key
         self._attr_entity_category = EntityCategory.CONFIG
         self._attr_has_entity_name = True
         self._attr_available = False
-        self._attr_device_info = DeviceInfo(
-            name="Pluggit", identifiers={(DOMAIN, self._serial_number)}
-        )
+        self._attr_device_info = device
 
     def press(self) -> None:
         """Handle the button press."""
@@ -5,9 +5,29 @@ from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
-
-from .const import CONFIG_HOST, DOMAIN, SERIAL_NUMBER
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.core import callback
+
+from .const import (
+    CONFIG_BOOST_HUMIDITY_OFF,
+    CONFIG_BOOST_HUMIDITY_ON,
+    CONFIG_BOOST_INTERVAL,
+    CONFIG_BOOST_LEVEL,
+    CONFIG_BOOST_MIN_OFF,
+    CONFIG_BOOST_MIN_ON,
+    CONFIG_BOOST_VOC_OFF,
+    CONFIG_BOOST_VOC_ON,
+    CONFIG_HOST,
+    CONFIG_PROXY_MAX_AGE,
+    CONFIG_PROXY_PORT,
+    DOMAIN,
+    SERIAL_NUMBER,
+)
 from .pypluggit.pluggit import Pluggit
 
 _LOGGER = logging.getLogger(__name__)
@@ -19,7 +39,10 @@ async def validate_input(data: dict[str, Any]) -> str:
     host = data[CONFIG_HOST]
     pluggit = Pluggit(host)
 
-    return pluggit.get_serial_number()
+    try:
+        return pluggit.get_serial_number()
+    finally:
+        pluggit.close()
 
 
 class PluggitConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -31,6 +54,12 @@ class PluggitConfigFlow(ConfigFlow, domain=DOMAIN):
         {vol.Required(CONFIG_HOST, description={"suggested_value": "192.168.0.1"}): str}
     )
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow."""
+        return PluggitOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -67,3 +96,69 @@ class PluggitConfigFlow(ConfigFlow, domain=DOMAIN):
         return self.async_show_form(
             step_id="reconfigure", data_schema=self.STEP_USER_DATA_SCHEMA, errors=errors
         )
+
+
+class PluggitOptionsFlow(OptionsFlow):
+    """Options flow for Pluggit."""
+
+    STEP_INIT_DATA_SCHEMA = vol.Schema(
+        {
+            vol.Required(CONFIG_PROXY_PORT, default=0): vol.All(
+                int, vol.Range(min=0, max=65535)
+            ),
+            vol.Required(CONFIG_PROXY_MAX_AGE, default=30): vol.All(
+                int, vol.Range(min=0, max=3600)
+            ),
+            vol.Required(CONFIG_BOOST_HUMIDITY_ON, default=70): vol.All(
+                int, vol.Range(min=0, max=100)
+            ),
+            vol.Required(CONFIG_BOOST_HUMIDITY_OFF, default=60): vol.All(
+                int, vol.Range(min=0, max=100)
+            ),
+            vol.Required(CONFIG_BOOST_VOC_ON, default=1200): vol.All(
+                int, vol.Range(min=0, max=10000)
+            ),
+            vol.Required(CONFIG_BOOST_VOC_OFF, default=900): vol.All(
+                int, vol.Range(min=0, max=10000)
+            ),
+            vol.Required(CONFIG_BOOST_LEVEL, default=3): vol.All(
+                int, vol.Range(min=1, max=4)
+            ),
+            vol.Required(CONFIG_BOOST_MIN_ON, default=300): vol.All(
+                int, vol.Range(min=0, max=7200)
+            ),
+            vol.Required(CONFIG_BOOST_MIN_OFF, default=60): vol.All(
+                int, vol.Range(min=0, max=7200)
+            ),
+            vol.Required(CONFIG_BOOST_INTERVAL, default=5): vol.All(
+                int, vol.Range(min=1, max=60)
+            ),
+        }
+    )
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Show form for the Modbus proxy and the humidity boost."""
+        errors = {}
+
+        if user_input is not None:
+            # Without a gap between the thresholds the boost would chatter.
+            for on, off in (
+                (CONFIG_BOOST_HUMIDITY_ON, CONFIG_BOOST_HUMIDITY_OFF),
+                (CONFIG_BOOST_VOC_ON, CONFIG_BOOST_VOC_OFF),
+            ):
+                if user_input[off] >= user_input[on]:
+                    errors[off] = "off_not_below_on"
+            if not errors:
+                return self.async_create_entry(
+                    data={**self.config_entry.options, **user_input}
+                )
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                self.STEP_INIT_DATA_SCHEMA, user_input or self.config_entry.options
+            ),
+            errors=errors,
+        )
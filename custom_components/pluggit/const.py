@@ -3,3 +3,24 @@
 DOMAIN = "pluggit"
 CONFIG_HOST = "host"
 SERIAL_NUMBER = "serial_number"
+CONFIG_PROXY_PORT = "proxy_port"
+CONFIG_PROXY_MAX_AGE = "proxy_max_age"
+CONFIG_PROFILES = "profiles"
+CONFIG_BOOST_HUMIDITY_ON = "boost_humidity_on"
+CONFIG_BOOST_HUMIDITY_OFF = "boost_humidity_off"
+CONFIG_BOOST_VOC_ON = "boost_voc_on"
+CONFIG_BOOST_VOC_OFF = "boost_voc_off"
+CONFIG_BOOST_LEVEL = "boost_level"
+CONFIG_BOOST_MIN_ON = "boost_min_on"
+CONFIG_BOOST_MIN_OFF = "boost_min_off"
+CONFIG_BOOST_INTERVAL = "boost_interval"
+ANOMALY = "pluggit_anomaly"
+CAPTURE = "capture"
+DEVICE_INFO = "device_info"
+FLEET = "pluggit_fleet"
+POLLER = "poller"
+PROFILER = "pluggit_profiler"
+PROXY = "proxy"
+REFRESH = "refresh"
+RELOAD_OPTIONS = "reload_options"
+UNREADABLE_INDEX = "pluggit_unreadable"
@@ -1,7 +1,6 @@
 """Fan."""
 
 import logging
-import time
 from typing import Any
 
 from homeassistant.components.fan import FanEntity, FanEntityFeature
@@ -14,7 +13,7 @@ from homeassistant.util.percentage import (
     percentage_to_ordered_list_item,
 )
 
-from .const import DOMAIN, SERIAL_NUMBER
+from .const import DEVICE_INFO, DOMAIN
 from .pypluggit.const import CURRENT_UNIT_MODE, ActiveUnitMode, SpeedLevelFan
 from .pypluggit.pluggit import Pluggit
 
@@ -29,19 +28,9 @@ async def async_setup_entry(
     """Set up fan from a config entry."""
     data = hass.data[DOMAIN][entry.entry_id]
     pluggit: Pluggit = data[DOMAIN]
-    serial_num = data[SERIAL_NUMBER]
-
-    device = DeviceInfo(
-        identifiers={(DOMAIN, str(serial_num))},
-        name="Pluggit",
-        manufacturer="Pluggit",
-        model=pluggit.get_unit_type(),
-        sw_version=pluggit.get_firmware_version(),
-        serial_number=serial_num,
-    )
 
     async_add_entities(
-        [PluggitFan(pluggit=pluggit, device=device)], update_before_add=True
+        [PluggitFan(pluggit=pluggit, device=data[DEVICE_INFO])], update_before_add=True
     )
 
 
@@ -80,20 +69,9 @@ class PluggitFan(FanEntity):
         )
 
     def __set_unit_mode(self, mode: ActiveUnitMode, speed: SpeedLevelFan | None = None):
-        if self._currentMode is not mode:
-            if self._currentMode == CURRENT_UNIT_MODE[6]:
-                self._pluggit.set_unit_mode(ActiveUnitMode.END_SUMMER_MODE)
-            elif self._currentMode == CURRENT_UNIT_MODE[9]:
-                self._pluggit.set_unit_mode(ActiveUnitMode.END_FIREPLACE_MODE)
-
-            time.sleep(100 / 1000)
-            self._pluggit.set_unit_mode(mode=mode)
-
-        if speed is not None:
-            time.sleep(100 / 1000)
-            ret = self._pluggit.get_current_unit_mode()
-            if ret == CURRENT_UNIT_MODE[1]:
-                self._pluggit.set_speed_level(speed=speed)
+        ret = self._pluggit.transition_to(mode=mode, speed=speed)
+        if ret is not None:
+            self._currentMode = ret
 
     @property
     def is_on(self) -> bool | None:
@@ -155,6 +133,11 @@ class PluggitFan(FanEntity):
         if percentage == 0:
             named_speed = SpeedLevelFan.LEVEL_0
 
+        if self._currentMode == CURRENT_UNIT_MODE[1]:
+            # Already manual, the debounced speed write is enough.
+            self._pluggit.set_speed_level(speed=named_speed)
+            return
+
         self.__set_unit_mode(mode=ActiveUnitMode.MANUAL_MODE, speed=named_speed)
 
     @property
@@ -192,9 +175,6 @@ class PluggitFan(FanEntity):
 
     def update(self) -> None:
         """Fetch data for fan."""
-        # If a preset mode is set, there is an update. But this update is to fast,
-        # the mode on the device isn't ready. So we wait here 100ms.
-        time.sleep(100 / 1000)
         try:
             self._speedLevel = SpeedLevelFan(self._pluggit.get_speed_level())
         except ValueError:
@@ -17,7 +17,7 @@ from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity import StateType
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
-from .const import DOMAIN, SERIAL_NUMBER
+from .const import DEVICE_INFO, DOMAIN
 from .pypluggit.pluggit import Pluggit
 
 _LOGGER = logging.getLogger(__name__)
@@ -114,13 +114,11 @@ async def async_setup_entry(
     """Set up numbers from a config entry."""
     data = hass.data[DOMAIN][entry.entry_id]
     pluggit: Pluggit = data[DOMAIN]
-    serial_number = data[SERIAL_NUMBER]
+    device = data[DEVICE_INFO]
 
     async_add_entities(
         (
-            PluggitSensor(
-                pluggit=pluggit, serial_number=serial_number, description=description
-            )
+            PluggitSensor(pluggit=pluggit, device=device, description=description)
             for description in NUMBERS
         ),
         update_before_add=True,
@@ -133,20 +131,17 @@ class PluggitSensor(NumberEntity):
     def __init__(
         self,
         pluggit: Pluggit,
-        serial_number: int,
+        device: DeviceInfo,
         description: PluggitNumberEntityDescription,
     ) -> None:
         """Initialise Pluggit sensor."""
         self._pluggit = pluggit
         self.entity_description = description
-        self._serial_number = str(serial_number)
         self._attr_unique_id = description.key
         self._attr_has_entity_name = True
         self._attr_entity_category = EntityCategory.CONFIG
         self._attr_available = False
-        self._attr_device_info = DeviceInfo(
-            name="Pluggit", identifiers={(DOMAIN, self._serial_number)}
-        )
+        self._attr_device_info = device
 
     def set_native_value(self, value: float) -> None:
         """Update the current value."""
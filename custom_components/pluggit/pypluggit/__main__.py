@@ -0,0 +1,185 @@
+"""Command line tool for pypluggit.
+
+    python -m pypluggit HOST dump
+    python -m pypluggit HOST watch --interval 1 --format csv PRM_RAM_IDX_T1 unit_mode
+    python -m pypluggit HOST set PRM_BYPASS_TMIN=13.5 PRM_BYPASS_TMAX=24
+    python -m pypluggit HOST capture --duration 120 --rate 10 balancing.pgcap
+"""
+
+import argparse
+from dataclasses import asdict
+import csv
+from enum import Enum
+import json
+from pathlib import Path
+import sys
+import threading
+import time
+from typing import Any
+
+from .capture import capture
+from .codec import check
+from .const import REGISTER_DIC, Registers
+from .fields import FIELDS, key_value
+from .pluggit import Pluggit
+from .poller import Poller
+from .trace import ReplayClient
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.name
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _key(name: str) -> Registers | str:
+    if name in FIELDS:
+        return name
+    try:
+        return Registers[name]
+    except KeyError:
+        raise argparse.ArgumentTypeError(f"unknown register or field {name}") from None
+
+
+def _assignment(text: str) -> tuple[Registers, int | float]:
+    name, sep, value = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, got {text}")
+    try:
+        register = Registers[name]
+    except KeyError:
+        raise argparse.ArgumentTypeError(f"unknown register {name}") from None
+    try:
+        number: int | float = int(value, 0)
+    except ValueError:
+        try:
+            number = float(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid value {value}") from None
+    try:
+        return register, check(register, number)
+    except ValueError as err:
+        raise argparse.ArgumentTypeError(str(err)) from None
+
+
+def _key_name(key: Registers | str) -> str:
+    return key.name if isinstance(key, Registers) else key
+
+
+def dump(pluggit: Pluggit, args: argparse.Namespace) -> int:
+    """Print every known register and field as JSON."""
+    values = pluggit.read_registers(REGISTER_DIC)
+    if not values:
+        print("No register could be read", file=sys.stderr)
+        return 1
+
+    ret = {
+        "registers": {register.name: values.get(register) for register in Registers},
+        "fields": {name: key_value(name, values) for name in FIELDS},
+    }
+    json.dump(ret, sys.stdout, indent=2, default=_json_default)
+    print()
+    return 0
+
+
+def watch(pluggit: Pluggit, args: argparse.Namespace) -> int:
+    """Stream changed values until interrupted."""
+    keys = args.keys or list(Registers)
+    names = [_key_name(key) for key in keys]
+    out = sys.stdout
+
+    if args.format == "csv":
+        writer = csv.writer(out)
+        writer.writerow(["time", *names])
+        row: dict[Registers | str, Any] = {}
+
+        def write(changes: dict[Registers | str, Any]) -> None:
+            row.update(changes)
+            writer.writerow([f"{time.time():.3f}", *(row.get(key) for key in keys)])
+            out.flush()
+
+    else:
+
+        def write(changes: dict[Registers | str, Any]) -> None:
+            sample = {_key_name(key): value for key, value in changes.items()}
+            sample["time"] = round(time.time(), 3)
+            out.write(json.dumps(sample, default=_json_default) + "\n")
+            out.flush()
+
+    poller = Poller(pluggit)
+    poller.subscribe(keys, write, interval=args.interval)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        poller.stop()
+    return 0
+
+
+def set_values(pluggit: Pluggit, args: argparse.Namespace) -> int:
+    """Write all assignments in one job."""
+    if not pluggit.write_registers(dict(args.values)):
+        print("Writing failed", file=sys.stderr)
+        return 1
+    return 0
+
+
+def capture_file(pluggit: Pluggit, args: argparse.Namespace) -> int:
+    """Capture at a high rate into a file, print the timing."""
+    data, stats = capture(pluggit, args.duration, args.rate)
+    data.save(args.out)
+    print(json.dumps(asdict(stats)), file=sys.stderr)
+    return 0 if len(data) else 1
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the command line tool."""
+    parser = argparse.ArgumentParser(
+        prog="pypluggit",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--record", type=Path, help="record the traffic to a trace")
+    parser.add_argument("--replay", type=Path, help="answer from a trace, no unit")
+    parser.add_argument(
+        "--speed", type=float, default=None, help="replay at recorded timing / SPEED"
+    )
+    parser.add_argument("host", help="address of the Pluggit unit")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("dump", help="read all registers as JSON").set_defaults(
+        func=dump
+    )
+
+    watch_parser = commands.add_parser("watch", help="stream changed values")
+    watch_parser.add_argument("--interval", type=float, default=1.0)
+    watch_parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    watch_parser.add_argument(
+        "keys", nargs="*", type=_key, help="registers or fields, default all registers"
+    )
+    watch_parser.set_defaults(func=watch)
+
+    set_parser = commands.add_parser("set", help="write registers in one job")
+    set_parser.add_argument("values", nargs="+", type=_assignment, metavar="NAME=VALUE")
+    set_parser.set_defaults(func=set_values)
+
+    capture_parser = commands.add_parser("capture", help="sample at a high rate")
+    capture_parser.add_argument("--duration", type=float, default=60.0)
+    capture_parser.add_argument("--rate", type=float, default=10.0)
+    capture_parser.add_argument("out", type=Path)
+    capture_parser.set_defaults(func=capture_file)
+
+    args = parser.parse_args(argv)
+    client = None
+    if args.replay is not None:
+        client = ReplayClient(args.replay, speed=args.speed, loop=True)
+    pluggit = Pluggit(args.host, client=client, trace=args.record)
+    try:
+        return args.func(pluggit, args)
+    finally:
+        pluggit.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""Fan and temperature anomaly detection for pypluggit."""
+
+from collections.abc import Hashable, Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from .const import Registers, SpeedLevelFan
+
+CHANNELS = (
+    Registers.PRM_HAL_TAHO_1,
+    Registers.PRM_HAL_TAHO_2,
+    Registers.PRM_RAM_IDX_T1,
+    Registers.PRM_RAM_IDX_T2,
+    Registers.PRM_RAM_IDX_T3,
+    Registers.PRM_RAM_IDX_T4,
+    Registers.PRM_ROM_IDX_SPEED_LEVEL,
+)
+_TAHO = slice(0, 2)
+_T1, _T2, _T3, _T4, _LEVEL = 2, 3, 4, 5, 6
+
+PROBLEMS = ("tacho_imbalance", "rpm_drift", "temperature_implausible")
+
+_LEVELS = len(SpeedLevelFan)
+# Per unit state below the window, with the value a new unit starts at.
+_STATE = {
+    "_sums": 0.0,
+    "_counts": 0.0,
+    "_last": np.nan,
+    "_fast": 0.0,
+    "_slow": 0.0,
+    "_level_samples": 0.0,
+    "problems": False,
+}
+
+
+@dataclass(frozen=True)
+class AnomalySettings:
+    """Thresholds of the anomaly checks."""
+
+    window: int = 60
+    # Relative difference of the two fans' mean rpm.
+    max_imbalance: float = 0.25
+    # Relative difference of recent and long term rpm at one speed level.
+    max_drift: float = 0.15
+    # Samples at one speed level before its baseline is trusted.
+    drift_warmup: int = 500
+    fast_alpha: float = 0.05
+    slow_alpha: float = 0.002
+    # Below this rpm a fan counts as stopped and isn't checked.
+    min_rpm: float = 300
+    # Kelvin between the heat the supply gains and the extract loses.
+    max_balance: float = 6.0
+    # Kelvin a temperature may move between two samples.
+    max_jump: float = 8.0
+    min_temperature: float = -40.0
+    max_temperature: float = 70.0
+
+
+def sample_row(values: Mapping[Registers, Any]) -> list[float]:
+    """Get the channels of one unit's sample, NaN where missing."""
+    return [np.nan if values.get(r) is None else float(values[r]) for r in CHANNELS]
+
+
+class AnomalyDetector:
+    """Rolling statistics and checks over many units at once.
+
+    update takes one sample of every unit as a row and costs the same
+    handful of array operations no matter how long the window is: the
+    window means are running sums, the per speed level rpm baselines are
+    exponential averages indexed by each unit's current level. Units
+    added by key get the rows after the units given to init, so many
+    devices share one detector and update_units checks them all at once.
+    """
+
+    def __init__(self, units: int = 1, settings: AnomalySettings | None = None) -> None:
+        """Init detector for units."""
+        self.settings = settings = settings or AnomalySettings()
+        channels = len(CHANNELS)
+        self._window = np.full((settings.window, units, channels), np.nan)
+        self._pos = 0
+        self._sums = np.zeros((units, channels))
+        self._counts = np.zeros((units, channels))
+        self._last = np.full((units, channels), np.nan)
+        self._fast = np.zeros((units, _LEVELS, 2))
+        self._slow = np.zeros((units, _LEVELS, 2))
+        self._level_samples = np.zeros((units, _LEVELS))
+        self.problems = np.zeros((units, len(PROBLEMS)), dtype=bool)
+        self._rows: dict[Hashable, int] = {}
+
+    def add(self, unit: Hashable) -> None:
+        """Add a row for unit with no history, known units are kept."""
+        if unit in self._rows:
+            return
+        self._rows[unit] = len(self.problems)
+        empty = np.full((self.settings.window, 1, len(CHANNELS)), np.nan)
+        self._window = np.concatenate((self._window, empty), axis=1)
+        for name, fill in _STATE.items():
+            state = getattr(self, name)
+            row = np.full((1, *state.shape[1:]), fill, dtype=state.dtype)
+            setattr(self, name, np.concatenate((state, row)))
+
+    def remove(self, unit: Hashable) -> None:
+        """Forget unit and its history."""
+        if (row := self._rows.pop(unit, None)) is None:
+            return
+        self._window = np.delete(self._window, row, axis=1)
+        for name in _STATE:
+            setattr(self, name, np.delete(getattr(self, name), row, axis=0))
+        for other, index in self._rows.items():
+            if index > row:
+                self._rows[other] = index - 1
+
+    def update_units(
+        self, samples: Mapping[Hashable, Iterable[float]]
+    ) -> dict[Hashable, np.ndarray]:
+        """Add a sample row of added units, return problems by unit.
+
+        Units without a sample in samples get a row of NaN.
+        """
+        rows = np.full((len(self.problems), len(CHANNELS)), np.nan)
+        for unit, sample in samples.items():
+            rows[self._rows[unit]] = list(sample)
+        problems = self.update(rows)
+        return {unit: problems[row] for unit, row in self._rows.items()}
+
+    def update(self, samples: np.ndarray | Iterable[Iterable[float]]) -> np.ndarray:
+        """Add one row of CHANNELS per unit, return problems per unit."""
+        settings = self.settings
+        samples = np.asarray(samples, dtype=float)
+        valid = ~np.isnan(samples)
+
+        old = self._window[self._pos]
+        old_valid = ~np.isnan(old)
+        self._sums += np.where(valid, samples, 0) - np.where(old_valid, old, 0)
+        self._counts += valid.astype(float) - old_valid
+        self._window[self._pos] = samples
+        self._pos = (self._pos + 1) % settings.window
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = self._sums / self._counts
+        warm = self._counts >= settings.window // 2
+
+        # Both fans run at the same nominal speed.
+        taho = mean[:, _TAHO]
+        running = np.all(taho >= settings.min_rpm, axis=1) & np.all(
+            warm[:, _TAHO], axis=1
+        )
+        with np.errstate(invalid="ignore", divide="ignore"):
+            imbalance = np.abs(taho[:, 0] - taho[:, 1]) / taho.mean(axis=1)
+        self.problems[:, 0] = running & (imbalance > settings.max_imbalance)
+
+        self.problems[:, 1] = self._drift(samples, valid)
+
+        temps = samples[:, _T1 : _T4 + 1]
+        out_of_range = np.any(
+            (temps < settings.min_temperature) | (temps > settings.max_temperature),
+            axis=1,
+        )
+        with np.errstate(invalid="ignore"):
+            jump = np.any(
+                np.abs(temps - self._last[:, _T1 : _T4 + 1]) > settings.max_jump, axis=1
+            )
+        # Supply gains about what extract loses in the heat exchanger.
+        balance = np.abs(
+            (mean[:, _T2] - mean[:, _T1]) - (mean[:, _T3] - mean[:, _T4])
+        )
+        balanced = np.all(warm[:, _T1 : _T4 + 1], axis=1) & running
+        self.problems[:, 2] = (
+            out_of_range | jump | (balanced & (balance > settings.max_balance))
+        )
+
+        self._last = np.where(valid, samples, self._last)
+        return self.problems
+
+    def _drift(self, samples: np.ndarray, valid: np.ndarray) -> np.ndarray:
+        settings = self.settings
+        units = np.arange(samples.shape[0])
+        usable = (
+            valid[:, _LEVEL]
+            & np.all(valid[:, _TAHO], axis=1)
+            & np.all(samples[:, _TAHO] >= settings.min_rpm, axis=1)
+        )
+        level = np.clip(np.nan_to_num(samples[:, _LEVEL]), 0, _LEVELS - 1).astype(int)
+        units, level = units[usable], level[usable]
+        taho = samples[usable, _TAHO]
+
+        count = self._level_samples[units, level]
+        first = (count == 0)[:, None]
+        fast = self._fast[units, level]
+        slow = self._slow[units, level]
+        self._fast[units, level] = np.where(
+            first, taho, fast + settings.fast_alpha * (taho - fast)
+        )
+        self._slow[units, level] = np.where(
+            first, taho, slow + settings.slow_alpha * (taho - slow)
+        )
+        self._level_samples[units, level] = count + 1
+
+        # Units without a usable sample keep their flag.
+        ret = self.problems[:, 1].copy()
+        fast = self._fast[units, level]
+        slow = self._slow[units, level]
+        drift = np.max(np.abs(fast - slow) / slow, axis=1)
+        ret[units] = (count + 1 >= settings.drift_warmup) & (drift > settings.max_drift)
+        return ret
@@ -0,0 +1,139 @@
+"""Block read planning for pypluggit."""
+
+from collections.abc import (
+    Awaitable,
+    Callable,
+    Generator,
+    Iterable,
+    Sequence,
+    Set,
+)
+from dataclasses import dataclass
+from typing import Any
+
+# Most holding registers one read may return (Modbus limit).
+MAX_BLOCK = 125
+# Most holding registers one write may carry (Modbus limit).
+MAX_WRITE_BLOCK = 123
+
+
+@dataclass(frozen=True, order=True)
+class Block:
+    """A run of holding registers read in one transaction."""
+
+    address: int
+    count: int
+
+    @property
+    def end(self) -> int:
+        """Return the first address after the block."""
+        return self.address + self.count
+
+
+def plan_blocks(
+    spans: Iterable[tuple[int, int]],
+    max_gap: int = 16,
+    max_count: int = MAX_BLOCK,
+    avoid: Set[int] = frozenset(),
+) -> list[Block]:
+    """Merge (address, count) spans into as few reads as possible.
+
+    Spans closer than max_gap words are read together, reading a few unused
+    words is cheaper than another round trip. Gaps holding an address of
+    avoid are never bridged.
+    """
+    blocks: list[Block] = []
+    for address, count in sorted(set(spans)):
+        if blocks:
+            last = blocks[-1]
+            end = max(last.end, address + count)
+            if (
+                address - last.end <= max_gap
+                and end - last.address <= max_count
+                and not any(gap in avoid for gap in range(last.end, address))
+            ):
+                blocks[-1] = Block(last.address, end - last.address)
+                continue
+        blocks.append(Block(address, count))
+    return blocks
+
+
+def bisect_read(
+    spans: Sequence[tuple[int, int]],
+    read: Callable[[Block], list[int] | None],
+    refused: type[Exception],
+) -> tuple[dict[int, int], set[int]]:
+    """Read sorted spans as one block, bisect it while the unit refuses.
+
+    read(block) returns the words, None if the read failed for a reason
+    other than the addresses, or raises refused. Return the words read by
+    address and the addresses found unreadable: single spans refused on
+    their own and gaps between two halves that both read fine.
+    """
+    words: dict[int, int] = {}
+    unreadable: set[int] = set()
+    steps = _bisect(spans, words, unreadable)
+    try:
+        block = next(steps)
+        while True:
+            try:
+                values = read(block)
+            except refused:
+                values = _REFUSED
+            block = steps.send(values)
+    except StopIteration:
+        return words, unreadable
+
+
+async def async_bisect_read(
+    spans: Sequence[tuple[int, int]],
+    read: Callable[[Block], Awaitable[list[int] | None]],
+    refused: type[Exception],
+) -> tuple[dict[int, int], set[int]]:
+    """Read sorted spans like bisect_read, awaiting read(block)."""
+    words: dict[int, int] = {}
+    unreadable: set[int] = set()
+    steps = _bisect(spans, words, unreadable)
+    try:
+        block = next(steps)
+        while True:
+            try:
+                values = await read(block)
+            except refused:
+                values = _REFUSED
+            block = steps.send(values)
+    except StopIteration:
+        return words, unreadable
+
+
+# Sent to _bisect in place of words when the unit refused the block.
+_REFUSED: Any = object()
+
+
+def _bisect(
+    part: Sequence[tuple[int, int]], words: dict[int, int], unreadable: set[int]
+) -> Generator[Block, list[int] | None, int]:
+    """Yield the blocks to read for part, return the number of words read.
+
+    The result of every read is sent back: the words, None if it failed, or
+    _REFUSED.
+    """
+    address = part[0][0]
+    block = Block(address, sum(part[-1]) - address)
+    values = yield block
+    if values is not _REFUSED:
+        if values is None:
+            return 0
+        words.update(zip(range(block.address, block.end), values, strict=True))
+        return block.count
+    if len(part) == 1:
+        unreadable.update(range(block.address, block.end))
+        return 0
+
+    half = len(part) // 2
+    left = yield from _bisect(part[:half], words, unreadable)
+    right = yield from _bisect(part[half:], words, unreadable)
+    if left + right == sum(count for _, count in part):
+        # Both halves read fine, so the unit refused the words in between.
+        unreadable.update(range(sum(part[half - 1]), part[half][0]))
+    return left + right
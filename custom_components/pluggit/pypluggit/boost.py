@@ -0,0 +1,212 @@
+"""Humidity and VOC boost controller for pypluggit."""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+import logging
+import threading
+import time
+from typing import Any
+
+from .const import Registers
+from .poller import Poller
+
+_LOGGER = logging.getLogger(__name__)
+
+# PRM_CURRENT_BL_STATE of manual mode, the only one using the speed level.
+MANUAL_STATE = 1
+
+BOOST_REGISTERS = (
+    Registers.PRM_RAM_IDX_RH3_CORRECTED,
+    Registers.PRM_VOC,
+    Registers.PRM_ROM_IDX_SPEED_LEVEL,
+    Registers.PRM_CURRENT_BL_STATE,
+)
+
+
+@dataclass(frozen=True)
+class BoostSettings:
+    """Thresholds and dwell times of the boost controller."""
+
+    humidity_on: float = 70
+    humidity_off: float = 60
+    voc_on: float = 1200
+    voc_off: float = 900
+    level: int = 3
+    min_on: float = 300
+    min_off: float = 60
+
+
+@dataclass(frozen=True)
+class BoostDecision:
+    """Outcome of one controller step."""
+
+    boosting: bool
+    reason: str
+    level: int | None
+    base_level: int | None
+    humidity: float | None
+    voc: float | None
+    time: float
+
+
+class BoostController:
+    """Hysteresis controller for the speed level in manual mode.
+
+    The boost starts when humidity or VOC reaches its on threshold and
+    ends when both are at or below their off threshold. A boost lasts at
+    least min_on seconds and a new one starts at least min_off seconds
+    after the last change. Changing the level during a boost hands the
+    unit back to the user without restoring. write(level) sets the speed
+    level and returns False if that failed.
+    """
+
+    def __init__(self, settings: BoostSettings, write: Callable[[int], bool]) -> None:
+        """Init controller."""
+        self.settings = settings
+        self._write = write
+        self.boosting = False
+        self.base_level: int | None = None
+        self.changed = -float("inf")
+
+    def step(
+        self,
+        now: float,
+        humidity: float | None,
+        voc: float | None,
+        level: int | None,
+        state: int | None,
+    ) -> BoostDecision:
+        """Decide on one sample, writing the speed level if needed."""
+        settings = self.settings
+
+        def decision(reason: str) -> BoostDecision:
+            return BoostDecision(
+                self.boosting, reason, level, self.base_level, humidity, voc, now
+            )
+
+        if level is None or state is None:
+            return decision("unavailable")
+
+        if self.boosting:
+            if state != MANUAL_STATE or level != settings.level:
+                self.boosting = False
+                self.base_level = None
+                self.changed = now
+                return decision("override")
+            if not _below(humidity, settings.humidity_off) or not _below(
+                voc, settings.voc_off
+            ):
+                return decision("high")
+            if now - self.changed < settings.min_on:
+                return decision("min_on")
+            if not self._write(self.base_level):
+                return decision("write_failed")
+            level = self.base_level
+            self.boosting = False
+            self.base_level = None
+            self.changed = now
+            return decision("clear")
+
+        if state != MANUAL_STATE:
+            return decision("not_manual")
+        if _above(humidity, settings.humidity_on):
+            reason = "humidity"
+        elif _above(voc, settings.voc_on):
+            reason = "voc"
+        else:
+            return decision("idle")
+        if level >= settings.level:
+            return decision("already_high")
+        if now - self.changed < settings.min_off:
+            return decision("min_off")
+        if not self._write(settings.level):
+            return decision("write_failed")
+        self.boosting = True
+        self.base_level = level
+        self.changed = now
+        level = settings.level
+        return decision(reason)
+
+
+def _above(value: float | None, threshold: float) -> bool:
+    return value is not None and value >= threshold
+
+
+def _below(value: float | None, threshold: float) -> bool:
+    return value is None or value <= threshold
+
+
+class BoostRunner:
+    """Run a BoostController on samples of a Poller.
+
+    The speed level is written with write_registers, so it skips the
+    write debounce and jumps the poll queue.
+    """
+
+    def __init__(
+        self,
+        poller: Poller,
+        settings: BoostSettings,
+        interval: float = 5,
+        on_decision: Callable[[BoostDecision], None] | None = None,
+    ) -> None:
+        """Init runner, call start to begin."""
+        self._poller = poller
+        self._interval = interval
+        self._on_decision = on_decision
+        self._lock = threading.Lock()
+        self._unsubscribe: Callable[[], None] | None = None
+        self.controller = BoostController(settings, self._write)
+        self.decision: BoostDecision | None = None
+
+    @property
+    def running(self) -> bool:
+        """Return whether samples are taken."""
+        return self._unsubscribe is not None
+
+    def start(self) -> None:
+        """Subscribe to the sensors."""
+        if self._unsubscribe is None:
+            self._unsubscribe = self._poller.subscribe(
+                BOOST_REGISTERS, self._sample, self._interval, changes_only=False
+            )
+
+    def stop(self) -> None:
+        """Unsubscribe and restore the level of a running boost."""
+        if self._unsubscribe is None:
+            return
+        self._unsubscribe()
+        self._unsubscribe = None
+        with self._lock:
+            controller = self.controller
+            if controller.boosting and self._write(controller.base_level):
+                controller.boosting = False
+                controller.base_level = None
+
+    def _write(self, level: int) -> bool:
+        return self._poller.pluggit.write_registers(
+            {Registers.PRM_ROM_IDX_SPEED_LEVEL: level}
+        )
+
+    def _sample(self, values: dict[Registers, Any]) -> None:
+        with self._lock:
+            if self._unsubscribe is None:
+                return
+            decision = self.controller.step(
+                time.monotonic(),
+                values.get(Registers.PRM_RAM_IDX_RH3_CORRECTED),
+                values.get(Registers.PRM_VOC),
+                values.get(Registers.PRM_ROM_IDX_SPEED_LEVEL),
+                values.get(Registers.PRM_CURRENT_BL_STATE),
+            )
+        last = self.decision
+        self.decision = decision
+        if last is not None and (last.boosting, last.reason, last.level) == (
+            decision.boosting,
+            decision.reason,
+            decision.level,
+        ):
+            return
+        _LOGGER.debug("Boost %s: %s", decision.reason, decision)
+        if self._on_decision is not None:
+            self._on_decision(decision)
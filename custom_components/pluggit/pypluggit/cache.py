@@ -0,0 +1,49 @@
+"""Register cache for pypluggit."""
+
+from collections.abc import Sequence
+import threading
+import time
+
+
+class RegisterCache:
+    """Last known raw words of the holding registers, by address."""
+
+    def __init__(self) -> None:
+        """Init empty cache."""
+        self._lock = threading.Lock()
+        self._words: dict[int, int] = {}
+        self._stamps: dict[int, float] = {}
+
+    def update(
+        self, address: int, words: Sequence[int], stamp: float | None = None
+    ) -> None:
+        """Store words read from or written to address."""
+        if stamp is None:
+            stamp = time.monotonic()
+        with self._lock:
+            for offset, word in enumerate(words):
+                self._words[address + offset] = word
+                self._stamps[address + offset] = stamp
+
+    def get(
+        self, address: int, count: int, max_age: float | None = None
+    ) -> list[int] | None:
+        """Get count words from address, None if one is missing or too old."""
+        oldest = None if max_age is None else time.monotonic() - max_age
+        with self._lock:
+            ret = []
+            for addr in range(address, address + count):
+                word = self._words.get(addr)
+                if word is None:
+                    return None
+                if oldest is not None and self._stamps[addr] < oldest:
+                    return None
+                ret.append(word)
+        return ret
+
+    def invalidate(self, address: int, count: int) -> None:
+        """Forget count words from address."""
+        with self._lock:
+            for addr in range(address, address + count):
+                self._words.pop(addr, None)
+                self._stamps.pop(addr, None)
@@ -0,0 +1,190 @@
+"""High frequency capture for pypluggit."""
+
+import array
+from dataclasses import dataclass, field
+import itertools
+import json
+import math
+from pathlib import Path
+import statistics
+import struct
+import threading
+import time
+
+from pymodbus import ModbusException
+
+from .blocks import MAX_BLOCK
+from .codec import decode_words
+from .const import Registers
+from .pluggit import Pluggit
+
+CAPTURE_REGISTERS = (
+    Registers.PRM_RAM_IDX_T1,
+    Registers.PRM_RAM_IDX_T2,
+    Registers.PRM_RAM_IDX_T3,
+    Registers.PRM_RAM_IDX_T4,
+    Registers.PRM_HAL_TAHO_1,
+    Registers.PRM_HAL_TAHO_2,
+    Registers.PRM_RAM_IDX_BYPASS_ACTUAL_STATE,
+    Registers.PRM_CURRENT_BL_STATE,
+)
+
+# Most samples per second asked of the unit.
+MAX_RATE = 20
+
+_MAGIC = b"PGCP"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBddIHI")
+
+
+@dataclass
+class CaptureStats:
+    """Timing of a capture."""
+
+    samples: int = 0
+    errors: int = 0
+    missed_ticks: int = 0
+    requested_rate: float = 0.0
+    rate: float = 0.0
+    # Standard deviation of the time between samples, in seconds.
+    jitter: float = 0.0
+    max_late: float = 0.0
+    duration: float = 0.0
+
+
+@dataclass
+class CaptureData:
+    """Samples of a capture, times relative to start in seconds.
+
+    values holds one row of registers per sample, NaN where a register
+    couldn't be decoded.
+    """
+
+    registers: tuple[Registers, ...]
+    rate: float
+    start: float = field(default_factory=time.time)
+    times: array.array = field(default_factory=lambda: array.array("d"))
+    values: array.array = field(default_factory=lambda: array.array("f"))
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def row(self, index: int) -> dict[Registers, float]:
+        """Get sample index by register."""
+        width = len(self.registers)
+        return dict(
+            zip(self.registers, self.values[index * width : (index + 1) * width])
+        )
+
+    def save(self, path: Path) -> None:
+        """Write header, register names, times and values."""
+        names = json.dumps([register.name for register in self.registers]).encode()
+        with Path(path).open("wb") as file:
+            file.write(
+                _HEADER.pack(
+                    _MAGIC,
+                    _VERSION,
+                    self.start,
+                    self.rate,
+                    len(self),
+                    len(self.registers),
+                    len(names),
+                )
+            )
+            file.write(names)
+            self.times.tofile(file)
+            self.values.tofile(file)
+
+    @classmethod
+    def load(cls, path: Path) -> "CaptureData":
+        """Read a capture written by save."""
+        with Path(path).open("rb") as file:
+            magic, version, start, rate, count, width, names_len = _HEADER.unpack(
+                file.read(_HEADER.size)
+            )
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"{path} is not a pypluggit capture")
+            names = json.loads(file.read(names_len))
+            registers = tuple(Registers[name] for name in names)
+            if len(registers) != width:
+                raise ValueError(f"{path} is damaged")
+            times = array.array("d")
+            times.fromfile(file, count)
+            values = array.array("f")
+            values.fromfile(file, count * width)
+        return cls(registers, rate, start, times, values)
+
+
+def capture(
+    pluggit: Pluggit,
+    duration: float,
+    rate: float = 10,
+    registers: tuple[Registers, ...] = CAPTURE_REGISTERS,
+    stop: threading.Event | None = None,
+) -> tuple[CaptureData, CaptureStats]:
+    """Sample registers at a fixed rate for duration seconds, blocking.
+
+    The registers are read in as few blocks as the unit allows, all in
+    one command job per sample, into buffers sized for the whole capture.
+    Registers the unit refuses are found by one read up front and stay
+    NaN. Ticks that can't be made are skipped, not made up for. Background
+    polls of the unit are answered from the cache meanwhile, which the
+    capture keeps fresh. Setting stop ends the capture early.
+    """
+    rate = min(rate, MAX_RATE)
+    period = 1 / rate
+    size = max(1, math.ceil(duration * rate))
+    width = len(registers)
+    stop = stop or threading.Event()
+    stats = CaptureStats(requested_rate=rate)
+
+    times = array.array("d", bytes(8 * size))
+    values = array.array("f", [math.nan]) * (size * width)
+    data = CaptureData(registers, rate)
+    count = 0
+
+    with pluggit.pause_polls(), pluggit.command():
+        # One bisecting read first, so the plan leaves refused addresses out.
+        pluggit.read_registers(registers)
+        blocks = pluggit.plan_reads(registers, max_gap=MAX_BLOCK)
+        data.start = time.time()
+        started = next_tick = time.monotonic()
+        end = started + duration
+        while count < size and next_tick < end:
+            behind = time.monotonic() - next_tick
+            if behind >= period:
+                # Keep the fixed rate, skip the ticks we can't make.
+                missed = int(behind // period)
+                stats.missed_ticks += missed
+                next_tick += missed * period
+            delay = next_tick - time.monotonic()
+            if delay > 0 and stop.wait(delay):
+                break
+            if stop.is_set():
+                break
+
+            stamp = time.monotonic()
+            stats.max_late = max(stats.max_late, stamp - next_tick)
+            next_tick += period
+            try:
+                words = pluggit.read_blocks(blocks)
+            except ModbusException:
+                stats.errors += 1
+                continue
+            sample = decode_words(registers, words)
+            times[count] = stamp - started
+            row = count * width
+            for column, register in enumerate(registers):
+                if (value := sample.get(register)) is not None:
+                    values[row + column] = value
+            count += 1
+
+    data.times = times[:count]
+    data.values = values[: count * width]
+    stats.samples = count
+    stats.duration = time.monotonic() - started
+    if count > 1:
+        intervals = [b - a for a, b in itertools.pairwise(data.times)]
+        stats.rate = (count - 1) / (data.times[-1] - data.times[0])
+        stats.jitter = statistics.pstdev(intervals)
+    return data, stats
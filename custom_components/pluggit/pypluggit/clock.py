@@ -0,0 +1,75 @@
+"""Device clock tracking for pypluggit."""
+
+from collections.abc import Callable
+from datetime import datetime
+import time
+
+
+def local_seconds() -> int:
+    """Get host local time in seconds, the format of PRM_DATE_TIME."""
+    now = datetime.now().astimezone()
+    return int(now.timestamp() + now.utcoffset().total_seconds())
+
+
+class DeviceClock:
+    """Synthesize the device clock from one measured offset.
+
+    The offset between PRM_DATE_TIME and the host monotonic clock is
+    measured every interval seconds. In between, the device time is
+    computed locally. Drift is the device time minus the host local time
+    at the last measurement.
+    """
+
+    def __init__(
+        self,
+        local_time: Callable[[], float] = local_seconds,
+        interval: float = 3600,
+        max_drift: float = 30,
+    ) -> None:
+        """Init clock, resync is wanted above max_drift seconds."""
+        self._local_time = local_time
+        self._interval = interval
+        self._max_drift = max_drift
+        self._offset: float | None = None
+        self._measured_at: float | None = None
+        self.drift: float | None = None
+
+    def due(self) -> bool:
+        """Return True if the device clock should be read again."""
+        return (
+            self._measured_at is None
+            or time.monotonic() - self._measured_at >= self._interval
+        )
+
+    def needs_resync(self) -> bool:
+        """Return True if the last measured drift is over the limit."""
+        return self.drift is not None and abs(self.drift) > self._max_drift
+
+    def host_time(self) -> int:
+        """Get host local time in seconds."""
+        return int(self._local_time())
+
+    def measure(self, device_seconds: int, sent: float, received: float) -> None:
+        """Store a PRM_DATE_TIME read between the monotonic sent and received."""
+        # The device answered somewhere within the round trip, take the middle.
+        middle = (sent + received) / 2
+        self._offset = device_seconds - middle
+        self._measured_at = received
+        self.drift = device_seconds - (self._local_time() - (received - middle))
+
+    def set(self, device_seconds: int) -> None:
+        """Store a time that was just written to the device."""
+        now = time.monotonic()
+        self._offset = device_seconds - now
+        self._measured_at = now
+        self.drift = 0
+
+    def invalidate(self) -> None:
+        """Forget the offset, the next call reads the device again."""
+        self._measured_at = None
+
+    def now(self) -> int | None:
+        """Get the current device time in seconds."""
+        if self._offset is None:
+            return None
+        return int(time.monotonic() + self._offset)
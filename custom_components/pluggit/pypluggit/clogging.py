@@ -0,0 +1,173 @@
+"""Filter clogging predictor for pypluggit."""
+
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from .const import Registers
+
+CLOGGING_REGISTERS = (
+    Registers.PRM_HAL_TAHO_1,
+    Registers.PRM_HAL_TAHO_2,
+    Registers.PRM_ROM_IDX_SPEED_LEVEL,
+    Registers.PRM_FILTER_REMAINING_TIME,
+    Registers.PRM_FILTER_DEFAULT_TIME,
+)
+
+DAY = 86400
+# Days the remaining time may be short of the default right after a reset.
+RESET_TOLERANCE = 2
+# State stored before resets had to be seen may hold a baseline learned
+# on used filters and is dropped.
+_FORMAT = 2
+
+
+@dataclass
+class _Baseline:
+    """Running mean rpm of one speed level right after a filter change."""
+
+    samples: int = 0
+    rpm: float = 0.0
+
+
+@dataclass
+class _Fit:
+    """Running sums of a least squares line through (day, deviation)."""
+
+    n: int = 0
+    t: float = 0.0
+    y: float = 0.0
+    tt: float = 0.0
+    ty: float = 0.0
+
+    def add(self, t: float, y: float) -> None:
+        self.n += 1
+        self.t += t
+        self.y += y
+        self.tt += t * t
+        self.ty += t * y
+
+    def line(self) -> tuple[float, float] | None:
+        """Get (intercept, slope), None while undetermined."""
+        det = self.n * self.tt - self.t * self.t
+        if self.n < 2 or det <= 0:
+            return None
+        slope = (self.n * self.ty - self.t * self.y) / det
+        return (self.y - slope * self.t) / self.n, slope
+
+
+@dataclass
+class FilterPredictor:
+    """Forecast when the filters are clogged from fan rpm drift.
+
+    The fans keep their air flow against a growing pressure drop, so at
+    a fixed speed level their rpm moves away from what they needed with
+    clean filters. After a filter reset the first baseline_samples at
+    each speed level set its baseline. Later samples add the mean
+    deviation of both fans from the baseline, relative, to a least
+    squares line over days since the reset. Every step is O(1).
+    The filters are due when the line reaches threshold.
+
+    Nothing is learned until a reset is seen, i.e. the remaining time
+    jumps up to about the default filter time. The filters in place when
+    counting starts may already be clogged, a baseline from them would
+    be wrong until the next change. A rise of the remaining time because
+    the default time was raised isn't a reset.
+    """
+
+    threshold: float = 0.15
+    baseline_samples: int = 30
+    min_samples: int = 100
+    min_days: float = 1.0
+    reset_time: float | None = None
+    remaining: int | None = None
+    baselines: dict[int, _Baseline] = field(default_factory=dict)
+    fit: _Fit = field(default_factory=_Fit)
+
+    def reset(self, now: float) -> None:
+        """Start over after the filters were changed."""
+        self.reset_time = now
+        self.baselines = {}
+        self.fit = _Fit()
+
+    def add(self, now: float, values: Mapping[Registers, Any]) -> None:
+        """Add a sample of CLOGGING_REGISTERS taken at now, in seconds."""
+        remaining = values.get(Registers.PRM_FILTER_REMAINING_TIME)
+        default = values.get(Registers.PRM_FILTER_DEFAULT_TIME)
+        if remaining is not None:
+            # The countdown starts over when the filter is reset anywhere.
+            if (
+                self.remaining is not None
+                and remaining > self.remaining
+                and default is not None
+                and remaining >= default - RESET_TOLERANCE
+            ):
+                self.reset(now)
+            self.remaining = remaining
+        if self.reset_time is None:
+            return
+
+        level = values.get(Registers.PRM_ROM_IDX_SPEED_LEVEL)
+        taho_1 = values.get(Registers.PRM_HAL_TAHO_1)
+        taho_2 = values.get(Registers.PRM_HAL_TAHO_2)
+        if not level or not taho_1 or not taho_2:
+            return
+        rpm = (taho_1 + taho_2) / 2
+
+        baseline = self.baselines.setdefault(level, _Baseline())
+        if baseline.samples < self.baseline_samples:
+            baseline.samples += 1
+            baseline.rpm += (rpm - baseline.rpm) / baseline.samples
+            return
+        self.fit.add((now - self.reset_time) / DAY, rpm / baseline.rpm - 1)
+
+    def deviation(self, now: float) -> float | None:
+        """Get the fitted relative rpm deviation at now."""
+        line = self.fit.line()
+        if line is None or self.reset_time is None:
+            return None
+        return line[0] + line[1] * (now - self.reset_time) / DAY
+
+    @property
+    def slope(self) -> float | None:
+        """Get the fitted relative rpm change per day."""
+        line = self.fit.line()
+        return None if line is None else line[1]
+
+    def predict(self, now: float) -> float | None:
+        """Get the time the filters are due, None while unknown."""
+        line = self.fit.line()
+        if line is None or self.reset_time is None or self.fit.n < self.min_samples:
+            return None
+        intercept, slope = line
+        days = (now - self.reset_time) / DAY
+        if days < self.min_days or slope == 0:
+            return None
+        target = self.threshold if slope > 0 else -self.threshold
+        due = (target - intercept) / slope
+        return self.reset_time + max(due, days) * DAY
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the learned state for storage."""
+        return {
+            "format": _FORMAT,
+            "reset_time": self.reset_time,
+            "remaining": self.remaining,
+            "baselines": {
+                str(level): asdict(baseline)
+                for level, baseline in self.baselines.items()
+            },
+            "fit": asdict(self.fit),
+        }
+
+    def restore(self, data: Mapping[str, Any]) -> None:
+        """Load state from to_dict."""
+        self.remaining = data.get("remaining")
+        if data.get("format") != _FORMAT:
+            return
+        self.reset_time = data.get("reset_time")
+        self.baselines = {
+            int(level): _Baseline(**baseline)
+            for level, baseline in data.get("baselines", {}).items()
+        }
+        self.fit = _Fit(**data.get("fit", {}))
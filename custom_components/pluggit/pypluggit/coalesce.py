@@ -0,0 +1,79 @@
+"""Write coalescing for pypluggit."""
+
+from collections.abc import Callable
+import logging
+import threading
+from typing import Any
+
+from .const import Registers
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class WriteCoalescer:
+    """Debounce writes per register, only the last value is sent.
+
+    Every write restarts the register's timer. When it runs out, flush is
+    called once with the final value.
+    """
+
+    def __init__(
+        self, flush: Callable[[Registers, Any], None], delay: float = 0.5
+    ) -> None:
+        """Init coalescer calling flush after delay seconds of quiet."""
+        self._flush = flush
+        self._delay = delay
+        self._lock = threading.Lock()
+        self._pending: dict[Registers, Any] = {}
+        self._timers: dict[Registers, threading.Timer] = {}
+
+    def write(self, register: Registers, value: Any) -> None:
+        """Queue value for register, replacing a pending one."""
+        with self._lock:
+            timer = self._timers.pop(register, None)
+            if timer is not None:
+                timer.cancel()
+            self._pending[register] = value
+            timer = threading.Timer(self._delay, self._fire, args=(register,))
+            timer.daemon = True
+            self._timers[register] = timer
+            timer.start()
+
+    def pending(self, register: Registers) -> Any:
+        """Return the value waiting for register, or None."""
+        with self._lock:
+            return self._pending.get(register)
+
+    def discard(self, register: Registers) -> None:
+        """Drop a pending value, e.g. because it was written directly."""
+        with self._lock:
+            timer = self._timers.pop(register, None)
+            if timer is not None:
+                timer.cancel()
+            self._pending.pop(register, None)
+
+    def flush(self) -> None:
+        """Send every pending value now."""
+        with self._lock:
+            for timer in self._timers.values():
+                timer.cancel()
+            self._timers.clear()
+            pending, self._pending = self._pending, {}
+
+        for register, value in pending.items():
+            self._send(register, value)
+
+    def _fire(self, register: Registers) -> None:
+        with self._lock:
+            self._timers.pop(register, None)
+            if register not in self._pending:
+                return
+            value = self._pending.pop(register)
+
+        self._send(register, value)
+
+    def _send(self, register: Registers, value: Any) -> None:
+        try:
+            self._flush(register, value)
+        except Exception:
+            _LOGGER.exception("Writing %s failed", register.name)
@@ -0,0 +1,116 @@
+"""Register encoding for pypluggit."""
+
+from collections.abc import Iterable
+import struct
+from typing import Any
+
+from .blocks import Block
+from .const import REGISTER_DIC, DataType, Registers
+
+# Value and words, high word first, of the raw data types, by name.
+DATA_TYPES = {
+    name: (struct.Struct(">" + fmt), struct.Struct(f">{count}H"))
+    for name, fmt, count in (
+        ("uint16", "H", 1),
+        ("int16", "h", 1),
+        ("uint32", "I", 2),
+        ("int32", "i", 2),
+        ("float32", "f", 2),
+    )
+}
+_STRUCTS = {data_type: DATA_TYPES[data_type.name.lower()] for data_type in DataType}
+
+_Structs = tuple[struct.Struct, struct.Struct]
+
+
+def _unpack(structs: _Structs, words: list[int]) -> Any:
+    value, raw = structs
+    return value.unpack(raw.pack(*reversed(words)))[0]
+
+
+def _pack(structs: _Structs, data: Any) -> list[int]:
+    value, raw = structs
+    return list(reversed(raw.unpack(value.pack(data))))
+
+
+def _fit(structs: _Structs, data: float, name: str) -> int | float:
+    if structs[0].format[-1] != "f":
+        if not float(data).is_integer():
+            raise ValueError(f"{name} takes whole numbers, not {data}")
+        data = int(data)
+    try:
+        structs[0].pack(data)
+    except (OverflowError, struct.error) as err:
+        raise ValueError(f"{data} is out of range of {name}") from err
+    return data
+
+
+def size(register: Registers) -> int:
+    """Get the number of words of register."""
+    return REGISTER_DIC[register][1].value[1]
+
+
+def decode(register: Registers, words: list[int]) -> Any:
+    """Decode the words of register, low word first."""
+    return _unpack(_STRUCTS[REGISTER_DIC[register][1]], words)
+
+
+def encode(register: Registers, data: Any) -> list[int]:
+    """Encode data for register, low word first."""
+    return _pack(_STRUCTS[REGISTER_DIC[register][1]], data)
+
+
+def check(register: Registers, data: float) -> int | float:
+    """Get data as the type of register, raise ValueError if it doesn't fit."""
+    return _fit(_STRUCTS[REGISTER_DIC[register][1]], data, register.name)
+
+
+def spans(registers: Iterable[Registers]) -> list[tuple[int, int]]:
+    """Get (address, count) of registers for plan_blocks."""
+    return [(REGISTER_DIC[register][0], size(register)) for register in registers]
+
+
+def decode_block(
+    registers: Iterable[Registers], block: Block, words: list[int]
+) -> dict[Registers, Any]:
+    """Decode the registers inside block from its words."""
+    ret = {}
+    for register in registers:
+        address = REGISTER_DIC[register][0]
+        if block.address <= address < block.end:
+            offset = address - block.address
+            ret[register] = decode(register, words[offset : offset + size(register)])
+    return ret
+
+
+def decode_words(
+    registers: Iterable[Registers], words: dict[int, int]
+) -> dict[Registers, Any]:
+    """Decode the registers whose words are all in words, by address."""
+    ret = {}
+    for register in registers:
+        address = REGISTER_DIC[register][0]
+        data = [words.get(addr) for addr in range(address, address + size(register))]
+        if None not in data:
+            ret[register] = decode(register, data)
+    return ret
+
+
+def decode_as(words: list[int], data_type: str) -> list[int | float]:
+    """Decode consecutive values of data_type from raw words, low word first."""
+    structs = DATA_TYPES[data_type]
+    count = structs[1].size // 2
+    return [
+        _unpack(structs, words[pos : pos + count])
+        for pos in range(0, len(words) - count + 1, count)
+    ]
+
+
+def encode_as(values: Iterable[int | float], data_type: str) -> list[int]:
+    """Encode values of data_type to raw words, ValueError if one doesn't fit."""
+    structs = DATA_TYPES[data_type]
+    return [
+        word
+        for value in values
+        for word in _pack(structs, _fit(structs, value, data_type))
+    ]
@@ -0,0 +1,430 @@
+"""Asyncio fleet collector for pypluggit.
+
+    python -m pypluggit.collector --out /data/pluggit 10.0.0.11 10.0.0.12
+
+Every unit is polled on its own fixed-rate schedule with block reads,
+samples are buffered in columns and flushed to one file per unit and
+hour: Parquet or Arrow IPC when pyarrow is installed, CSV otherwise.
+"""
+
+import argparse
+import array
+import asyncio
+import bisect
+import contextlib
+import csv
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+import importlib.util
+import logging
+import math
+from pathlib import Path
+import time
+from typing import Any
+
+from pymodbus.client import AsyncModbusTcpClient
+from pymodbus.exceptions import ModbusException
+
+from .blocks import Block, async_bisect_read, plan_blocks
+from .codec import decode_words, spans
+from .const import Registers
+from .pluggit import ILLEGAL_DATA_ADDRESS, RegisterReadError
+
+_LOGGER = logging.getLogger(__name__)
+
+TELEMETRY = (
+    Registers.PRM_RAM_IDX_T1,
+    Registers.PRM_RAM_IDX_T2,
+    Registers.PRM_RAM_IDX_T3,
+    Registers.PRM_RAM_IDX_T4,
+    Registers.PRM_HAL_TAHO_1,
+    Registers.PRM_HAL_TAHO_2,
+    Registers.PRM_RAM_IDX_RH3_CORRECTED,
+    Registers.PRM_VOC,
+    Registers.PRM_CURRENT_BL_STATE,
+    Registers.PRM_ROM_IDX_SPEED_LEVEL,
+    Registers.PRM_RAM_IDX_BYPASS_ACTUAL_STATE,
+)
+
+FORMATS = ("parquet", "arrow", "csv")
+_SUFFIX = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv"}
+
+
+def default_format() -> str:
+    """Get the most compact format available."""
+    return "parquet" if importlib.util.find_spec("pyarrow") else "csv"
+
+
+@dataclass
+class CollectorStats:
+    """Counters of a collector run."""
+
+    samples: int = 0
+    dropped: int = 0
+    errors: int = 0
+    missed_ticks: int = 0
+    flushes: int = 0
+    flushed_rows: int = 0
+    flush_seconds: float = 0.0
+    flush_errors: int = 0
+    buffered: int = 0
+
+
+class _Columns:
+    """Column buffer of one unit, one float per register and sample."""
+
+    def __init__(self, registers: tuple[Registers, ...]) -> None:
+        self.time = array.array("d")
+        self.values = {register: array.array("d") for register in registers}
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def append(self, stamp: float, sample: dict[Registers, Any]) -> None:
+        self.time.append(stamp)
+        for register, column in self.values.items():
+            value = sample.get(register)
+            column.append(math.nan if value is None else value)
+
+    def extend(self, other: "_Columns") -> None:
+        self.time.extend(other.time)
+        for register, column in self.values.items():
+            column.extend(other.values[register])
+
+
+class _Archive:
+    """Append-only file of one unit and hour."""
+
+    def __init__(self, path: Path, fmt: str, names: list[str]) -> None:
+        self.path = path
+        self._fmt = fmt
+        self._names = names
+        self._writer: Any = None
+        self._file: Any = None
+
+    def write(self, columns: _Columns) -> None:
+        data = [columns.time, *columns.values.values()]
+        if self._fmt == "csv":
+            if self._file is None:
+                new = not self.path.exists()
+                self._file = self.path.open("a", newline="", encoding="ascii")
+                self._writer = csv.writer(self._file)
+                if new:
+                    self._writer.writerow(self._names)
+            self._writer.writerows(zip(*data, strict=True))
+            self._file.flush()
+            return
+
+        import pyarrow as pa  # noqa: PLC0415 - optional dependency
+
+        batch = pa.record_batch(
+            [pa.array(column, type=pa.float64()) for column in data], names=self._names
+        )
+        if self._writer is None:
+            if self._fmt == "parquet":
+                import pyarrow.parquet as pq  # noqa: PLC0415
+
+                self._writer = pq.ParquetWriter(self.path, batch.schema)
+            else:
+                self._writer = pa.ipc.new_file(self.path, batch.schema)
+        self._writer.write_batch(batch)
+
+    def close(self) -> None:
+        if self._writer is not None and self._fmt != "csv":
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+        self._writer = self._file = None
+
+
+class Collector:
+    """Poll many units concurrently and archive their telemetry.
+
+    At most max_concurrency units are read at the same moment. When more
+    than max_buffered samples wait for the disk, new samples are dropped
+    and counted instead of growing memory. Samples that fail to write stay
+    buffered for the next flush. Blocks a unit refuses are
+    bisected once, its later reads go around the refused addresses.
+    """
+
+    def __init__(
+        self,
+        hosts: list[str],
+        out_dir: Path,
+        interval: float = 1.0,
+        registers: tuple[Registers, ...] = TELEMETRY,
+        fmt: str | None = None,
+        max_concurrency: int = 64,
+        max_buffered: int = 1_000_000,
+        flush_interval: float = 60.0,
+        timeout: float = 2.0,
+    ) -> None:
+        """Init collector for hosts."""
+        self._hosts = hosts
+        self._out_dir = Path(out_dir)
+        self._interval = interval
+        self._registers = registers
+        self._fmt = fmt or default_format()
+        self._max_buffered = max_buffered
+        self._flush_interval = flush_interval
+        self._timeout = timeout
+        self._spans = sorted(set(spans(registers)))
+        self._unreadable: dict[str, set[int]] = {host: set() for host in hosts}
+        self._plans = {host: _plan(self._spans, set()) for host in hosts}
+        self._names = ["time", *(register.name for register in registers)]
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._buffers = {host: _Columns(registers) for host in hosts}
+        self._archives: dict[str, _Archive] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task | None = None
+        self._flush_failed = False
+        self.stats = CollectorStats()
+
+    async def run(self, duration: float | None = None) -> None:
+        """Collect until cancelled or duration seconds have passed."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        tasks = [
+            asyncio.create_task(
+                self._poll_unit(host, start + index * self._interval / len(self._hosts))
+            )
+            for index, host in enumerate(self._hosts)
+        ]
+        tasks.append(asyncio.create_task(self._flush_loop()))
+        try:
+            if duration is None:
+                await asyncio.gather(*tasks)
+            else:
+                await asyncio.sleep(duration)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._try_flush()
+            await asyncio.to_thread(self._close_archives)
+
+    async def flush(self) -> None:
+        """Write buffered samples to the archives.
+
+        If writing fails the samples not written go back in front of the
+        buffers and the error is raised.
+        """
+        async with self._flush_lock:
+            pending = {host: buf for host, buf in self._buffers.items() if len(buf)}
+            self._buffers = {host: _Columns(self._registers) for host in self._hosts}
+            self.stats.buffered = 0
+            if not pending:
+                return
+
+            total = sum(len(columns) for columns in pending.values())
+            started = time.perf_counter()
+            try:
+                await asyncio.to_thread(self._write, pending)
+            finally:
+                # _write leaves what it didn't write in pending.
+                for host, columns in pending.items():
+                    columns.extend(self._buffers[host])
+                    self._buffers[host] = columns
+                    self.stats.buffered += len(columns)
+                self.stats.flushes += 1
+                self.stats.flushed_rows += total - sum(
+                    len(columns) for columns in pending.values()
+                )
+                self.stats.flush_seconds += time.perf_counter() - started
+
+    async def _try_flush(self) -> bool:
+        """Flush, log and count a failure instead of raising it."""
+        try:
+            await self.flush()
+        except Exception:
+            self.stats.flush_errors += 1
+            _LOGGER.exception(
+                "Writing archives failed, %d samples kept", self.stats.buffered
+            )
+            return False
+        return True
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            self._flush_failed = not await self._try_flush()
+            _LOGGER.info("Collector stats: %s", asdict(self.stats))
+
+    async def _poll_unit(self, host: str, first_tick: float) -> None:
+        loop = asyncio.get_running_loop()
+        client = AsyncModbusTcpClient(host, timeout=self._timeout, retries=0)
+        next_tick = first_tick
+        try:
+            while True:
+                delay = next_tick - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                stamp = time.time()
+                async with self._slots:
+                    sample = await self._read(host, client)
+                if sample is not None:
+                    self._append(host, stamp, sample)
+
+                next_tick += self._interval
+                behind = loop.time() - next_tick
+                if behind > 0:
+                    # Keep the fixed rate, skip the ticks we can't make.
+                    missed = math.ceil(behind / self._interval)
+                    self.stats.missed_ticks += missed
+                    next_tick += missed * self._interval
+        finally:
+            client.close()
+
+    async def _read(
+        self, host: str, client: AsyncModbusTcpClient
+    ) -> dict[Registers, Any] | None:
+        async def read(block: Block) -> list[int]:
+            response = await client.read_holding_registers(
+                block.address, count=block.count
+            )
+            if response.isError():
+                if getattr(response, "exception_code", None) == ILLEGAL_DATA_ADDRESS:
+                    raise RegisterReadError(f"Reading {block} refused: {response}")
+                raise ModbusException(f"Reading {block} failed: {response}")
+            return response.registers
+
+        try:
+            if not client.connected and not await client.connect():
+                self.stats.errors += 1
+                return None
+            words: dict[int, int] = {}
+            refused: set[int] = set()
+            for block_spans in self._plans[host]:
+                block_words, unreadable = await async_bisect_read(
+                    block_spans, read, RegisterReadError
+                )
+                words |= block_words
+                refused |= unreadable
+        except ModbusException:
+            self.stats.errors += 1
+            return None
+        if refused - self._unreadable[host]:
+            _LOGGER.warning("%s refuses addresses %s", host, sorted(refused))
+            self._unreadable[host] |= refused
+            self._plans[host] = _plan(self._spans, self._unreadable[host])
+        return decode_words(self._registers, words)
+
+    def _append(self, host: str, stamp: float, sample: dict[Registers, Any]) -> None:
+        if self.stats.buffered >= self._max_buffered:
+            self.stats.dropped += 1
+            # After a failed write leave the retries to the flush loop.
+            if not self._flush_failed and (
+                self._flush_task is None or self._flush_task.done()
+            ):
+                self._flush_task = asyncio.create_task(self._try_flush())
+            return
+        self._buffers[host].append(stamp, sample)
+        self.stats.samples += 1
+        self.stats.buffered += 1
+
+    def _archive(self, host: str, stamp: float) -> tuple[_Archive, float]:
+        """Get the archive for stamp and the time its hour ends."""
+        start = datetime.fromtimestamp(stamp).replace(minute=0, second=0, microsecond=0)
+        hour = start.strftime("%Y-%m-%dT%H")
+        end = (start + timedelta(hours=1)).timestamp()
+
+        archive = self._archives.get(host)
+        if archive is not None and archive.path.stem.startswith(hour):
+            return archive, end
+        if archive is not None:
+            archive.close()
+
+        directory = self._out_dir / host.replace(":", "_")
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{hour}{_SUFFIX[self._fmt]}"
+        part = 0
+        while self._fmt != "csv" and path.exists():
+            # Parquet and Arrow files can't be reopened for appending.
+            part += 1
+            path = directory / f"{hour}.{part}{_SUFFIX[self._fmt]}"
+
+        archive = self._archives[host] = _Archive(path, self._fmt, self._names)
+        return archive, end
+
+    def _write(self, pending: dict[str, _Columns]) -> None:
+        """Write pending and remove it, leave what failed to write."""
+        for host, columns in list(pending.items()):
+            # Split at hour boundaries so every file holds one hour.
+            start = 0
+            try:
+                while start < len(columns):
+                    archive, hour_end = self._archive(host, columns.time[start])
+                    end = bisect.bisect_left(columns.time, hour_end, lo=start)
+                    archive.write(_slice(columns, start, end))
+                    start = end
+            except Exception:
+                pending[host] = _slice(columns, start, len(columns))
+                # Start a fresh archive next time, this one may be broken.
+                if (archive := self._archives.pop(host, None)) is not None:
+                    with contextlib.suppress(Exception):
+                        archive.close()
+                raise
+            del pending[host]
+
+    def _close_archives(self) -> None:
+        for archive in self._archives.values():
+            archive.close()
+        self._archives.clear()
+
+
+def _plan(
+    wanted: list[tuple[int, int]], unreadable: set[int]
+) -> list[list[tuple[int, int]]]:
+    """Group the spans clear of unreadable by the block that reads them."""
+    wanted = [
+        (address, count)
+        for address, count in wanted
+        if unreadable.isdisjoint(range(address, address + count))
+    ]
+    return [
+        [span for span in wanted if block.address <= span[0] < block.end]
+        for block in plan_blocks(wanted, avoid=unreadable)
+    ]
+
+
+def _slice(columns: _Columns, start: int, end: int) -> _Columns:
+    if start == 0 and end == len(columns):
+        return columns
+    ret = _Columns(tuple(columns.values))
+    ret.time = columns.time[start:end]
+    ret.values = {register: col[start:end] for register, col in columns.values.items()}
+    return ret
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the collector until interrupted."""
+    parser = argparse.ArgumentParser(
+        prog="pypluggit.collector",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("hosts", nargs="+", help="addresses of the Pluggit units")
+    parser.add_argument("--out", type=Path, required=True, help="archive directory")
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--format", choices=FORMATS, default=None)
+    parser.add_argument("--max-concurrency", type=int, default=64)
+    parser.add_argument("--flush-interval", type=float, default=60.0)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    collector = Collector(
+        args.hosts,
+        args.out,
+        interval=args.interval,
+        fmt=args.format,
+        max_concurrency=args.max_concurrency,
+        flush_interval=args.flush_interval,
+    )
+    try:
+        asyncio.run(collector.run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,12 @@
 
 from enum import Enum, auto
 
-from pymodbus.client import ModbusTcpClient as m
+
+class DataType(Enum):
+    """Register data types as (struct format, words), like pymodbus DATATYPE."""
+
+    UINT32 = ("I", 2)
+    FLOAT32 = ("f", 2)
 
 
 class Registers(Enum):
@@ -147,40 +152,92 @@ BYPASS_STATE = {
     255: "Opened",
 }
 
+# Settings changed from sliders and pickers, their writes are debounced and
+# skipped when the unit already holds the value. Most live in EEPROM.
+COALESCED_REGISTERS = frozenset(
+    {
+        Registers.PRM_ROM_IDX_SPEED_LEVEL,
+        Registers.PRM_FILTER_DEFAULT_TIME,
+        Registers.PRM_BYPASS_TMIN,
+        Registers.PRM_BYPASS_TMAX,
+        Registers.PRM_BYPASS_TMIN_SUMMER,
+        Registers.PRM_BYPASS_TMAX_SUMMER,
+        Registers.PRM_RAM_IDX_BYPASS_MANUAL_TIMEOUT,
+        Registers.PRM_NUM_OF_WEEK_PROGRAM,
+        Registers.PRM_ROM_IDX_NIGHT_MODE_START_HOUR,
+        Registers.PRM_ROM_IDX_NIGHT_MODE_START_MIN,
+        Registers.PRM_ROM_IDX_NIGHT_MODE_END_HOUR,
+        Registers.PRM_ROM_IDX_NIGHT_MODE_END_MIN,
+    }
+)
+
+# Seasonal settings that make up a profile.
+PROFILE_REGISTERS = (
+    Registers.PRM_BYPASS_TMIN,
+    Registers.PRM_BYPASS_TMAX,
+    Registers.PRM_BYPASS_TMIN_SUMMER,
+    Registers.PRM_BYPASS_TMAX_SUMMER,
+    Registers.PRM_ROM_IDX_NIGHT_MODE_START_HOUR,
+    Registers.PRM_ROM_IDX_NIGHT_MODE_START_MIN,
+    Registers.PRM_ROM_IDX_NIGHT_MODE_END_HOUR,
+    Registers.PRM_ROM_IDX_NIGHT_MODE_END_MIN,
+    Registers.PRM_FILTER_DEFAULT_TIME,
+    Registers.PRM_NUM_OF_WEEK_PROGRAM,
+)
+
+# Value of PRM_CURRENT_BL_STATE once a mode request has been applied.
+UNIT_MODE_STATE = {
+    ActiveUnitMode.MANUAL_MODE: 1,
+    ActiveUnitMode.DEMAND_MODE: 2,
+    ActiveUnitMode.WEEK_PROGRAM_MODE: 3,
+    ActiveUnitMode.AWAY_MODE: 5,
+    ActiveUnitMode.SUMMER_MODE: 6,
+    ActiveUnitMode.FIREPLACE_MODE: 9,
+    ActiveUnitMode.NIGHT_MODE: 16,
+}
+
+# Request that has to be sent to leave a PRM_CURRENT_BL_STATE.
+UNIT_MODE_EXIT = {
+    5: ActiveUnitMode.END_AWAY_MODE,
+    6: ActiveUnitMode.END_SUMMER_MODE,
+    9: ActiveUnitMode.END_FIREPLACE_MODE,
+    16: ActiveUnitMode.END_NIGHT_MODE,
+}
+
 REGISTER_DIC = {
-    Registers.PRM_SYSTEM_ID: [2, m.DATATYPE.UINT32],
-    Registers.PRM_SYSTEM_SERIAL_NUM_LOW: [4, m.DATATYPE.UINT32],
-    Registers.PRM_SYSTEM_SERIAL_NUM_HIGH: [6, m.DATATYPE.UINT32],
-    Registers.PRM_FW_VERSION: [24, m.DATATYPE.UINT32],
-    Registers.PRM_DATE_TIME: [108, m.DATATYPE.UINT32],
-    Registers.PRM_DATE_TIME_SET: [110, m.DATATYPE.UINT32],
-    Registers.PRM_WORK_TIME: [624, m.DATATYPE.UINT32],
-    Registers.PRM_CURRENT_BL_STATE: [472, m.DATATYPE.UINT32],
-    Registers.PRM_RAM_IDX_UNIT_MODE: [168, m.DATATYPE.UINT32],
-    Registers.PRM_ROM_IDX_SPEED_LEVEL: [324, m.DATATYPE.UINT32],
-    Registers.PRM_RAM_IDX_T1: [132, m.DATATYPE.FLOAT32],
-    Registers.PRM_RAM_IDX_T2: [134, m.DATATYPE.FLOAT32],
-    Registers.PRM_RAM_IDX_T3: [136, m.DATATYPE.FLOAT32],
-    Registers.PRM_RAM_IDX_T4: [138, m.DATATYPE.FLOAT32],
-    Registers.PRM_BYPASS_POSITION: [212, m.DATATYPE.UINT32],
-    Registers.PRM_FILTER_REMAINING_TIME: [554, m.DATATYPE.UINT32],
-    Registers.PRM_FILTER_DEFAULT_TIME: [556, m.DATATYPE.UINT32],
-    Registers.PRM_FILTER_RESET: [558, m.DATATYPE.UINT32],
-    Registers.PRM_FILTER_DIRTINESS_DEGREE: [612, m.DATATYPE.UINT32],
-    Registers.PRM_BYPASS_TMIN: [444, m.DATATYPE.FLOAT32],
-    Registers.PRM_BYPASS_TMAX: [446, m.DATATYPE.FLOAT32],
-    Registers.PRM_RAM_IDX_BYPASS_ACTUAL_STATE: [198, m.DATATYPE.UINT32],
-    Registers.PRM_RAM_IDX_BYPASS_MANUAL_TIMEOUT: [264, m.DATATYPE.UINT32],
-    Registers.PRM_BYPASS_TMIN_SUMMER: [766, m.DATATYPE.FLOAT32],
-    Registers.PRM_BYPASS_TMAX_SUMMER: [764, m.DATATYPE.FLOAT32],
-    Registers.PRM_NUM_OF_WEEK_PROGRAM: [466, m.DATATYPE.UINT32],
-    Registers.PRM_RAM_IDX_RH3_CORRECTED: [196, m.DATATYPE.UINT32],
-    Registers.PRM_VOC: [430, m.DATATYPE.UINT32],
-    Registers.PRM_HAL_TAHO_1: [100, m.DATATYPE.FLOAT32],
-    Registers.PRM_HAL_TAHO_2: [102, m.DATATYPE.FLOAT32],
-    Registers.PRM_ROM_IDX_NIGHT_MODE_START_HOUR: [332, m.DATATYPE.UINT32],
-    Registers.PRM_ROM_IDX_NIGHT_MODE_START_MIN: [334, m.DATATYPE.UINT32],
-    Registers.PRM_ROM_IDX_NIGHT_MODE_END_HOUR: [336, m.DATATYPE.UINT32],
-    Registers.PRM_ROM_IDX_NIGHT_MODE_END_MIN: [338, m.DATATYPE.UINT32],
-    Registers.PRM_NIGHT_MODE_STATE: [560, m.DATATYPE.UINT32],
+    Registers.PRM_SYSTEM_ID: [2, DataType.UINT32],
+    Registers.PRM_SYSTEM_SERIAL_NUM_LOW: [4, DataType.UINT32],
+    Registers.PRM_SYSTEM_SERIAL_NUM_HIGH: [6, DataType.UINT32],
+    Registers.PRM_FW_VERSION: [24, DataType.UINT32],
+    Registers.PRM_DATE_TIME: [108, DataType.UINT32],
+    Registers.PRM_DATE_TIME_SET: [110, DataType.UINT32],
+    Registers.PRM_WORK_TIME: [624, DataType.UINT32],
+    Registers.PRM_CURRENT_BL_STATE: [472, DataType.UINT32],
+    Registers.PRM_RAM_IDX_UNIT_MODE: [168, DataType.UINT32],
+    Registers.PRM_ROM_IDX_SPEED_LEVEL: [324, DataType.UINT32],
+    Registers.PRM_RAM_IDX_T1: [132, DataType.FLOAT32],
+    Registers.PRM_RAM_IDX_T2: [134, DataType.FLOAT32],
+    Registers.PRM_RAM_IDX_T3: [136, DataType.FLOAT32],
+    Registers.PRM_RAM_IDX_T4: [138, DataType.FLOAT32],
+    Registers.PRM_BYPASS_POSITION: [212, DataType.UINT32],
+    Registers.PRM_FILTER_REMAINING_TIME: [554, DataType.UINT32],
+    Registers.PRM_FILTER_DEFAULT_TIME: [556, DataType.UINT32],
+    Registers.PRM_FILTER_RESET: [558, DataType.UINT32],
+    Registers.PRM_FILTER_DIRTINESS_DEGREE: [612, DataType.UINT32],
+    Registers.PRM_BYPASS_TMIN: [444, DataType.FLOAT32],
+    Registers.PRM_BYPASS_TMAX: [446, DataType.FLOAT32],
+    Registers.PRM_RAM_IDX_BYPASS_ACTUAL_STATE: [198, DataType.UINT32],
+    Registers.PRM_RAM_IDX_BYPASS_MANUAL_TIMEOUT: [264, DataType.UINT32],
+    Registers.PRM_BYPASS_TMIN_SUMMER: [766, DataType.FLOAT32],
+    Registers.PRM_BYPASS_TMAX_SUMMER: [764, DataType.FLOAT32],
+    Registers.PRM_NUM_OF_WEEK_PROGRAM: [466, DataType.UINT32],
+    Registers.PRM_RAM_IDX_RH3_CORRECTED: [196, DataType.UINT32],
+    Registers.PRM_VOC: [430, DataType.UINT32],
+    Registers.PRM_HAL_TAHO_1: [100, DataType.FLOAT32],
+    Registers.PRM_HAL_TAHO_2: [102, DataType.FLOAT32],
+    Registers.PRM_ROM_IDX_NIGHT_MODE_START_HOUR: [332, DataType.UINT32],
+    Registers.PRM_ROM_IDX_NIGHT_MODE_START_MIN: [334, DataType.UINT32],
+    Registers.PRM_ROM_IDX_NIGHT_MODE_END_HOUR: [336, DataType.UINT32],
+    Registers.PRM_ROM_IDX_NIGHT_MODE_END_MIN: [338, DataType.UINT32],
+    Registers.PRM_NIGHT_MODE_STATE: [560, DataType.UINT32],
 }
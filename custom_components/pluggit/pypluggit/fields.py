@@ -0,0 +1,85 @@
+"""Derived fields for pypluggit."""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from .const import (
+    BYPASS_STATE,
+    CURRENT_UNIT_MODE,
+    DEGREE_OF_DIRTINESS,
+    DEVICE_TYPE,
+    Registers,
+    WeekProgram,
+)
+
+
+@dataclass(frozen=True)
+class Field:
+    """A value decoded from one or more registers."""
+
+    registers: tuple[Registers, ...]
+    decode: Callable[..., Any]
+
+
+def _lookup(table: dict) -> Callable[[int], Any]:
+    return lambda value: table.get(value)
+
+
+FIELDS: dict[str, Field] = {
+    "unit_type": Field(
+        (Registers.PRM_SYSTEM_ID,), lambda value: DEVICE_TYPE.get((value >> 24) & 0x0F)
+    ),
+    "serial_number": Field(
+        (Registers.PRM_SYSTEM_SERIAL_NUM_LOW, Registers.PRM_SYSTEM_SERIAL_NUM_HIGH),
+        lambda low, high: (high << 32) + low,
+    ),
+    "firmware_version": Field(
+        (Registers.PRM_FW_VERSION,),
+        lambda value: str(value >> 8) + "." + str(value & 0xFF),
+    ),
+    "unit_mode": Field((Registers.PRM_CURRENT_BL_STATE,), _lookup(CURRENT_UNIT_MODE)),
+    "filter_dirtiness": Field(
+        (Registers.PRM_FILTER_DIRTINESS_DEGREE,), _lookup(DEGREE_OF_DIRTINESS)
+    ),
+    "bypass_state": Field(
+        (Registers.PRM_RAM_IDX_BYPASS_ACTUAL_STATE,), _lookup(BYPASS_STATE)
+    ),
+    "week_program": Field((Registers.PRM_NUM_OF_WEEK_PROGRAM,), WeekProgram),
+    "night_mode_start": Field(
+        (
+            Registers.PRM_ROM_IDX_NIGHT_MODE_START_HOUR,
+            Registers.PRM_ROM_IDX_NIGHT_MODE_START_MIN,
+        ),
+        lambda hour, minute: (hour, minute),
+    ),
+    "night_mode_end": Field(
+        (
+            Registers.PRM_ROM_IDX_NIGHT_MODE_END_HOUR,
+            Registers.PRM_ROM_IDX_NIGHT_MODE_END_MIN,
+        ),
+        lambda hour, minute: (hour, minute),
+    ),
+}
+
+
+def key_registers(key: Registers | str) -> tuple[Registers, ...]:
+    """Get the registers needed for a register or field name."""
+    if isinstance(key, Registers):
+        return (key,)
+    return FIELDS[key].registers
+
+
+def key_value(key: Registers | str, values: dict[Registers, Any]) -> Any:
+    """Get the value of a register or field from read register values."""
+    if isinstance(key, Registers):
+        return values.get(key)
+
+    field = FIELDS[key]
+    args = [values.get(register) for register in field.registers]
+    if None in args:
+        return None
+    try:
+        return field.decode(*args)
+    except ValueError:
+        return None
@@ -0,0 +1,83 @@
+"""Aggregates over many units for pypluggit."""
+
+from collections.abc import Hashable, Mapping
+from typing import Any
+import warnings
+
+import numpy as np
+
+from .const import Registers
+
+METRICS = {
+    "t3_extract": Registers.PRM_RAM_IDX_T3,
+    "humidity": Registers.PRM_RAM_IDX_RH3_CORRECTED,
+    "voc": Registers.PRM_VOC,
+    "filter_remain": Registers.PRM_FILTER_REMAINING_TIME,
+}
+FLEET_REGISTERS = tuple(METRICS.values())
+STATS = ("min", "mean", "max", "p90")
+# Percentiles of STATS other than mean, in one nanpercentile call.
+_PERCENTILES = np.array([0.0, 100.0, 90.0])
+_MIN, _MAX, _P90 = range(3)
+
+
+class FleetAggregator:
+    """Latest values of many units and statistics over them.
+
+    Every unit has a row of METRICS in one array, missing values are NaN.
+    compute gets every statistic of every metric from a single
+    nanpercentile and nanmean over that array, so the cost of a cycle
+    barely grows with the number of units and not at all with the number
+    of sensors showing the results.
+    """
+
+    def __init__(self) -> None:
+        """Init an empty fleet."""
+        self._rows: dict[Hashable, int] = {}
+        self._values = np.full((0, len(METRICS)), np.nan)
+        self.stats = np.full((len(STATS), len(METRICS)), np.nan)
+        self.units = np.zeros(len(METRICS), dtype=int)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def set(self, unit: Hashable, values: Mapping[Registers, Any]) -> None:
+        """Store the values of unit, registers missing in values are kept."""
+        if (row := self._rows.get(unit)) is None:
+            row = self._rows[unit] = len(self._rows)
+            self._values = np.vstack((self._values, np.full(len(METRICS), np.nan)))
+        for column, register in enumerate(FLEET_REGISTERS):
+            if register in values:
+                value = values[register]
+                self._values[row, column] = np.nan if value is None else value
+
+    def remove(self, unit: Hashable) -> None:
+        """Forget unit."""
+        if (row := self._rows.pop(unit, None)) is None:
+            return
+        self._values = np.delete(self._values, row, axis=0)
+        for other, index in self._rows.items():
+            if index > row:
+                self._rows[other] = index - 1
+
+    def compute(self) -> np.ndarray:
+        """Get STATS by METRICS over all units, NaN where no unit has a value."""
+        values = self._values
+        self.units = np.count_nonzero(~np.isnan(values), axis=0)
+        if not len(values):
+            self.stats = np.full((len(STATS), len(METRICS)), np.nan)
+            return self.stats
+        with warnings.catch_warnings():
+            # Metrics no unit reports are all NaN, which is expected.
+            warnings.simplefilter("ignore", RuntimeWarning)
+            percentiles = np.nanpercentile(values, _PERCENTILES, axis=0)
+            mean = np.nanmean(values, axis=0)
+        self.stats = np.vstack(
+            (percentiles[_MIN], mean, percentiles[_MAX], percentiles[_P90])
+        )
+        return self.stats
+
+    def value(self, stat: str, metric: str) -> float | None:
+        """Get one statistic of the last compute, None where missing."""
+        ret = self.stats[STATS.index(stat), list(METRICS).index(metric)]
+        return None if np.isnan(ret) else float(ret)
@@ -0,0 +1,69 @@
+"""Time spent in each unit mode and bypass state for pypluggit."""
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from .const import Registers
+
+MODE_REGISTERS = (
+    Registers.PRM_CURRENT_BL_STATE,
+    Registers.PRM_RAM_IDX_BYPASS_ACTUAL_STATE,
+)
+
+
+@dataclass
+class ModeTimer:
+    """Seconds spent in each state of a register since start.
+
+    Fed with the transitions of the register, as a poller delivers them
+    with changes_only. The state in progress counts up to the time asked,
+    so reading a total needs no new sample. None, e.g. while the unit is
+    unreachable, counts towards no state.
+    """
+
+    start: float = 0.0
+    totals: dict[int, float] = field(default_factory=dict)
+    state: int | None = None
+    since: float = 0.0
+
+    def observe(self, now: float, state: int | None) -> None:
+        """Close the state in progress and start state at now."""
+        self.totals = self.at(now)
+        self.state = state
+        self.since = now
+
+    def elapsed(self, now: float, state: int) -> float:
+        """Get the seconds spent in state up to now."""
+        ret = self.totals.get(state, 0.0)
+        if state == self.state:
+            ret += max(0.0, now - self.since)
+        return ret
+
+    def at(self, now: float) -> dict[int, float]:
+        """Get the totals of all states up to now."""
+        ret = dict(self.totals)
+        if self.state is not None:
+            ret[self.state] = self.elapsed(now, self.state)
+        return ret
+
+    def reset(self, now: float) -> None:
+        """Start a new period at now, the state in progress carries on."""
+        self.start = now
+        self.totals = {}
+        self.since = max(self.since, now)
+
+    def to_dict(self, now: float) -> dict[str, Any]:
+        """Get the totals up to now for storage."""
+        return {
+            "start": self.start,
+            "totals": {str(state): total for state, total in self.at(now).items()},
+        }
+
+    def restore(self, data: Mapping[str, Any]) -> None:
+        """Load totals from to_dict, counting resumes with the next state seen."""
+        self.start = data.get("start", 0.0)
+        self.totals = {
+            int(state): total for state, total in data.get("totals", {}).items()
+        }
+        self.state = None
@@ -1,53 +1,497 @@
 """Pluggit."""
 
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import logging
+import math
+from pathlib import Path
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
 from pymodbus import ModbusException
-from pymodbus.client import ModbusTcpClient
 from pymodbus.exceptions import ConnectionException
 
 from .const import (
     BYPASS_STATE,
+    COALESCED_REGISTERS,
     CURRENT_UNIT_MODE,
     DEGREE_OF_DIRTINESS,
     DEVICE_TYPE,
     REGISTER_DIC,
+    UNIT_MODE_EXIT,
+    UNIT_MODE_STATE,
     ActiveUnitMode,
     Registers,
     SpeedLevelFan,
     WeekProgram,
 )
+from .blocks import MAX_WRITE_BLOCK, Block, bisect_read, plan_blocks
+from .cache import RegisterCache
+from .clock import DeviceClock, local_seconds
+from .codec import decode, decode_words, encode, size, spans
+from .coalesce import WriteCoalescer
+from .profiling import Profiler
+from .unreadable import UnreadableIndex
+from .worker import IOWorker, Priority
+
+if TYPE_CHECKING:
+    from pymodbus.client import ModbusTcpClient
+
+_LOGGER = logging.getLogger(__name__)
+
+# A cached value older than this is not trusted to skip a write.
+NO_OP_MAX_AGE = 300
+# The only Modbus exception code saying an address can't be read at all,
+# others such as busy or gateway errors may pass with the next try.
+ILLEGAL_DATA_ADDRESS = 0x02
+# Seconds the unit may take to show a requested mode, and between reads.
+MODE_SETTLE = 2.0
+MODE_POLL = 0.1
+# Seconds between leaving a mode with END_* and the next request.
+MODE_GAP = 0.2
+# Seconds before the serial number and firmware are read again after failing.
+IDENTITY_RETRY = 60.0
+
+
+class RegisterReadError(ModbusException):
+    """The unit refused a read as an illegal data address."""
+
+
+@dataclass
+class ApplyResult:
+    """Outcome of Pluggit.apply_registers."""
+
+    unchanged: list[Registers] = field(default_factory=list)
+    written: list[Registers] = field(default_factory=list)
+    # Written registers that read back different, with the value read.
+    mismatched: dict[Registers, Any] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        """Get whether every value is in place."""
+        return not self.mismatched
 
 
 class Pluggit:
     """Pluggit."""
 
-    def __init__(self, host: str) -> None:
-        """Init host address."""
-        self._client = ModbusTcpClient(host=host)
+    def __init__(
+        self,
+        host: str,
+        local_time: Callable[[], float] = local_seconds,
+        unreadable_index: UnreadableIndex | None = None,
+        client: Any = None,
+        trace: Path | None = None,
+    ) -> None:
+        """Init host address, source of host local time and unreadable index.
+
+        client replaces the Modbus TCP client, e.g. by a trace.ReplayClient.
+        With trace every transaction is recorded to that file.
+        """
+        if client is None:
+            # Loaded on first use, the client package is slow to import.
+            from pymodbus.client import ModbusTcpClient  # noqa: PLC0415
+
+            client = ModbusTcpClient(host=host)
+        if trace is not None:
+            from .trace import RecordingClient  # noqa: PLC0415
+
+            client = RecordingClient(client, trace)
+        self._worker = IOWorker(client, name=f"pluggit-{host}")
+        self._local = threading.local()
+        self._unit_state: int | None = None
+        self._cache = RegisterCache()
+        self._coalescer = WriteCoalescer(self.__flush_write)
+        self._clock = DeviceClock(local_time=local_time)
+        self._index = unreadable_index
+        self._identity: str | None = None
+        self._identity_retry = -math.inf
+        self._unreadable: set[int] = set()
+        self._paused = 0
+
+    def close(self) -> None:
+        """Send pending writes, finish queued transactions and disconnect."""
+        self._coalescer.flush()
+        self._worker.close()
+
+    def set_profiler(self, profiler: Profiler | None) -> None:
+        """Time every transaction as phase io of profiler, None stops."""
+        self._worker.profiler = profiler
+
+    @contextmanager
+    def command(self) -> Iterator[None]:
+        """Run reads in this block ahead of background polls."""
+        previous = getattr(self._local, "priority", Priority.POLL)
+        self._local.priority = Priority.COMMAND
+        try:
+            yield
+        finally:
+            self._local.priority = previous
+
+    @contextmanager
+    def pause_polls(self) -> Iterator[None]:
+        """Answer background polls from the cache instead of the unit."""
+        self._paused += 1
+        try:
+            yield
+        finally:
+            self._paused -= 1
+
+    def __polls_paused(self) -> bool:
+        priority = getattr(self._local, "priority", Priority.POLL)
+        return self._paused > 0 and priority == Priority.POLL
+
+    def __read(self, client: "ModbusTcpClient", register: Registers):
+        address = REGISTER_DIC[register][0]
+        read = client.read_holding_registers(address=address, count=2)
+        if read.isError():
+            raise ModbusException(f"Reading {register.name} failed: {read}")
+        self._cache.update(address, read.registers)
+        return decode(register, read.registers)
+
+    def __write(self, client: "ModbusTcpClient", register: Registers, data: Any):
+        address = REGISTER_DIC[register][0]
+        words = encode(register, data)
+        self._coalescer.discard(register)
+        self._cache.invalidate(address, len(words))
+        ret = client.write_registers(address=address, values=words)
+        if ret.isError():
+            raise ModbusException(f"Writing {register.name} failed: {ret}")
+        self._cache.update(address, words)
 
     def __read_register(self, register: Registers):
-        item = REGISTER_DIC[register]
+        pending = self._coalescer.pending(register)
+        if pending is not None:
+            # Report what the unit is about to get, not the value it had.
+            return pending
+
+        if self.__polls_paused():
+            words = self._cache.get(REGISTER_DIC[register][0], size(register))
+            return None if words is None else decode(register, words)
 
         try:
-            read = self._client.read_holding_registers(address=item[0], count=2)
-            ret = ModbusTcpClient.convert_from_registers(
-                registers=read.registers, data_type=item[1], word_order="little"
+            ret = self._worker.submit(
+                lambda client: self.__read(client, register),
+                getattr(self._local, "priority", Priority.POLL),
             )
         except ModbusException:
             return None
 
         return ret
 
-    def __write_register(self, register: Registers, data: int):
-        item = REGISTER_DIC[register]
+    def __write_register(self, register: Registers, data: Any) -> bool:
+        """Write or queue data, return False if the write failed."""
+        if register in COALESCED_REGISTERS:
+            self._coalescer.write(register, data)
+            return True
 
         try:
-            ret = ModbusTcpClient.convert_to_registers(
-                value=data, data_type=item[1], word_order="little"
+            self._worker.submit(
+                lambda client: self.__write(client, register, data), Priority.WRITE
             )
-            self._client.write_registers(address=item[0], values=ret)
         except ConnectionException:
+            return False
+        except ModbusException as err:
+            _LOGGER.warning("%s", err)
+            return False
+        return True
+
+    def __flush_write(self, register: Registers, data: Any):
+        """Write a coalesced value unless the unit already holds it."""
+        address = REGISTER_DIC[register][0]
+        words = encode(register, data)
+        if self._cache.get(address, len(words), max_age=NO_OP_MAX_AGE) == words:
             return
 
+        try:
+            self._worker.submit(
+                lambda client: self.__write(client, register, data), Priority.WRITE
+            )
+        except ConnectionException:
+            return
+
+    def __read_block(self, client: "ModbusTcpClient", block: Block) -> list[int]:
+        read = client.read_holding_registers(address=block.address, count=block.count)
+        if read.isError():
+            if getattr(read, "exception_code", None) == ILLEGAL_DATA_ADDRESS:
+                raise RegisterReadError(f"Reading {block} refused: {read}")
+            raise ModbusException(f"Reading {block} failed: {read}")
+        self._cache.update(block.address, read.registers)
+        return read.registers
+
+    def read_words(self, address: int, count: int) -> list[int]:
+        """Read raw words.
+
+        Raise RegisterReadError if the unit refuses the addresses, and
+        ModbusException if the read fails otherwise.
+        """
+        block = Block(address, count)
+        return self._worker.submit(
+            lambda client: self.__read_block(client, block),
+            getattr(self._local, "priority", Priority.POLL),
+        )
+
+    def __read_spans(
+        self, block_spans: list[tuple[int, int]], priority: Priority
+    ) -> dict[int, int]:
+        """Read sorted spans as one block, bisect it if the unit refuses."""
+
+        def read(block: Block) -> list[int] | None:
+            try:
+                return self._worker.submit(
+                    lambda client: self.__read_block(client, block), priority
+                )
+            except RegisterReadError:
+                raise
+            except ModbusException:
+                return None
+
+        words, unreadable = bisect_read(block_spans, read, RegisterReadError)
+        self.__mark_unreadable(unreadable)
+        return words
+
+    def __unreadable_addresses(self) -> set[int]:
+        if (
+            self._index is not None
+            and self._identity is None
+            and time.monotonic() >= self._identity_retry
+        ):
+            self._identity_retry = time.monotonic() + IDENTITY_RETRY
+            serial = self.get_serial_number()
+            firmware = self.get_firmware_version()
+            if serial is not None and firmware is not None:
+                self._identity = f"{serial}-{firmware}"
+                self._unreadable |= self._index.get(self._identity)
+        return self._unreadable
+
+    def __mark_unreadable(self, addresses: Iterable[int]) -> None:
+        addresses = set(addresses) - self._unreadable
+        if not addresses:
+            return
+        self._unreadable |= addresses
+        if self._index is not None and self._identity is not None:
+            self._index.add(self._identity, addresses)
+
+    def cached_words(
+        self, address: int, count: int, max_age: float | None = None
+    ) -> list[int] | None:
+        """Get raw words last read or written, None if unknown or too old."""
+        return self._cache.get(address, count, max_age=max_age)
+
+    def read_registers(self, registers: Iterable[Registers]) -> dict[Registers, Any]:
+        """Read registers in as few block transactions as possible.
+
+        Every block is its own queued job, so commands can run in between.
+        A block the unit refuses is bisected to find the refused addresses,
+        which are remembered and left out of later blocks. Registers that
+        could not be read are missing from the result. Registers with a
+        write waiting in the coalescer get that value without a read. While
+        polls are paused, background reads get what the cache holds.
+        """
+        priority = getattr(self._local, "priority", Priority.POLL)
+        registers = set(registers)
+        # Values waiting in the coalescer are newer than the unit's.
+        pending = {
+            register: value
+            for register in registers
+            if (value := self._coalescer.pending(register)) is not None
+        }
+        registers -= pending.keys()
+        if not registers:
+            return pending
+        if self.__polls_paused():
+            return pending | decode_words(
+                registers,
+                {
+                    address + offset: word
+                    for address, count in spans(registers)
+                    if (words := self._cache.get(address, count)) is not None
+                    for offset, word in enumerate(words)
+                },
+            )
+        unreadable = self.__unreadable_addresses()
+        wanted = [
+            (address, count)
+            for address, count in spans(registers)
+            if unreadable.isdisjoint(range(address, address + count))
+        ]
+
+        words: dict[int, int] = {}
+        for block in plan_blocks(wanted, avoid=unreadable):
+            block_spans = sorted(
+                {span for span in wanted if block.address <= span[0] < block.end}
+            )
+            words |= self.__read_spans(block_spans, priority)
+        return pending | decode_words(registers, words)
+
+    def plan_reads(
+        self, registers: Iterable[Registers], max_gap: int = 16
+    ) -> list[Block]:
+        """Plan blocks for registers around addresses the unit refuses.
+
+        Registers on a refused address are left out.
+        """
+        unreadable = self.__unreadable_addresses()
+        wanted = [
+            (address, count)
+            for address, count in spans(registers)
+            if unreadable.isdisjoint(range(address, address + count))
+        ]
+        return plan_blocks(wanted, max_gap=max_gap, avoid=unreadable)
+
+    def read_blocks(self, blocks: Iterable[Block]) -> dict[int, int]:
+        """Read blocks back to back in one queued job, by address.
+
+        Raise ModbusException if a block fails.
+        """
+        blocks = list(blocks)
+
+        def job(client: "ModbusTcpClient") -> dict[int, int]:
+            words: dict[int, int] = {}
+            for block in blocks:
+                words.update(
+                    zip(
+                        range(block.address, block.end),
+                        self.__read_block(client, block),
+                        strict=True,
+                    )
+                )
+            return words
+
+        return self._worker.submit(job, getattr(self._local, "priority", Priority.POLL))
+
+    def write_registers(self, values: dict[Registers, Any]) -> bool:
+        """Write values at once, adjacent registers share one frame.
+
+        All frames go out back to back as one queued job, bypassing the
+        write coalescer. Return False if a frame failed.
+        """
+        words: dict[int, int] = {}
+        for register, data in values.items():
+            address = REGISTER_DIC[register][0]
+            for offset, word in enumerate(encode(register, data)):
+                words[address + offset] = word
+        frames = plan_blocks(
+            ((address, 1) for address in words), max_gap=0, max_count=MAX_WRITE_BLOCK
+        )
+
+        def job(client: "ModbusTcpClient") -> None:
+            for register in values:
+                self._coalescer.discard(register)
+            for frame in frames:
+                data = [words[address] for address in range(frame.address, frame.end)]
+                self._cache.invalidate(frame.address, frame.count)
+                ret = client.write_registers(address=frame.address, values=data)
+                if ret.isError():
+                    raise ModbusException(f"Writing {frame} failed: {ret}")
+                self._cache.update(frame.address, data)
+
+        if Registers.PRM_RAM_IDX_UNIT_MODE in values:
+            self._unit_state = None
+        if Registers.PRM_DATE_TIME_SET in values:
+            self._clock.invalidate()
+        try:
+            self._worker.submit(job, Priority.WRITE)
+        except ModbusException:
+            return False
+        if Registers.PRM_DATE_TIME_SET in values:
+            self._clock.set(int(values[Registers.PRM_DATE_TIME_SET]))
+        return True
+
+    def apply_registers(
+        self, values: dict[Registers, Any], max_age: float = NO_OP_MAX_AGE
+    ) -> ApplyResult:
+        """Write the values that differ from the cache and verify them.
+
+        Registers whose cached words are younger than max_age and match
+        are left alone, the rest are written with write_registers and
+        read back from the unit in one batch, also while polls are paused.
+        """
+        ret = ApplyResult()
+        wanted = {register: encode(register, data) for register, data in values.items()}
+        changed = {}
+        for register, words in wanted.items():
+            cached = self._cache.get(
+                REGISTER_DIC[register][0], size(register), max_age=max_age
+            )
+            if cached == words and self._coalescer.pending(register) is None:
+                ret.unchanged.append(register)
+            else:
+                changed[register] = values[register]
+        if not changed:
+            return ret
+
+        ret.written = list(changed)
+        if not self.write_registers(changed):
+            ret.mismatched = dict.fromkeys(changed)
+            return ret
+
+        # Verify with the unit even while a capture answers polls from cache.
+        with self.command():
+            read = self.read_registers(changed)
+        for register in changed:
+            if read.get(register) is None or (
+                encode(register, read[register]) != wanted[register]
+            ):
+                ret.mismatched[register] = read.get(register)
+        return ret
+
+    def write_words(self, address: int, words: list[int]) -> None:
+        """Write raw words in one frame, raise ModbusException if refused."""
+        end = address + len(words)
+        touched = [
+            register
+            for register, item in REGISTER_DIC.items()
+            if address < item[0] + size(register) and item[0] < end
+        ]
+
+        def job(client: "ModbusTcpClient") -> None:
+            for register in touched:
+                self._coalescer.discard(register)
+            self._cache.invalidate(address, len(words))
+            ret = client.write_registers(address=address, values=words)
+            if ret.isError():
+                raise ModbusException(f"Writing {Block(address, len(words))} failed")
+            self._cache.update(address, words)
+
+        if Registers.PRM_RAM_IDX_UNIT_MODE in touched:
+            self._unit_state = None
+        if Registers.PRM_DATE_TIME_SET in touched:
+            self._clock.invalidate()
+        self._worker.submit(job, Priority.WRITE)
+
+    def __request_mode(self, state: int | None, mode: ActiveUnitMode) -> int:
+        """Leave state if mode needs it, request mode and await the result."""
+        exit_mode = UNIT_MODE_EXIT.get(state) if mode in UNIT_MODE_STATE else None
+
+        def job(client: "ModbusTcpClient") -> None:
+            if exit_mode is not None:
+                self.__write(client, Registers.PRM_RAM_IDX_UNIT_MODE, exit_mode.value)
+                time.sleep(MODE_GAP)
+            self.__write(client, Registers.PRM_RAM_IDX_UNIT_MODE, mode.value)
+
+        self._worker.submit(job, Priority.WRITE)
+        return self.__await_state(UNIT_MODE_STATE.get(mode))
+
+    def __await_state(self, target: int | None) -> int:
+        """Read the current mode until it is target or MODE_SETTLE passed.
+
+        The unit takes a moment to apply a request, a read right after it
+        still shows the old mode. Without target one read after MODE_POLL.
+        Every read is its own command job, writes queued meanwhile go first.
+        """
+        deadline = time.monotonic() + MODE_SETTLE
+        while True:
+            time.sleep(MODE_POLL)
+            state = self._worker.submit(
+                lambda client: self.__read(client, Registers.PRM_CURRENT_BL_STATE),
+                Priority.COMMAND,
+            )
+            if target is None or state == target or time.monotonic() >= deadline:
+                return state
+
     def get_unit_type(self) -> str | None:
         """Get Pluggit model."""
         ret = self.__read_register(register=Registers.PRM_SYSTEM_ID)
@@ -79,6 +523,7 @@ class Pluggit:
     def get_current_unit_mode(self) -> str | None:
         """Get current mode."""
         mode = self.__read_register(register=Registers.PRM_CURRENT_BL_STATE)
+        self._unit_state = mode
 
         if mode is not None:
             return CURRENT_UNIT_MODE[mode]
@@ -154,6 +599,38 @@ class Pluggit:
         """Get date and time in seconds."""
         return self.__read_register(register=Registers.PRM_DATE_TIME)
 
+    def get_device_time(self) -> int | None:
+        """Get date and time in seconds, tracked locally between syncs."""
+        if self._clock.due():
+            self.sync_clock()
+        return self._clock.now()
+
+    def get_clock_drift(self) -> float | None:
+        """Get device clock minus host clock in seconds at the last sync."""
+        if self._clock.due():
+            self.sync_clock()
+        return self._clock.drift
+
+    def sync_clock(self) -> int | None:
+        """Measure the device clock and set it if it drifted too far."""
+
+        def job(client: "ModbusTcpClient") -> None:
+            sent = time.monotonic()
+            device_seconds = self.__read(client, Registers.PRM_DATE_TIME)
+            self._clock.measure(device_seconds, sent, time.monotonic())
+
+            if self._clock.needs_resync():
+                host_seconds = self._clock.host_time()
+                self.__write(client, Registers.PRM_DATE_TIME_SET, host_seconds)
+                self._clock.set(host_seconds)
+
+        try:
+            self._worker.submit(job, Priority.POLL)
+        except ModbusException:
+            return None
+
+        return self._clock.now()
+
     def get_week_program(self) -> WeekProgram | None:
         """Get the selected number of week program."""
         ret = self.__read_register(register=Registers.PRM_NUM_OF_WEEK_PROGRAM)
@@ -203,15 +680,77 @@ class Pluggit:
 
     def set_date_time(self, time_seconds: int):
         """Set date and time."""
-        self.__write_register(
+        if self.__write_register(
             register=Registers.PRM_DATE_TIME_SET,
             data=time_seconds,
-        )
+        ):
+            self._clock.set(time_seconds)
+        else:
+            # The unit may or may not hold the new time, read it again.
+            self._clock.invalidate()
 
     def set_unit_mode(self, mode: ActiveUnitMode):
         """Set mode."""
+        self._unit_state = None
         self.__write_register(register=Registers.PRM_RAM_IDX_UNIT_MODE, data=mode.value)
 
+    def transition_to(
+        self, mode: ActiveUnitMode, speed: SpeedLevelFan | None = None
+    ) -> str | None:
+        """Switch to mode and optionally set the manual speed.
+
+        Away, summer, fireplace and night mode are left with their END_*
+        request first, MODE_GAP seconds before the request in the same
+        write job. Afterwards the current mode is read at command priority
+        until the unit shows the target, for up to MODE_SETTLE seconds. If
+        it still shows another mode, the request is repeated once from that
+        mode, in case the last known mode was stale. The speed is only
+        written once the unit is in manual mode, otherwise a warning is
+        logged.
+        """
+        target = UNIT_MODE_STATE.get(mode)
+        manual = UNIT_MODE_STATE[ActiveUnitMode.MANUAL_MODE]
+
+        try:
+            state = self._unit_state
+            if state is None:
+                state = self._worker.submit(
+                    lambda client: self.__read(client, Registers.PRM_CURRENT_BL_STATE),
+                    Priority.COMMAND,
+                )
+
+            if target is None or state != target:
+                state = self.__request_mode(state, mode)
+                if target is not None and state != target:
+                    # Our last known mode was stale, leave the real one.
+                    state = self.__request_mode(state, mode)
+                if target is not None and state != target:
+                    _LOGGER.warning(
+                        "Unit shows mode %s instead of %s after requesting %s",
+                        state,
+                        target,
+                        mode.name,
+                    )
+
+            if speed is not None:
+                if state == manual:
+                    self._worker.submit(
+                        lambda client: self.__write(
+                            client, Registers.PRM_ROM_IDX_SPEED_LEVEL, speed.value
+                        ),
+                        Priority.WRITE,
+                    )
+                else:
+                    _LOGGER.warning(
+                        "Speed %s not set, unit is in mode %s", speed.name, state
+                    )
+        except ModbusException:
+            self._unit_state = None
+            return None
+
+        self._unit_state = state
+        return CURRENT_UNIT_MODE.get(state)
+
     def set_speed_level(self, speed: SpeedLevelFan):
         """Set speed fan."""
         self.__write_register(
@@ -0,0 +1,173 @@
+"""Change subscriptions for pypluggit."""
+
+import asyncio
+from collections.abc import AsyncIterator, Callable, Iterable
+import itertools
+import logging
+import threading
+import time
+from typing import Any
+
+from .const import Registers
+from .fields import key_registers, key_value
+from .pluggit import Pluggit
+
+_LOGGER = logging.getLogger(__name__)
+
+Key = Registers | str
+Callback = Callable[[dict[Key, Any]], None]
+
+
+class _Subscription:
+    """Keys, callback and delivery state of one subscriber."""
+
+    def __init__(
+        self,
+        keys: tuple[Key, ...],
+        callback: Callback,
+        interval: float,
+        changes_only: bool,
+    ) -> None:
+        self.keys = keys
+        self.callback = callback
+        self.interval = interval
+        self.changes_only = changes_only
+        self.registers = {r for key in keys for r in key_registers(key)}
+        self.next_due = 0.0
+        self.last: dict[Key, Any] = {}
+
+
+class Poller:
+    """Poll one device for all subscribers.
+
+    Each cycle reads the union of the registers wanted by the subscribers
+    that are due, in block transactions, and hands every subscriber only
+    the keys whose value changed since its last call. Without subscribers
+    the loop sleeps and does not touch the device.
+    """
+
+    def __init__(self, pluggit: Pluggit, interval: float = 30) -> None:
+        """Init poller, interval is the default per subscription."""
+        self._pluggit = pluggit
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._subscriptions: dict[int, _Subscription] = {}
+        self._ids = itertools.count()
+        self._thread: threading.Thread | None = None
+        self._stopped = False
+
+    @property
+    def pluggit(self) -> Pluggit:
+        """Return the polled device."""
+        return self._pluggit
+
+    def subscribe(
+        self,
+        keys: Iterable[Key],
+        callback: Callback,
+        interval: float | None = None,
+        changes_only: bool = True,
+    ) -> Callable[[], None]:
+        """Call callback with changed values of keys, return unsubscribe.
+
+        Keys are Registers or names of FIELDS. The first call has every key.
+        With changes_only False every cycle delivers all keys.
+        """
+        subscription = _Subscription(
+            tuple(keys),
+            callback,
+            self._interval if interval is None else interval,
+            changes_only,
+        )
+        with self._lock:
+            sub_id = next(self._ids)
+            self._subscriptions[sub_id] = subscription
+            if self._thread is None and not self._stopped:
+                self._thread = threading.Thread(
+                    target=self._run, name="pypluggit-poller", daemon=True
+                )
+                self._thread.start()
+        self._wake.set()
+
+        def unsubscribe() -> None:
+            with self._lock:
+                self._subscriptions.pop(sub_id, None)
+
+        return unsubscribe
+
+    async def watch(
+        self, keys: Iterable[Key], interval: float | None = None
+    ) -> AsyncIterator[dict[Key, Any]]:
+        """Yield changed values of keys in the running event loop."""
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[dict[Key, Any]] = asyncio.Queue()
+        unsubscribe = self.subscribe(
+            keys,
+            lambda changes: loop.call_soon_threadsafe(queue.put_nowait, changes),
+            interval,
+        )
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            unsubscribe()
+
+    def stop(self) -> None:
+        """Stop the poll loop."""
+        with self._lock:
+            self._stopped = True
+            thread = self._thread
+        self._wake.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def poll(self) -> float | None:
+        """Run one cycle for the due subscribers, return the next due time."""
+        now = time.monotonic()
+        with self._lock:
+            subscriptions = list(self._subscriptions.values())
+        due = [sub for sub in subscriptions if sub.next_due <= now]
+
+        if due:
+            values = self._pluggit.read_registers(
+                {register for sub in due for register in sub.registers}
+            )
+            for sub in due:
+                sub.next_due = now + sub.interval
+                self._deliver(sub, values)
+
+        if not subscriptions:
+            return None
+        return min(sub.next_due for sub in subscriptions)
+
+    def _deliver(self, sub: _Subscription, values: dict[Registers, Any]) -> None:
+        current = {key: key_value(key, values) for key in sub.keys}
+        if sub.changes_only:
+            changes = {
+                key: value
+                for key, value in current.items()
+                if key not in sub.last or sub.last[key] != value
+            }
+        else:
+            changes = current
+        sub.last = current
+
+        if not changes:
+            return
+        try:
+            sub.callback(changes)
+        except Exception:
+            _LOGGER.exception("Subscriber callback failed")
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._wake.clear()
+            try:
+                next_due = self.poll()
+            except Exception:
+                _LOGGER.exception("Poll cycle failed")
+                next_due = time.monotonic() + self._interval
+
+            timeout = None if next_due is None else max(0, next_due - time.monotonic())
+            self._wake.wait(timeout)
@@ -0,0 +1,169 @@
+"""Phase timing and sampling profiler for pypluggit."""
+
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+import functools
+import os
+from pathlib import Path
+import sys
+import threading
+import time
+from types import FrameType
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+# Functions whose samples count as decoding.
+_DECODE_FILES = ("codec.py",)
+
+
+@dataclass
+class PhaseTime:
+    """Calls and time spent in one phase."""
+
+    calls: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+
+
+class Profiler:
+    """Time phases and sample the stacks of threads inside one.
+
+    phase() records wall and thread CPU time of a block. While started, a
+    sampler thread takes the stack of every thread that is inside a phase
+    each interval seconds, other threads of the process are left alone.
+    Unlike cProfile this works across threads and costs the profiled
+    code nothing but the phase bookkeeping.
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        """Init profiler sampling every interval seconds."""
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._active: dict[int, str] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.phases: dict[str, PhaseTime] = {}
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self.samples = 0
+        self.started = 0.0
+        self.duration = 0.0
+
+    def start(self) -> None:
+        """Start sampling."""
+        self.started = time.monotonic()
+        self._thread = threading.Thread(
+            target=self._sample, name="pypluggit-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.monotonic() - self.started
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the block as phase name, the outermost phase of a thread wins."""
+        ident = threading.get_ident()
+        outer = getattr(self._local, "phase", None)
+        if outer is None:
+            self._local.phase = name
+            with self._lock:
+                self._active[ident] = name
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.thread_time() - cpu
+            with self._lock:
+                phase = self.phases.setdefault(name, PhaseTime())
+                phase.calls += 1
+                phase.wall += wall
+                phase.cpu += cpu
+                if outer is None:
+                    del self._active[ident]
+            if outer is None:
+                self._local.phase = None
+
+    def wrap(self, name: str, func: Callable[..., T]) -> Callable[..., T]:
+        """Get func running as phase name."""
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            with self.phase(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self._interval):
+            frames = sys._current_frames()  # noqa: SLF001 - sampling needs it
+            with self._lock:
+                active = list(self._active.items())
+            for ident, phase in active:
+                frame = frames.get(ident)
+                if frame is not None:
+                    self.stacks[(phase, *_stack(frame))] += 1
+                    self.samples += 1
+
+    def top(self, count: int = 10) -> list[tuple[str, int, int]]:
+        """Get the functions with most samples as (function, self, total)."""
+        own: Counter[str] = Counter()
+        total: Counter[str] = Counter()
+        for stack, samples in self.stacks.items():
+            own[stack[-1]] += samples
+            for function in set(stack[1:]):
+                total[function] += samples
+        return [
+            (function, samples, total[function])
+            for function, samples in own.most_common(count)
+        ]
+
+    def decode_time(self) -> float:
+        """Estimate the seconds spent decoding from the samples."""
+        samples = sum(
+            count
+            for stack, count in self.stacks.items()
+            if any(frame.endswith(_DECODE_FILES) for frame in stack)
+        )
+        return samples * self._interval
+
+    def save(self, path: Path) -> None:
+        """Write the samples as folded stacks, for flame graph tools."""
+        with Path(path).open("w", encoding="utf-8") as file:
+            for stack, samples in self.stacks.most_common():
+                file.write(f"{';'.join(stack)} {samples}\n")
+
+    def summary(self, count: int = 5) -> str:
+        """Get phase times and top functions as text."""
+        lines = [f"{self.samples} samples in {self.duration:.1f} s"]
+        lines.extend(
+            f"{name}: {phase.calls} calls, {1000 * phase.wall:.1f} ms wall, "
+            f"{1000 * phase.cpu:.1f} ms cpu"
+            for name, phase in sorted(self.phases.items())
+        )
+        lines.append(f"decoding: ~{1000 * self.decode_time():.1f} ms")
+        lines.extend(
+            f"{own:6d} {total:6d}  {function}"
+            for function, own, total in self.top(count)
+        )
+        return "\n".join(lines)
+
+
+def _stack(frame: FrameType | None) -> list[str]:
+    ret = []
+    while frame is not None:
+        code = frame.f_code
+        file = os.path.basename(code.co_filename)
+        ret.append(f"{code.co_name} ({file}:{code.co_firstlineno})")
+        frame = frame.f_back
+    ret.reverse()
+    return ret
@@ -0,0 +1,139 @@
+"""Caching Modbus TCP proxy for pypluggit."""
+
+import asyncio
+import logging
+import struct
+
+from pymodbus import ModbusException
+
+from .blocks import MAX_BLOCK, MAX_WRITE_BLOCK
+from .pluggit import ILLEGAL_DATA_ADDRESS, Pluggit, RegisterReadError
+
+_LOGGER = logging.getLogger(__name__)
+
+_MBAP = struct.Struct(">HHHB")
+
+READ_HOLDING_REGISTERS = 0x03
+WRITE_SINGLE_REGISTER = 0x06
+WRITE_MULTIPLE_REGISTERS = 0x10
+
+ILLEGAL_FUNCTION = 0x01
+ILLEGAL_DATA_VALUE = 0x03
+GATEWAY_TARGET_FAILED = 0x0B
+
+
+class ModbusProxy:
+    """Modbus TCP server sharing one Pluggit connection with other clients.
+
+    Reads of words that were read or written within max_age seconds are
+    answered from the register cache, other reads and all writes go to
+    the unit through the Pluggit's queue. Only holding registers are
+    supported, like on the unit itself.
+    """
+
+    def __init__(
+        self,
+        pluggit: Pluggit,
+        host: str | None = None,
+        port: int = 502,
+        max_age: float = 30,
+    ) -> None:
+        """Init proxy listening on host and port."""
+        self._pluggit = pluggit
+        self._host = host
+        self._port = port
+        self._max_age = max_age
+        self._server: asyncio.Server | None = None
+        self._clients: dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def start(self) -> None:
+        """Start listening."""
+        self._server = await asyncio.start_server(self._serve, self._host, self._port)
+
+    async def stop(self) -> None:
+        """Stop listening and close client connections."""
+        if self._server is not None:
+            self._server.close()
+            for writer in self._clients.values():
+                writer.close()
+            await asyncio.gather(*self._clients, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        peer = writer.get_extra_info("peername")
+        task = asyncio.current_task()
+        self._clients[task] = writer
+        try:
+            while True:
+                header = await reader.readexactly(_MBAP.size)
+                transaction, protocol, length, unit = _MBAP.unpack(header)
+                if protocol != 0 or length < 2:
+                    break
+                pdu = await reader.readexactly(length - 1)
+                response = await self._process(pdu)
+                writer.write(
+                    _MBAP.pack(transaction, 0, len(response) + 1, unit) + response
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception:
+            _LOGGER.exception("Modbus proxy client %s failed", peer)
+        finally:
+            self._clients.pop(task, None)
+            writer.close()
+
+    async def _process(self, pdu: bytes) -> bytes:
+        function = pdu[0]
+        try:
+            if function == READ_HOLDING_REGISTERS:
+                address, count = struct.unpack_from(">HH", pdu, 1)
+                if not 1 <= count <= MAX_BLOCK:
+                    return _error(function, ILLEGAL_DATA_VALUE)
+                words = await self._read(address, count)
+                return struct.pack(f">BB{count}H", function, 2 * count, *words)
+
+            if function == WRITE_SINGLE_REGISTER:
+                address, value = struct.unpack_from(">HH", pdu, 1)
+                await self._write(address, [value])
+                return pdu[:5]
+
+            if function == WRITE_MULTIPLE_REGISTERS:
+                address, count, size = struct.unpack_from(">HHB", pdu, 1)
+                if not 1 <= count <= MAX_WRITE_BLOCK or size != 2 * count:
+                    return _error(function, ILLEGAL_DATA_VALUE)
+                values = struct.unpack_from(f">{count}H", pdu, 6)
+                await self._write(address, list(values))
+                return pdu[:5]
+        except struct.error:
+            return _error(function, ILLEGAL_DATA_VALUE)
+        except RegisterReadError:
+            return _error(function, ILLEGAL_DATA_ADDRESS)
+        except ModbusException:
+            return _error(function, GATEWAY_TARGET_FAILED)
+
+        return _error(function, ILLEGAL_FUNCTION)
+
+    async def _read(self, address: int, count: int) -> list[int]:
+        words = self._pluggit.cached_words(address, count, self._max_age)
+        if words is not None:
+            self.hits += 1
+            return words
+        self.misses += 1
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self._pluggit.read_words, address, count
+        )
+
+    async def _write(self, address: int, words: list[int]) -> None:
+        await asyncio.get_running_loop().run_in_executor(
+            None, self._pluggit.write_words, address, words
+        )
+
+
+def _error(function: int, code: int) -> bytes:
+    return bytes((function | 0x80, code))
@@ -0,0 +1,372 @@
+"""Compressed append-only telemetry store for pypluggit.
+
+    python -m pypluggit.store unit.pgts
+    python -m pypluggit.store unit.pgts --start 2024-01-01 --end 2024-02-01 --csv
+
+One file per unit holds its samples in chunks of up to chunk_rows rows.
+Every chunk stores its columns separately: times in milliseconds as
+delta of delta, values as float32 XORed with the previous value. The
+bytes of each column are then grouped by significance and deflated, so
+the runs of zero bytes that slowly changing series produce compress well.
+Reads go through a memory map and only decode the chunks and columns a
+query touches.
+"""
+
+import argparse
+import array
+from bisect import bisect_left, bisect_right
+import csv
+from dataclasses import dataclass
+from datetime import datetime
+import itertools
+import json
+import math
+import mmap
+import operator
+import os
+from pathlib import Path
+import struct
+import sys
+from typing import Any, BinaryIO
+import zlib
+
+_MAGIC = b"PGTS"
+_VERSION = 1
+# Magic, version, chunk rows, length of the column names.
+_HEADER = struct.Struct("<4sBII")
+# Marker, rows, first time, last time, payload length, payload crc32.
+_CHUNK = struct.Struct("<4sIddII")
+_CHUNK_MAGIC = b"CHNK"
+
+
+@dataclass(frozen=True)
+class _Chunk:
+    """Position and time span of one chunk in the file."""
+
+    offset: int
+    rows: int
+    first: float
+    last: float
+    length: int
+
+
+def _shuffle(data: bytes, width: int) -> bytes:
+    """Group the bytes of width sized values by position."""
+    return b"".join(data[pos::width] for pos in range(width))
+
+
+def _unshuffle(data: bytes, width: int) -> bytes:
+    count = len(data) // width
+    ret = bytearray(len(data))
+    for pos in range(width):
+        ret[pos::width] = data[pos * count : (pos + 1) * count]
+    return bytes(ret)
+
+
+def _pack(values: array.array) -> bytes:
+    return zlib.compress(_shuffle(values.tobytes(), values.itemsize))
+
+
+def _unpack(data: bytes, typecode: str) -> array.array:
+    ret = array.array(typecode)
+    ret.frombytes(_unshuffle(zlib.decompress(data), ret.itemsize))
+    return ret
+
+
+def _diff(values: list[int]) -> list[int]:
+    return values[:1] + [b - a for a, b in itertools.pairwise(values)]
+
+
+def encode_times(times: list[float]) -> bytes:
+    """Compress times in seconds, kept to the millisecond."""
+    millis = [round(stamp * 1000) for stamp in times]
+    return _pack(array.array("q", _diff(_diff(millis))))
+
+
+def decode_times(data: bytes) -> list[float]:
+    """Decompress times from encode_times."""
+    deltas = itertools.accumulate(_unpack(data, "q"))
+    return [millis / 1000 for millis in itertools.accumulate(deltas)]
+
+
+def encode_values(values: list[float]) -> bytes:
+    """Compress values as float32, None is stored as NaN."""
+    bits = array.array("I")
+    bits.frombytes(
+        array.array("f", [math.nan if v is None else v for v in values]).tobytes()
+    )
+    return _pack(array.array("I", bits[:1].tolist() + _xor(bits)))
+
+
+def decode_values(data: bytes) -> array.array:
+    """Decompress float32 values from encode_values."""
+    bits = array.array("I", itertools.accumulate(_unpack(data, "I"), operator.xor))
+    ret = array.array("f")
+    ret.frombytes(bits.tobytes())
+    return ret
+
+
+def _xor(bits: array.array) -> list[int]:
+    return [a ^ b for a, b in itertools.pairwise(bits)]
+
+
+class TelemetryStore:
+    """Append-only time series of one unit in a file.
+
+    Rows are buffered until chunk_rows are reached, then written as one
+    chunk. close() and flush() write a shorter last chunk. A last chunk
+    torn by a crash is cut off when the file is opened again, recovered
+    holds the number of bytes dropped.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        columns: tuple[str, ...] | None = None,
+        chunk_rows: int = 1024,
+    ) -> None:
+        """Open the store at path, create it with columns if missing."""
+        self.path = Path(path)
+        self._chunks: list[_Chunk] = []
+        self._times: list[float] = []
+        self._rows: list[list[float | None]] = []
+        self._map: mmap.mmap | None = None
+        self._mapped = 0
+        self._last = -math.inf
+        self.recovered = 0
+
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            if columns is None:
+                raise FileNotFoundError(f"{path} doesn't exist and has no columns")
+            self.columns = tuple(columns)
+            self.chunk_rows = chunk_rows
+            names = json.dumps(self.columns).encode()
+            with self.path.open("wb") as file:
+                file.write(_HEADER.pack(_MAGIC, _VERSION, chunk_rows, len(names)))
+                file.write(names)
+            self._data_start = _HEADER.size + len(names)
+        else:
+            with self.path.open("rb") as file:
+                magic, version, self.chunk_rows, names_len = _HEADER.unpack(
+                    file.read(_HEADER.size)
+                )
+                if magic != _MAGIC or version != _VERSION:
+                    raise ValueError(f"{path} is not a pypluggit store")
+                self.columns = tuple(json.loads(file.read(names_len)))
+            if columns is not None and tuple(columns) != self.columns:
+                raise ValueError(f"{path} holds columns {self.columns}")
+            self._data_start = _HEADER.size + names_len
+            self._scan()
+            if self._chunks:
+                self._last = self._chunks[-1].last
+
+        self._file: BinaryIO | None = self.path.open("ab")
+
+    def __len__(self) -> int:
+        return sum(chunk.rows for chunk in self._chunks) + len(self._times)
+
+    @property
+    def chunks(self) -> int:
+        """Get the number of chunks written."""
+        return len(self._chunks)
+
+    @property
+    def span(self) -> tuple[float, float] | None:
+        """Get the first and last time held."""
+        times = [chunk.first for chunk in self._chunks[:1]] + self._times[:1]
+        if not times:
+            return None
+        return times[0], self._last
+
+    def append(self, stamp: float, values: Any) -> None:
+        """Add a row, values in column order or by column name."""
+        if stamp < self._last:
+            raise ValueError("Rows must be appended in time order")
+        if isinstance(values, dict):
+            row = [values.get(column) for column in self.columns]
+        else:
+            row = list(values)
+            if len(row) != len(self.columns):
+                raise ValueError(f"Expected {len(self.columns)} values")
+        self._times.append(stamp)
+        self._rows.append(row)
+        self._last = stamp
+        if len(self._times) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered rows as a chunk."""
+        if not self._times or self._file is None:
+            return
+        parts = [encode_times(self._times)] + [
+            encode_values([row[column] for row in self._rows])
+            for column in range(len(self.columns))
+        ]
+        lengths = struct.pack(f"<{len(parts)}I", *(len(part) for part in parts))
+        payload = lengths + b"".join(parts)
+        offset = self._file.tell()
+        self._file.write(
+            _CHUNK.pack(
+                _CHUNK_MAGIC,
+                len(self._times),
+                self._times[0],
+                self._times[-1],
+                len(payload),
+                zlib.crc32(payload),
+            )
+            + payload
+        )
+        self._file.flush()
+        self._chunks.append(
+            _Chunk(
+                offset, len(self._times), self._times[0], self._times[-1], len(payload)
+            )
+        )
+        self._times = []
+        self._rows = []
+
+    def close(self) -> None:
+        """Write buffered rows and close the file."""
+        self.flush()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def query(
+        self,
+        start: float | None = None,
+        end: float | None = None,
+        columns: tuple[str, ...] | None = None,
+    ) -> tuple[array.array, dict[str, array.array]]:
+        """Get times and values of columns with start <= time <= end."""
+        names = self.columns if columns is None else tuple(columns)
+        indexes = [self.columns.index(name) for name in names]
+        start = -math.inf if start is None else start
+        end = math.inf if end is None else end
+
+        times = array.array("d")
+        values = {name: array.array("f") for name in names}
+        # Chunks are in time order, skip those ending before start.
+        lasts = [chunk.last for chunk in self._chunks]
+        for chunk in self._chunks[bisect_left(lasts, start) :]:
+            if chunk.first > end:
+                break
+            chunk_times, chunk_values = self._read(chunk, indexes)
+            lo = bisect_left(chunk_times, start)
+            hi = bisect_right(chunk_times, end)
+            times.extend(chunk_times[lo:hi])
+            for name, column in zip(names, chunk_values, strict=True):
+                values[name].extend(column[lo:hi])
+
+        lo = bisect_left(self._times, start)
+        hi = bisect_right(self._times, end)
+        times.extend(self._times[lo:hi])
+        for name, index in zip(names, indexes, strict=True):
+            values[name].extend(
+                math.nan if row[index] is None else row[index]
+                for row in self._rows[lo:hi]
+            )
+        return times, values
+
+    def _view(self) -> memoryview:
+        size = self._chunks[-1].offset + _CHUNK.size + self._chunks[-1].length
+        if self._map is None or self._mapped < size:
+            if self._map is not None:
+                self._map.close()
+            with self.path.open("rb") as file:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mapped = len(self._map)
+        return memoryview(self._map)
+
+    def _read(
+        self, chunk: _Chunk, indexes: list[int]
+    ) -> tuple[list[float], list[array.array]]:
+        with self._view() as view:
+            offset = chunk.offset + _CHUNK.size
+            parts = len(self.columns) + 1
+            lengths = struct.unpack_from(f"<{parts}I", view, offset)
+            starts = list(itertools.accumulate(lengths, initial=offset + 4 * parts))
+            times = decode_times(bytes(view[starts[0] : starts[1]]))
+            values = [
+                decode_values(bytes(view[starts[index + 1] : starts[index + 2]]))
+                for index in indexes
+            ]
+        return times, values
+
+    def _scan(self) -> None:
+        """Index the chunks, cut off the file at the first damaged one."""
+        size = self.path.stat().st_size
+        pos = self._data_start
+        with self.path.open("rb") as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                while pos + _CHUNK.size <= size:
+                    magic, rows, first, last, length, crc = _CHUNK.unpack_from(
+                        data, pos
+                    )
+                    end = pos + _CHUNK.size + length
+                    if magic != _CHUNK_MAGIC or end > size:
+                        break
+                    # Only the last chunk can be torn, check it in full.
+                    if end == size and zlib.crc32(data[pos + _CHUNK.size : end]) != crc:
+                        break
+                    self._chunks.append(_Chunk(pos, rows, first, last, length))
+                    pos = end
+            finally:
+                data.close()
+        if pos < size:
+            self.recovered = size - pos
+            os.truncate(self.path, pos)
+
+
+def _time(text: str) -> float:
+    return datetime.fromisoformat(text).timestamp()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Print a summary of a store, or export a range as CSV."""
+    parser = argparse.ArgumentParser(
+        prog="pypluggit.store",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("store", type=Path)
+    parser.add_argument("--start", type=_time)
+    parser.add_argument("--end", type=_time)
+    parser.add_argument("--columns", nargs="+")
+    parser.add_argument("--csv", action="store_true", help="print rows as CSV")
+    args = parser.parse_args(argv)
+
+    store = TelemetryStore(args.store)
+    try:
+        if not args.csv:
+            span = store.span
+            print(
+                json.dumps(
+                    {
+                        "rows": len(store),
+                        "chunks": store.chunks,
+                        "columns": store.columns,
+                        "start": span and datetime.fromtimestamp(span[0]).isoformat(),
+                        "end": span and datetime.fromtimestamp(span[1]).isoformat(),
+                        "bytes": store.path.stat().st_size,
+                        "recovered_bytes": store.recovered,
+                    },
+                    indent=2,
+                )
+            )
+            return 0
+        times, values = store.query(args.start, args.end, args.columns)
+        writer = csv.writer(sys.stdout)
+        writer.writerow(["time", *values])
+        writer.writerows(zip(times, *values.values(), strict=True))
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""Holding register sweep and snapshot diff for pypluggit.
+
+    python -m pypluggit.sweep read 192.168.0.1 before.snap
+    python -m pypluggit.sweep read 192.168.0.1 after.snap
+    python -m pypluggit.sweep diff before.snap after.snap
+"""
+
+import argparse
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import json
+from pathlib import Path
+import struct
+import sys
+import time
+
+from .blocks import MAX_BLOCK, bisect_read
+from .codec import decode_as
+from .const import REGISTER_DIC
+
+_MAGIC = b"PGSN"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBdI")
+_RUN = struct.Struct("<HH")
+# Raw types every changed 32 bit value is shown as.
+_DIFF_TYPES = ("uint32", "float32")
+
+_NAMES = {item[0]: register.name for register, item in REGISTER_DIC.items()}
+
+
+@dataclass
+class Snapshot:
+    """Raw words of a sweep, by address."""
+
+    words: dict[int, int] = field(default_factory=dict)
+    unreadable: list[int] = field(default_factory=list)
+    meta: dict = field(default_factory=dict)
+    time: float = field(default_factory=time.time)
+
+    def save(self, path: Path) -> None:
+        """Write snapshot as runs of consecutive words."""
+        meta = json.dumps({**self.meta, "unreadable": self.unreadable}).encode()
+        parts = [_HEADER.pack(_MAGIC, _VERSION, self.time, len(meta)), meta]
+        for address, words in _runs(self.words):
+            parts.append(_RUN.pack(address, len(words)))
+            parts.append(struct.pack(f"<{len(words)}H", *words))
+        Path(path).write_bytes(b"".join(parts))
+
+    @classmethod
+    def load(cls, path: Path) -> "Snapshot":
+        """Read a snapshot written by save."""
+        data = Path(path).read_bytes()
+        magic, version, stamp, meta_len = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not a pypluggit snapshot")
+        pos = _HEADER.size
+        meta = json.loads(data[pos : pos + meta_len])
+        pos += meta_len
+
+        words: dict[int, int] = {}
+        while pos < len(data):
+            address, count = _RUN.unpack_from(data, pos)
+            pos += _RUN.size
+            values = struct.unpack_from(f"<{count}H", data, pos)
+            pos += 2 * count
+            words.update(zip(range(address, address + count), values, strict=True))
+
+        unreadable = meta.pop("unreadable", [])
+        return cls(words=words, unreadable=unreadable, meta=meta, time=stamp)
+
+
+def _runs(words: dict[int, int]) -> list[tuple[int, list[int]]]:
+    runs: list[tuple[int, list[int]]] = []
+    for address in sorted(words):
+        last = runs[-1] if runs else None
+        if last and last[0] + len(last[1]) == address and len(last[1]) < 0xFFFF:
+            last[1].append(words[address])
+        else:
+            runs.append((address, [words[address]]))
+    return runs
+
+
+def sweep(
+    read: Callable[[int, int], list[int] | None],
+    refused: type[Exception],
+    start: int = 0,
+    end: int = 1024,
+    block: int = MAX_BLOCK,
+) -> Snapshot:
+    """Read start to end in blocks, bisecting blocks the unit refuses.
+
+    read(address, count) returns the words, None if the read failed for
+    another reason, or raises refused. Addresses that fail on their own
+    end up in Snapshot.unreadable, words of failed reads are missing.
+    """
+    snapshot = Snapshot()
+    unreadable: set[int] = set()
+    for address in range(start, end, block):
+        words, refused_words = bisect_read(
+            [(word, 1) for word in range(address, min(address + block, end))],
+            lambda part: read(part.address, part.count),
+            refused,
+        )
+        snapshot.words.update(words)
+        unreadable |= refused_words
+    snapshot.unreadable = sorted(unreadable)
+    return snapshot
+
+
+def diff(before: Snapshot, after: Snapshot) -> list[dict]:
+    """List the 32 bit values that differ between two snapshots."""
+    changed = {
+        address & ~1
+        for address in before.words.keys() | after.words.keys()
+        if before.words.get(address) != after.words.get(address)
+    }
+
+    ret = []
+    for address in sorted(changed):
+        row: dict = {"address": address, "name": _NAMES.get(address)}
+        for label, snapshot in (("before", before), ("after", after)):
+            low = snapshot.words.get(address)
+            high = snapshot.words.get(address + 1)
+            if low is None or high is None:
+                row[label] = None
+            else:
+                row[label] = {
+                    data_type: decode_as([low, high], data_type)[0]
+                    for data_type in _DIFF_TYPES
+                }
+        ret.append(row)
+    return ret
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the sweep tool."""
+    parser = argparse.ArgumentParser(
+        prog="pypluggit.sweep",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    read_parser = commands.add_parser("read", help="sweep a unit into a snapshot")
+    read_parser.add_argument("host")
+    read_parser.add_argument("out", type=Path)
+    read_parser.add_argument("--start", type=int, default=0)
+    read_parser.add_argument("--end", type=int, default=1024)
+    diff_parser = commands.add_parser("diff", help="compare two snapshots")
+    diff_parser.add_argument("before", type=Path)
+    diff_parser.add_argument("after", type=Path)
+    args = parser.parse_args(argv)
+
+    if args.command == "diff":
+        for row in diff(Snapshot.load(args.before), Snapshot.load(args.after)):
+            print(json.dumps(row))
+        return 0
+
+    from pymodbus import ModbusException  # noqa: PLC0415
+
+    from .pluggit import Pluggit, RegisterReadError  # noqa: PLC0415
+
+    pluggit = Pluggit(args.host)
+
+    def read(address: int, count: int) -> list[int] | None:
+        try:
+            return pluggit.read_words(address, count)
+        except RegisterReadError:
+            raise
+        except ModbusException as err:
+            print(err, file=sys.stderr)
+            return None
+
+    try:
+        started = time.monotonic()
+        snapshot = sweep(read, RegisterReadError, args.start, args.end)
+        snapshot.meta = {
+            "host": args.host,
+            "unit_type": pluggit.get_unit_type(),
+            "firmware": pluggit.get_firmware_version(),
+        }
+    finally:
+        pluggit.close()
+
+    snapshot.save(args.out)
+    print(
+        f"{len(snapshot.words)} words, {len(snapshot.unreadable)} unreadable "
+        f"in {time.monotonic() - started:.1f} s",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
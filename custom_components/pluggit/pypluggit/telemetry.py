@@ -0,0 +1,82 @@
+"""Batched telemetry frames for pypluggit."""
+
+from collections import deque
+from collections.abc import Mapping
+import math
+from typing import Any
+
+from .const import Registers
+
+# Samples held before the oldest are dropped.
+MAX_PENDING = 120
+
+
+def telemetry_row(
+    registers: tuple[Registers, ...], values: Mapping[Registers, Any]
+) -> list[float | None]:
+    """Get the values of registers rounded for sending, None where missing."""
+    return [_compact(values.get(register)) for register in registers]
+
+
+def _compact(value: Any) -> float | None:
+    if value is None or (isinstance(value, float) and not math.isfinite(value)):
+        return None
+    return round(value, 2)
+
+
+class TelemetryBatch:
+    """Samples waiting to be sent as one frame of columns.
+
+    At most one frame goes out every batch seconds. When more than
+    max_pending samples wait the oldest are dropped, and counted in the
+    next frame.
+    """
+
+    def __init__(
+        self,
+        registers: tuple[Registers, ...],
+        batch: float,
+        max_pending: int = MAX_PENDING,
+    ) -> None:
+        """Init empty batch of registers."""
+        self.registers = registers
+        self.batch = batch
+        self._pending: deque[tuple[float, list[float | None]]] = deque(
+            maxlen=max_pending
+        )
+        self._dropped = 0
+        self._last_sent = -math.inf
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, stamp: float, row: list[float | None]) -> None:
+        """Add a row of telemetry_row taken at stamp."""
+        if len(self._pending) == self._pending.maxlen:
+            self._dropped += 1
+        self._pending.append((stamp, row))
+
+    def delay(self, now: float) -> float:
+        """Get the seconds from now until the next frame may go out."""
+        return max(0.0, self._last_sent + self.batch - now)
+
+    def frame(self, now: float) -> dict[str, Any] | None:
+        """Take every pending sample as a frame sent at now, None if empty."""
+        if not self._pending:
+            return None
+        ret = {
+            "t": [round(stamp, 3) for stamp, _ in self._pending],
+            "values": {
+                register.name: [row[column] for _, row in self._pending]
+                for column, register in enumerate(self.registers)
+            },
+            "dropped": self._dropped,
+        }
+        self.clear()
+        self._last_sent = now
+        return ret
+
+    def clear(self) -> None:
+        """Drop pending samples."""
+        self._pending.clear()
+        self._dropped = 0
@@ -0,0 +1,282 @@
+"""Record and replay of Modbus traffic for pypluggit.
+
+    python -m pypluggit --record field.pgtr HOST dump
+    python -m pypluggit --replay field.pgtr --speed 10 HOST watch
+    python -m pypluggit.trace field.pgtr
+"""
+
+import argparse
+from collections import defaultdict, deque
+from dataclasses import dataclass
+import json
+from pathlib import Path
+import statistics
+import struct
+import sys
+import threading
+import time
+from typing import Any, BinaryIO
+
+from pymodbus import ModbusException
+
+_MAGIC = b"PGTR"
+_VERSION = 2
+_HEADER = struct.Struct("<4sBd")
+# Offset from start, duration, function, address, count, status.
+_RECORD = struct.Struct("<dfBHHB")
+
+READ = 0x03
+WRITE = 0x10
+
+# Outcome in the low nibble of the status.
+OK = 0
+# The unit answered with a Modbus exception response, its exception code
+# is kept in the high nibble of the status.
+REFUSED = 1
+# The request raised, e.g. the connection was lost.
+FAILED = 2
+_OUTCOME = 0x0F
+
+
+@dataclass(frozen=True)
+class Record:
+    """One request with its outcome.
+
+    words are the registers read, or written, by the request.
+    """
+
+    time: float
+    duration: float
+    function: int
+    address: int
+    count: int
+    status: int
+    words: tuple[int, ...]
+
+
+class _Response:
+    """Stand-in for a pymodbus response."""
+
+    def __init__(
+        self, words: tuple[int, ...], error: bool, exception_code: int = 0
+    ) -> None:
+        self.registers = list(words)
+        self._error = error
+        self.exception_code = exception_code
+
+    def isError(self) -> bool:  # noqa: N802 - pymodbus name
+        return self._error
+
+
+class RecordingClient:
+    """Modbus client wrapper writing every request to a trace file."""
+
+    def __init__(self, client: Any, path: Path) -> None:
+        """Init recorder of client into path."""
+        self._client = client
+        self._lock = threading.Lock()
+        self._start = time.time()
+        self._started = time.perf_counter()
+        self._file: BinaryIO | None = Path(path).open("wb")
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, self._start))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    def read_holding_registers(self, address: int, count: int = 1, **kwargs) -> Any:
+        """Read and record."""
+        return self._call(
+            READ,
+            address,
+            count,
+            lambda: self._client.read_holding_registers(
+                address=address, count=count, **kwargs
+            ),
+        )
+
+    def write_registers(self, address: int, values: list[int], **kwargs) -> Any:
+        """Write and record."""
+        return self._call(
+            WRITE,
+            address,
+            len(values),
+            lambda: self._client.write_registers(
+                address=address, values=values, **kwargs
+            ),
+            tuple(values),
+        )
+
+    def close(self) -> None:
+        """Close client and trace."""
+        self._client.close()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _call(
+        self,
+        function: int,
+        address: int,
+        count: int,
+        request: Any,
+        words: tuple[int, ...] = (),
+    ) -> Any:
+        started = time.perf_counter()
+        try:
+            ret = request()
+        except ModbusException:
+            self._record(started, function, address, count, FAILED, words)
+            raise
+        if ret.isError():
+            code = getattr(ret, "exception_code", 0) & _OUTCOME
+            self._record(started, function, address, count, REFUSED | code << 4, words)
+        else:
+            if function == READ:
+                words = tuple(ret.registers)
+            self._record(started, function, address, count, OK, words)
+        return ret
+
+    def _record(
+        self,
+        started: float,
+        function: int,
+        address: int,
+        count: int,
+        status: int,
+        words: tuple[int, ...],
+    ) -> None:
+        duration = time.perf_counter() - started
+        data = _RECORD.pack(
+            started - self._started, duration, function, address, count, status
+        ) + struct.pack(f"<{len(words)}H", *words)
+        with self._lock:
+            if self._file is not None:
+                # Length first, so a torn last record is easy to spot.
+                self._file.write(struct.pack("<H", len(data)) + data)
+                self._file.flush()
+
+
+def load(path: Path) -> tuple[float, list[Record]]:
+    """Read start time and records of a trace, up to a torn last record."""
+    data = Path(path).read_bytes()
+    magic, version, start = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"{path} is not a pypluggit trace")
+
+    records = []
+    pos = _HEADER.size
+    while pos + 2 <= len(data):
+        (length,) = struct.unpack_from("<H", data, pos)
+        pos += 2
+        if pos + length > len(data) or length < _RECORD.size:
+            break
+        fields = _RECORD.unpack_from(data, pos)
+        count = (length - _RECORD.size) // 2
+        words = struct.unpack_from(f"<{count}H", data, pos + _RECORD.size)
+        records.append(Record(*fields, words))
+        pos += length
+    return start, records
+
+
+class ReplayClient:
+    """Modbus client answering from a trace instead of a unit.
+
+    Each request gets the next recorded answer to the same function,
+    address and count, so the result doesn't depend on how requests of
+    different registers interleave. With speed, every answer takes its
+    recorded duration divided by speed; without, answers are immediate.
+    Requests the trace can't answer raise ModbusException, unless loop
+    starts the answers of that request over.
+    """
+
+    def __init__(
+        self, path: Path, speed: float | None = None, loop: bool = False
+    ) -> None:
+        """Init replay of the trace at path."""
+        _, records = load(path)
+        self._speed = speed
+        self._loop = loop
+        self._lock = threading.Lock()
+        self._recorded: dict[tuple[int, int, int], list[Record]] = defaultdict(list)
+        for record in records:
+            self._recorded[record.function, record.address, record.count].append(record)
+        self._pending = {key: deque(value) for key, value in self._recorded.items()}
+        self.served = 0
+        self.missed = 0
+        self.connected = True
+
+    def connect(self) -> bool:
+        """Pretend to connect."""
+        return True
+
+    def close(self) -> None:
+        """Nothing to close."""
+
+    def read_holding_registers(self, address: int, count: int = 1, **kwargs) -> Any:
+        """Answer a read from the trace."""
+        return self._answer(READ, address, count)
+
+    def write_registers(self, address: int, values: list[int], **kwargs) -> Any:
+        """Answer a write from the trace."""
+        return self._answer(WRITE, address, len(values))
+
+    def _answer(self, function: int, address: int, count: int) -> _Response:
+        key = (function, address, count)
+        with self._lock:
+            pending = self._pending.get(key)
+            if not pending and self._loop and key in self._recorded:
+                pending = self._pending[key] = deque(self._recorded[key])
+            if not pending:
+                self.missed += 1
+                raise ModbusException(f"No answer to {key} in trace")
+            record = pending.popleft()
+            self.served += 1
+
+        if self._speed:
+            time.sleep(record.duration / self._speed)
+        status, code = record.status & _OUTCOME, record.status >> 4
+        if status == FAILED:
+            raise ModbusException(f"Recorded failure of {key}")
+        if status == REFUSED:
+            return _Response(record.words, True, code)
+        return _Response(record.words, False)
+
+
+def summary(records: list[Record]) -> dict[str, Any]:
+    """Get counts and latencies of records."""
+    latencies = sorted(record.duration for record in records)
+    ret: dict[str, Any] = {
+        "records": len(records),
+        "reads": sum(record.function == READ for record in records),
+        "writes": sum(record.function == WRITE for record in records),
+        "refused": sum(record.status & _OUTCOME == REFUSED for record in records),
+        "failed": sum(record.status & _OUTCOME == FAILED for record in records),
+    }
+    if records:
+        ret["span_s"] = round(records[-1].time - records[0].time, 3)
+        ret["latency_ms"] = {
+            "median": round(1000 * statistics.median(latencies), 2),
+            "p95": round(1000 * latencies[int(0.95 * (len(latencies) - 1))], 2),
+            "max": round(1000 * latencies[-1], 2),
+        }
+    return ret
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Print a summary of a trace."""
+    parser = argparse.ArgumentParser(
+        prog="pypluggit.trace",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("trace", type=Path)
+    args = parser.parse_args(argv)
+
+    start, records = load(args.trace)
+    print(json.dumps({"start": start, **summary(records)}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
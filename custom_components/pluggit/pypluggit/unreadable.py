@@ -0,0 +1,50 @@
+"""Unreadable register index for pypluggit."""
+
+from collections.abc import Iterable
+import json
+import logging
+from pathlib import Path
+import threading
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class UnreadableIndex:
+    """Addresses units refused to read, by unit and firmware.
+
+    Stored as a small JSON file so block reads are planned around them
+    after a restart, instead of failing and bisecting again.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Init index stored at path."""
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self._data: dict[str, list[int]] | None = None
+
+    def get(self, key: str) -> set[int]:
+        """Get the unreadable addresses of key."""
+        with self._lock:
+            return set(self._load().get(key, ()))
+
+    def add(self, key: str, addresses: Iterable[int]) -> None:
+        """Add unreadable addresses of key and store the index."""
+        with self._lock:
+            data = self._load()
+            data[key] = sorted(set(data.get(key, ())) | set(addresses))
+            try:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                self._path.write_text(json.dumps(data), encoding="utf-8")
+            except OSError as err:
+                _LOGGER.warning("Could not store %s: %s", self._path, err)
+
+    def _load(self) -> dict[str, list[int]]:
+        if self._data is None:
+            try:
+                self._data = json.loads(self._path.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                self._data = {}
+            except (OSError, ValueError) as err:
+                _LOGGER.warning("Ignoring unreadable index %s: %s", self._path, err)
+                self._data = {}
+        return self._data
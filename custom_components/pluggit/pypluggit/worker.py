@@ -0,0 +1,103 @@
+"""Serialized Modbus I/O for pypluggit."""
+
+from collections.abc import Callable
+from concurrent.futures import Future
+from enum import IntEnum
+from itertools import count
+import logging
+from queue import PriorityQueue
+import threading
+from typing import Any, TypeVar
+
+from .profiling import Profiler
+
+_LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Queued behind every real job, so close() drains what is already pending.
+_STOP = 99
+
+
+class Priority(IntEnum):
+    """Priority of a queued transaction, lower values run first."""
+
+    WRITE = 0
+    COMMAND = 1
+    POLL = 2
+
+
+class IOWorker:
+    """Run every transaction of one device on a single thread.
+
+    Jobs are taken from a priority queue, so writes and user-initiated reads
+    overtake scheduled polls. Each job should be one short transaction; a
+    poll cycle made of many jobs then yields to commands between them.
+    """
+
+    def __init__(self, client: Any, name: str = "pypluggit-io") -> None:
+        """Init worker for client."""
+        self._client = client
+        self._name = name
+        self._queue: PriorityQueue = PriorityQueue()
+        self._seq = count()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        # Set to time every job as phase "io".
+        self.profiler: Profiler | None = None
+
+    @property
+    def client(self) -> Any:
+        """Return the client owned by this worker."""
+        return self._client
+
+    def submit(self, job: Callable[[Any], T], priority: Priority = Priority.POLL) -> T:
+        """Queue job and block until it has run on the worker thread."""
+        if threading.current_thread() is self._thread:
+            # Nested call from a running job, the client is already ours.
+            return job(self._client)
+
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("I/O worker is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=self._name, daemon=True
+                )
+                self._thread.start()
+            self._queue.put((int(priority), next(self._seq), job, future))
+
+        return future.result()
+
+    def close(self) -> None:
+        """Finish pending jobs, stop the thread and close the client."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+            if thread is not None:
+                self._queue.put((_STOP, next(self._seq), None, None))
+
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self._client.close()
+
+    def _run(self) -> None:
+        while True:
+            _, _, job, future = self._queue.get()
+            if job is None:
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+            profiler = self.profiler
+            if profiler is not None:
+                job = profiler.wrap("io", job)
+            try:
+                result = job(self._client)
+            except BaseException as err:  # noqa: BLE001 - handed to the caller
+                future.set_exception(err)
+            else:
+                future.set_result(result)
@@ -0,0 +1,119 @@
+"""Batched state refresh of the polled entities of a unit."""
+
+import asyncio
+from collections.abc import Callable, Mapping
+from typing import Any, Protocol
+
+from homeassistant.core import HomeAssistant, callback
+
+from .pypluggit.fields import key_registers, key_value
+from .pypluggit.pluggit import Pluggit
+from .pypluggit.poller import Key, Poller
+
+# Seconds the unit gets to act on a command before its state is read back.
+COMMAND_SETTLE = 0.2
+
+
+class RefreshEntity(Protocol):
+    """Entity whose state is computed from one snapshot of decoded keys."""
+
+    refresh_keys: tuple[Key, ...]
+
+    def apply_refresh(self, values: Mapping[Key, Any]) -> None:
+        """Set the state from the latest values, keys not read yet are missing."""
+
+    def async_write_ha_state(self) -> None:
+        """Write the state."""
+
+
+class PluggitRefresh:
+    """One decoded snapshot per cycle for the polled entities of a unit.
+
+    The entities of all platforms add their keys, and a single poller
+    subscription reads and decodes the union of them once per cycle. The
+    changed keys are looked up in a key to entities table built as
+    entities are added, and every entity one of its keys changed for is
+    computed and written in the same event loop callback, so all states
+    of a unit change together.
+    """
+
+    def __init__(self, hass: HomeAssistant, poller: Poller) -> None:
+        """Initialise refresh of the unit poller polls."""
+        self._hass = hass
+        self._poller = poller
+        self._values: dict[Key, Any] = {}
+        self._entities: dict[Key, list[RefreshEntity]] = {}
+        self._subscribed: frozenset[Key] = frozenset()
+        self._unsubscribe: Callable[[], None] | None = None
+        self._resubscribe_scheduled = False
+
+    @property
+    def pluggit(self) -> Pluggit:
+        """Return the refreshed device."""
+        return self._poller.pluggit
+
+    @callback
+    def add(self, entity: RefreshEntity) -> Callable[[], None]:
+        """Refresh entity with every cycle, return remove."""
+        for key in entity.refresh_keys:
+            self._entities.setdefault(key, []).append(entity)
+        if all(key in self._values for key in entity.refresh_keys):
+            entity.apply_refresh(self._values)
+        self._schedule_resubscribe()
+
+        @callback
+        def remove() -> None:
+            for key in entity.refresh_keys:
+                self._entities[key].remove(entity)
+                if not self._entities[key]:
+                    del self._entities[key]
+                    self._values.pop(key, None)
+            self._schedule_resubscribe()
+
+        return remove
+
+    async def async_request(self, entity: RefreshEntity) -> None:
+        """Read back the keys of entity after a command to the unit."""
+        await asyncio.sleep(COMMAND_SETTLE)
+        keys = entity.refresh_keys
+        values = await self._hass.async_add_executor_job(
+            self.pluggit.read_registers,
+            {register for key in keys for register in key_registers(key)},
+        )
+        self._async_apply({key: key_value(key, values) for key in keys})
+
+    def _schedule_resubscribe(self) -> None:
+        # Entities of all platforms are added in a burst, subscribe once.
+        if not self._resubscribe_scheduled:
+            self._resubscribe_scheduled = True
+            self._hass.loop.call_soon(self._resubscribe)
+
+    @callback
+    def _resubscribe(self) -> None:
+        self._resubscribe_scheduled = False
+        keys = frozenset(self._entities)
+        if keys == self._subscribed:
+            return
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        self._subscribed = keys
+        if keys:
+            self._unsubscribe = self._poller.subscribe(keys, self._deliver)
+
+    def _deliver(self, values: dict[Key, Any]) -> None:
+        """Hand changed values from the poller thread to the event loop."""
+        self._hass.loop.call_soon_threadsafe(self._async_apply, values)
+
+    @callback
+    def _async_apply(self, values: dict[Key, Any]) -> None:
+        self._values.update(values)
+        changed = {
+            id(entity): entity
+            for key in values
+            for entity in self._entities.get(key, ())
+        }
+        for entity in changed.values():
+            entity.apply_refresh(self._values)
+        for entity in changed.values():
+            entity.async_write_ha_state()
@@ -1,6 +1,8 @@
 """Select."""
 
+from collections.abc import Mapping
 import logging
+from typing import Any
 
 from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
@@ -9,8 +11,10 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
-from .const import DOMAIN, SERIAL_NUMBER
-from .pypluggit.pluggit import Pluggit, WeekProgram
+from .const import DEVICE_INFO, DOMAIN, REFRESH
+from .pypluggit.pluggit import WeekProgram
+from .pypluggit.poller import Key
+from .refresh import PluggitRefresh
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -22,18 +26,17 @@ async def async_setup_entry(
 ) -> None:
     """Set up select."""
     data = hass.data[DOMAIN][entry.entry_id]
-    pluggit: Pluggit = data[DOMAIN]
-    serial_number = data[SERIAL_NUMBER]
+    device = data[DEVICE_INFO]
 
-    async_add_entities(
-        [PluggitSelect(pluggit=pluggit, serial_number=serial_number)],
-        update_before_add=True,
-    )
+    async_add_entities([PluggitSelect(refresh=data[REFRESH], device=device)])
 
 
 class PluggitSelect(SelectEntity):
     """Pluggit Select."""
 
+    _attr_should_poll = False
+    refresh_keys = ("week_program",)
+
     OPTIONS = {
         WeekProgram.PROGRAM_1: "1",
         WeekProgram.PROGRAM_2: "2",
@@ -50,12 +53,12 @@ class PluggitSelect(SelectEntity):
 
     def __init__(
         self,
-        pluggit: Pluggit,
-        serial_number: int,
+        refresh: PluggitRefresh,
+        device: DeviceInfo,
     ) -> None:
         """Initialise Pluggit sensor."""
-        self._pluggit = pluggit
-        self._serial_number = str(serial_number)
+        self._refresh = refresh
+        self._pluggit = refresh.pluggit
         self._attr_unique_id = "week_program"
         self._attr_translation_key = "select_week"
         self._attr_current_option = None
@@ -63,23 +66,27 @@ class PluggitSelect(SelectEntity):
         self._attr_has_entity_name = True
         self._attr_options = list(self.OPTIONS.values())
         self._attr_available = False
-        self._attr_device_info = DeviceInfo(
-            name="Pluggit", identifiers={(DOMAIN, self._serial_number)}
-        )
+        self._attr_device_info = device
+
+    async def async_added_to_hass(self) -> None:
+        """Refresh with the other entities of the unit."""
+        self.async_on_remove(self._refresh.add(self))
 
-    def select_option(self, option: str) -> None:
+    async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
         result = [
             program
             for program, my_option in self.OPTIONS.items()
             if my_option == option
         ]
-        self._pluggit.set_week_program(number=result[0])
-
-    def update(self) -> None:
-        """Fetch data for select."""
+        await self.hass.async_add_executor_job(
+            self._pluggit.set_week_program, result[0]
+        )
+        await self._refresh.async_request(self)
 
-        result = self._pluggit.get_week_program()
+    def apply_refresh(self, values: Mapping[Key, Any]) -> None:
+        """Set the option from a refreshed snapshot."""
+        result = values.get("week_program")
         if result is not None:
             self._attr_current_option = self.OPTIONS[result]
             self._attr_available = True
@@ -1,9 +1,11 @@
 """Sensors."""
 
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
+import time
+from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -19,13 +21,28 @@ from homeassistant.const import (
     UnitOfTemperature,
     UnitOfTime,
 )
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_time_change,
+    async_track_time_interval,
+)
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import StateType
-from homeassistant.util.dt import DEFAULT_TIME_ZONE, now
+from homeassistant.util.dt import (
+    DEFAULT_TIME_ZONE,
+    now,
+    start_of_local_day,
+    utc_from_timestamp,
+)
 
-from .const import DOMAIN, SERIAL_NUMBER
+from .const import DEVICE_INFO, DOMAIN, FLEET, POLLER, REFRESH, SERIAL_NUMBER
+from .pypluggit.clogging import CLOGGING_REGISTERS, FilterPredictor
+from .pypluggit.const import Registers
+from .pypluggit.fleet import FLEET_REGISTERS, METRICS, STATS, FleetAggregator
+from .pypluggit.modetime import MODE_REGISTERS, ModeTimer
 from .pypluggit.pluggit import (
     BYPASS_STATE,
     CURRENT_UNIT_MODE,
@@ -33,17 +50,61 @@ from .pypluggit.pluggit import (
     Pluggit,
     SpeedLevelFan,
 )
+from .pypluggit.poller import Key, Poller
+from .refresh import PluggitRefresh
 
 _LOGGER = logging.getLogger(__name__)
 # pylint: disable=unnecessary-lambda
 # SCAN_INTERVAL = timedelta(seconds=20)
 
+# Seconds between samples of the filter clogging predictor.
+FILTER_INTERVAL = 300
+FILTER_STORAGE_VERSION = 1
+# Seconds the learned state may wait before it is saved.
+FILTER_SAVE_DELAY = 900
+
+MODE_TIME_STORAGE_VERSION = 1
+# Seconds the totals may wait before they are saved.
+MODE_TIME_SAVE_DELAY = 300
+# How often the time sensors count up between transitions.
+MODE_TIME_REFRESH = timedelta(minutes=1)
+MODE_TIME_PERIODS = ("daily", "weekly")
+MODE_TIME_STATES = {
+    Registers.PRM_CURRENT_BL_STATE: ("unit_mode", CURRENT_UNIT_MODE),
+    Registers.PRM_RAM_IDX_BYPASS_ACTUAL_STATE: ("bypass", BYPASS_STATE),
+}
+# States whose time sensors are enabled by default.
+MODE_TIME_ENABLED = {
+    Registers.PRM_CURRENT_BL_STATE: {1, 2, 3, 5, 6, 9, 15, 16},
+    Registers.PRM_RAM_IDX_BYPASS_ACTUAL_STATE: {255},
+}
+
+# Seconds samples of the units are gathered before the aggregates are
+# computed, so units polled at about the same time share one pass.
+FLEET_SETTLE = 2
+# Sensors the fleet metrics take their unit and device class from.
+FLEET_SENSOR_KEYS = {
+    "t3_extract": "T3",
+    "humidity": "get_humidity",
+    "voc": "get_voc",
+    "filter_remain": "filter_remain",
+}
+FLEET_DEVICE = DeviceInfo(
+    identifiers={(DOMAIN, "fleet")},
+    name="Pluggit fleet",
+    manufacturer="Pluggit",
+    entry_type=DeviceEntryType.SERVICE,
+)
+
 
 @dataclass(kw_only=True)
 class PluggitSensorEntityDescription(SensorEntityDescription):
     """Describes Pluggit sensor entity."""
 
-    value_fn: Callable[[Pluggit], StateType]
+    # Register or field shown, refreshed with the other entities of the unit.
+    field: Key | None = None
+    # Polled instead for values that aren't registers.
+    value_fn: Callable[[Pluggit], StateType] | None = None
     icon_fn: Callable[[StateType], str]
 
 
@@ -55,7 +116,7 @@ SENSORS: tuple[PluggitSensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
         suggested_display_precision=1,
-        value_fn=lambda device: device.get_temperature_t1(),
+        field=Registers.PRM_RAM_IDX_T1,
         icon_fn=None,
     ),
     PluggitSensorEntityDescription(
@@ -65,7 +126,7 @@ SENSORS: tuple[PluggitSensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
         suggested_display_precision=1,
-        value_fn=lambda device: device.get_temperature_t2(),
+        field=Registers.PRM_RAM_IDX_T2,
         icon_fn=None,
     ),
     PluggitSensorEntityDescription(
@@ -75,7 +136,7 @@ SENSORS: tuple[PluggitSensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
         suggested_display_precision=1,
-        value_fn=lambda device: device.get_temperature_t3(),
+        field=Registers.PRM_RAM_IDX_T3,
         icon_fn=None,
     ),
     PluggitSensorEntityDescription(
@@ -85,7 +146,7 @@ SENSORS: tuple[PluggitSensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
         suggested_display_precision=1,
-        value_fn=lambda device: device.get_temperature_t4(),
+        field=Registers.PRM_RAM_IDX_T4,
         icon_fn=None,
     ),
     PluggitSensorEntityDescription(
@@ -96,7 +157,7 @@ SENSORS: tuple[PluggitSensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfTime.HOURS,
         state_class=SensorStateClass.MEASUREMENT,
         icon="mdi:progress-clock",
-        value_fn=lambda device: device.get_work_time(),
+        field=Registers.PRM_WORK_TIME,
         icon_fn=None,
     ),
     PluggitSensorEntityDescription(
@@ -106,7 +167,7 @@ SENSORS: tuple[PluggitSensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfTime.DAYS,
         state_class=SensorStateClass.MEASUREMENT,
         icon="mdi:air-filter",
-        value_fn=lambda device: device.get_remaining_filter_time(),
+        field=Registers.PRM_FILTER_REMAINING_TIME,
         icon_fn=None,
     ),
     PluggitSensorEntityDescription(
@@ -115,7 +176,7 @@ SENSORS: tuple[PluggitSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.ENUM,
         options=list(DEGREE_OF_DIRTINESS.values()),
         icon="mdi:liquid-spot",
-        value_fn=lambda device: device.get_filter_dirtiness(),
+        field="filter_dirtiness",
         icon_fn=None,
     ),
     PluggitSensorEntityDescription(
@@ -124,7 +185,7 @@ SENSORS: tuple[PluggitSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.ENUM,
         options=list(BYPASS_STATE.values()),
         entity_registry_enabled_default=False,
-        value_fn=lambda device: device.get_bypass_actual_state(),
+        field="bypass_state",
         icon_fn=lambda value: set_bypass_icon(value),
     ),
     PluggitSensorEntityDescription(
@@ -134,7 +195,18 @@ SENSORS: tuple[PluggitSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.TIMESTAMP,
         state_class=None,
         entity_registry_enabled_default=False,
-        value_fn=lambda device: help_time(device.get_date_time()),
+        value_fn=lambda device: help_time(device.get_device_time()),
+        icon_fn=None,
+    ),
+    PluggitSensorEntityDescription(
+        key="clock_drift",
+        translation_key="clock_drift",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:clock-alert-outline",
+        value_fn=lambda device: device.get_clock_drift(),
         icon_fn=None,
     ),
     PluggitSensorEntityDescription(
@@ -143,7 +215,7 @@ SENSORS: tuple[PluggitSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.ENUM,
         options=list(CURRENT_UNIT_MODE.values()),
         icon="mdi:information-outline",
-        value_fn=lambda device: device.get_current_unit_mode(),
+        field="unit_mode",
         icon_fn=None,
     ),
     PluggitSensorEntityDescription(
@@ -153,7 +225,7 @@ SENSORS: tuple[PluggitSensorEntityDescription, ...] = (
         options=[e.value for e in SpeedLevelFan],
         entity_registry_enabled_default=False,
         icon="mdi:fan",
-        value_fn=lambda device: device.get_speed_level(),
+        field=Registers.PRM_ROM_IDX_SPEED_LEVEL,
         icon_fn=None,
     ),
     PluggitSensorEntityDescription(
@@ -164,7 +236,7 @@ SENSORS: tuple[PluggitSensorEntityDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         suggested_display_precision=0,
         entity_registry_enabled_default=False,
-        value_fn=lambda device: device.get_humidity(),
+        field=Registers.PRM_RAM_IDX_RH3_CORRECTED,
         icon_fn=None,
     ),
     PluggitSensorEntityDescription(
@@ -175,7 +247,7 @@ SENSORS: tuple[PluggitSensorEntityDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         suggested_display_precision=0,
         entity_registry_enabled_default=False,
-        value_fn=lambda device: device.get_voc(),
+        field=Registers.PRM_VOC,
         icon_fn=None,
     ),
     PluggitSensorEntityDescription(
@@ -187,7 +259,7 @@ SENSORS: tuple[PluggitSensorEntityDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         suggested_display_precision=0,
         entity_registry_enabled_default=False,
-        value_fn=lambda device: device.get_fan_speed_1(),
+        field=Registers.PRM_HAL_TAHO_1,
         icon_fn=None,
     ),
     PluggitSensorEntityDescription(
@@ -199,7 +271,7 @@ SENSORS: tuple[PluggitSensorEntityDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         suggested_display_precision=0,
         entity_registry_enabled_default=False,
-        value_fn=lambda device: device.get_fan_speed_2(),
+        field=Registers.PRM_HAL_TAHO_2,
         icon_fn=None,
     ),
 )
@@ -236,18 +308,55 @@ async def async_setup_entry(
 ) -> None:
     """Set up sensors from a config entry."""
     data = hass.data[DOMAIN][entry.entry_id]
-    pluggit: Pluggit = data[DOMAIN]
-    serial_number = data[SERIAL_NUMBER]
+    refresh: PluggitRefresh = data[REFRESH]
+    device = data[DEVICE_INFO]
 
     async_add_entities(
         (
-            PluggitSensor(
-                pluggit=pluggit, serial_number=serial_number, description=description
-            )
+            PluggitSensor(refresh=refresh, device=device, description=description)
             for description in SENSORS
         ),
         update_before_add=True,
     )
+    async_add_entities(
+        [
+            PluggitFilterForecastSensor(
+                store=Store(
+                    hass, FILTER_STORAGE_VERSION, f"{DOMAIN}.filter_{entry.entry_id}"
+                ),
+                poller=data[POLLER],
+                serial_number=data[SERIAL_NUMBER],
+                device=device,
+            )
+        ]
+    )
+
+    times = PluggitModeTimes(
+        hass,
+        Store(hass, MODE_TIME_STORAGE_VERSION, f"{DOMAIN}.mode_time_{entry.entry_id}"),
+        data[POLLER],
+    )
+    await times.async_start()
+    entry.async_on_unload(times.async_stop)
+    async_add_entities(
+        PluggitModeTimeSensor(
+            times=times,
+            period=period,
+            register=register,
+            state=state,
+            serial_number=data[SERIAL_NUMBER],
+            device=device,
+        )
+        for period in MODE_TIME_PERIODS
+        for register, (_, states) in MODE_TIME_STATES.items()
+        for state in states
+    )
+
+    if (fleet := hass.data.get(FLEET)) is None:
+        fleet = hass.data[FLEET] = PluggitFleet(hass)
+    entry.async_on_unload(
+        fleet.add_unit(entry.entry_id, data[POLLER], async_add_entities)
+    )
 
 
 class PluggitSensor(SensorEntity):
@@ -255,20 +364,20 @@ class PluggitSensor(SensorEntity):
 
     def __init__(
         self,
-        pluggit: Pluggit,
-        serial_number: int,
+        refresh: PluggitRefresh,
+        device: DeviceInfo,
         description: PluggitSensorEntityDescription,
     ) -> None:
         """Initialise Pluggit sensor."""
-        self._pluggit = pluggit
+        self._refresh = refresh
+        self._pluggit = refresh.pluggit
         self.entity_description = description
-        self._serial_number = str(serial_number)
         self._attr_unique_id = description.key
         self._attr_has_entity_name = True
         self._attr_available = False
-        self._attr_device_info = DeviceInfo(
-            name="Pluggit", identifiers={(DOMAIN, self._serial_number)}
-        )
+        self._attr_device_info = device
+        self._attr_should_poll = description.field is None
+        self.refresh_keys = () if description.field is None else (description.field,)
 
     @property
     def icon(self) -> str | None:
@@ -278,12 +387,375 @@ class PluggitSensor(SensorEntity):
 
         return self.entity_description.icon
 
+    async def async_added_to_hass(self) -> None:
+        """Refresh with the other entities of the unit."""
+        if self.refresh_keys:
+            self.async_on_remove(self._refresh.add(self))
+
+    def apply_refresh(self, values: Mapping[Key, Any]) -> None:
+        """Set the value from a refreshed snapshot."""
+        self._set_value(values.get(self.entity_description.field))
+
     def update(self) -> None:
-        """Fetch data for sensors."""
+        """Fetch data for sensors that aren't refreshed."""
+        if self.entity_description.value_fn is not None:
+            self._set_value(self.entity_description.value_fn(self._pluggit))
+
+    def _set_value(self, value: StateType) -> None:
+        self._attr_native_value = value
+        self._attr_available = value is not None
+
+
+class PluggitFilterForecastSensor(SensorEntity):
+    """Date the filters are predicted to be clogged."""
+
+    _attr_should_poll = False
+
+    def __init__(
+        self, store: Store, poller: Poller, serial_number: int, device: DeviceInfo
+    ) -> None:
+        """Initialise filter forecast sensor."""
+        self._store = store
+        self._poller = poller
+        self._predictor = FilterPredictor()
+        self._attr_unique_id = f"{serial_number}_filter_forecast"
+        self._attr_translation_key = "filter_forecast"
+        self._attr_device_class = SensorDeviceClass.TIMESTAMP
+        self._attr_icon = "mdi:air-filter"
+        self._attr_has_entity_name = True
+        self._attr_native_value = None
+        self._attr_device_info = device
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the fitted rpm drift."""
+        deviation = self._predictor.deviation(time.time())
+        slope = self._predictor.slope
+        return {
+            "rpm_deviation": None if deviation is None else round(100 * deviation, 1),
+            "rpm_trend_per_day": None if slope is None else round(100 * slope, 3),
+            "samples": self._predictor.fit.n,
+            # Nothing is learned before a filter change was seen.
+            "filter_reset": None
+            if self._predictor.reset_time is None
+            else utc_from_timestamp(self._predictor.reset_time),
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Load the learned state and start sampling."""
+        if (data := await self._store.async_load()) is not None:
+            self._predictor.restore(data)
+            self._update_forecast(time.time())
+
+        def sample(values: dict[Registers, Any]) -> None:
+            """Hand a sample from the poller thread to the event loop."""
+            self.hass.loop.call_soon_threadsafe(self._add, time.time(), values)
+
+        self.async_on_remove(
+            self._poller.subscribe(
+                CLOGGING_REGISTERS, sample, FILTER_INTERVAL, changes_only=False
+            )
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Save the learned state."""
+        await self._store.async_save(self._predictor.to_dict())
+
+    @callback
+    def _add(self, stamp: float, values: dict[Registers, Any]) -> None:
+        self._predictor.add(stamp, values)
+        self._store.async_delay_save(self._predictor.to_dict, FILTER_SAVE_DELAY)
+        self._update_forecast(stamp)
+        self.async_write_ha_state()
+
+    def _update_forecast(self, stamp: float) -> None:
+        due = self._predictor.predict(stamp)
+        self._attr_native_value = None if due is None else utc_from_timestamp(due)
+
+
+def period_start(period: str, moment: datetime) -> datetime:
+    """Get the local start of the day or week of moment."""
+    start = start_of_local_day(moment)
+    if period == "weekly":
+        start -= timedelta(days=start.weekday())
+    return start
+
+
+class PluggitModeTimes:
+    """Daily and weekly time in each unit mode and bypass state of a unit.
+
+    Counted from the transitions a poller subscription delivers instead of
+    queried from the recorder. The totals are saved and survive restarts,
+    the time Home Assistant is down isn't counted.
+    """
+
+    def __init__(self, hass: HomeAssistant, store: Store, poller: Poller) -> None:
+        """Initialise mode times."""
+        self._hass = hass
+        self._store = store
+        self._poller = poller
+        self.timers = {
+            (period, register): ModeTimer()
+            for period in MODE_TIME_PERIODS
+            for register in MODE_REGISTERS
+        }
+        self._listeners: list[Callable[[], None]] = []
+        self._unsubscribe: list[Callable[[], None]] = []
+
+    async def async_start(self) -> None:
+        """Load the totals and start counting."""
+        if (data := await self._store.async_load()) is not None:
+            for (period, register), timer in self.timers.items():
+                if (stored := data.get(f"{period}_{register.name}")) is not None:
+                    timer.restore(stored)
+        self._rollover(now())
+
+        def observe(values: dict[Registers, Any]) -> None:
+            """Hand transitions from the poller thread to the event loop."""
+            self._hass.loop.call_soon_threadsafe(self._observe, time.time(), values)
+
+        self._unsubscribe = [
+            self._poller.subscribe(MODE_REGISTERS, observe),
+            async_track_time_change(
+                self._hass, self._async_midnight, hour=0, minute=0, second=0
+            ),
+            async_track_time_interval(
+                self._hass, self._async_refresh, MODE_TIME_REFRESH
+            ),
+        ]
+
+    async def async_stop(self) -> None:
+        """Stop counting and save the totals."""
+        for unsubscribe in self._unsubscribe:
+            unsubscribe()
+        await self._store.async_save(self._data())
+
+    @callback
+    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call listener when the totals change, return remove."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def _data(self) -> dict[str, Any]:
+        stamp = time.time()
+        return {
+            f"{period}_{register.name}": timer.to_dict(stamp)
+            for (period, register), timer in self.timers.items()
+        }
+
+    def _rollover(self, moment: datetime) -> None:
+        """Start the periods moment is past the end of."""
+        for (period, _), timer in self.timers.items():
+            start = period_start(period, moment).timestamp()
+            if timer.start < start:
+                timer.reset(start)
+
+    @callback
+    def _observe(self, stamp: float, values: dict[Registers, Any]) -> None:
+        for (_, register), timer in self.timers.items():
+            if register in values:
+                timer.observe(stamp, values[register])
+        self._store.async_delay_save(self._data, MODE_TIME_SAVE_DELAY)
+        self._notify()
+
+    @callback
+    def _async_midnight(self, moment: datetime) -> None:
+        self._rollover(moment)
+        self._store.async_delay_save(self._data, MODE_TIME_SAVE_DELAY)
+        self._notify()
+
+    @callback
+    def _async_refresh(self, _moment: datetime) -> None:
+        self._notify()
+
+    def _notify(self) -> None:
+        for listener in self._listeners:
+            listener()
+
+
+class PluggitModeTimeSensor(SensorEntity):
+    """Time in one unit mode or bypass state today or this week."""
+
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        times: PluggitModeTimes,
+        period: str,
+        register: Registers,
+        state: int,
+        serial_number: int,
+        device: DeviceInfo,
+    ) -> None:
+        """Initialise mode time sensor."""
+        kind, states = MODE_TIME_STATES[register]
+        self._times = times
+        self._timer = times.timers[period, register]
+        self._state = state
+        self._attr_unique_id = f"{serial_number}_{kind}_{state}_time_{period}"
+        self._attr_translation_key = f"{kind}_time_{period}"
+        self._attr_translation_placeholders = {"state": states[state]}
+        self._attr_entity_registry_enabled_default = (
+            state in MODE_TIME_ENABLED[register]
+        )
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+        self._attr_native_unit_of_measurement = UnitOfTime.SECONDS
+        self._attr_suggested_unit_of_measurement = UnitOfTime.HOURS
+        self._attr_icon = "mdi:timer-outline"
+        self._attr_has_entity_name = True
+        self._attr_device_info = device
+
+    @property
+    def native_value(self) -> int:
+        """Return the seconds spent in the state so far this period."""
+        return round(self._timer.elapsed(time.time(), self._state))
+
+    async def async_added_to_hass(self) -> None:
+        """Update with the totals."""
+        self.async_on_remove(self._times.add_listener(self.async_write_ha_state))
+
+
+class PluggitFleet:
+    """Aggregates of all loaded units, shown on one virtual device.
+
+    Every unit's poller hands its latest values over, a pass over the
+    whole fleet runs once per cycle and updates all fleet sensors. The
+    sensors belong to the entry of one unit, when that entry unloads they
+    are added again by the next unit.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialise fleet."""
+        self._hass = hass
+        self.aggregator = FleetAggregator()
+        self._units: dict[str, AddConfigEntryEntitiesCallback] = {}
+        self._owner: str | None = None
+        self._entities: list[PluggitFleetSensor] = []
+        self._scheduled: Callable[[], None] | None = None
+
+    @callback
+    def add_unit(
+        self,
+        entry_id: str,
+        poller: Poller,
+        async_add_entities: AddConfigEntryEntitiesCallback,
+    ) -> Callable[[], None]:
+        """Aggregate the values of a unit, return remove."""
+
+        def sample(values: dict[Registers, Any]) -> None:
+            """Hand values from the poller thread to the event loop."""
+            self._hass.loop.call_soon_threadsafe(self._add, entry_id, values)
+
+        unsubscribe = poller.subscribe(FLEET_REGISTERS, sample)
+        self._units[entry_id] = async_add_entities
+        if self._owner is None:
+            self._adopt(entry_id)
+
+        @callback
+        def remove() -> None:
+            unsubscribe()
+            del self._units[entry_id]
+            self.aggregator.remove(entry_id)
+            if self._owner == entry_id:
+                # The entry's platforms are unloaded and took the sensors.
+                self._owner = None
+                self._entities = []
+                if self._units:
+                    self._adopt(next(iter(self._units)))
+            if not self._units:
+                if self._scheduled is not None:
+                    self._scheduled()
+                self._hass.data.pop(FLEET, None)
+            else:
+                self._schedule()
+
+        return remove
+
+    def _adopt(self, entry_id: str) -> None:
+        self._owner = entry_id
+        self._entities = [
+            PluggitFleetSensor(self, metric, stat)
+            for metric in METRICS
+            for stat in STATS
+        ]
+        self._units[entry_id](self._entities)
+
+    @callback
+    def _add(self, entry_id: str, values: dict[Registers, Any]) -> None:
+        if entry_id not in self._units:
+            return
+        self.aggregator.set(entry_id, values)
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if self._scheduled is None:
+            self._scheduled = async_call_later(
+                self._hass, FLEET_SETTLE, self._async_compute
+            )
+
+    @callback
+    def _async_compute(self, _now: datetime) -> None:
+        self._scheduled = None
+        self.aggregator.compute()
+        for entity in self._entities:
+            entity.async_update_from_fleet()
+
+
+class PluggitFleetSensor(SensorEntity):
+    """One statistic of one metric over all units."""
+
+    _attr_should_poll = False
+
+    def __init__(self, fleet: PluggitFleet, metric: str, stat: str) -> None:
+        """Initialise fleet sensor."""
+        base = next(
+            description
+            for description in SENSORS
+            if description.key == FLEET_SENSOR_KEYS[metric]
+        )
+        self._fleet = fleet
+        self._metric = metric
+        self._stat = stat
+        self.entity_description = SensorEntityDescription(
+            key=f"fleet_{metric}_{stat}",
+            translation_key=f"fleet_{metric}_{stat}",
+            device_class=base.device_class,
+            native_unit_of_measurement=base.native_unit_of_measurement,
+            state_class=SensorStateClass.MEASUREMENT,
+            suggested_display_precision=1,
+            icon=base.icon,
+        )
+        self._attr_unique_id = f"fleet_{metric}_{stat}"
+        self._attr_has_entity_name = True
+        self._attr_device_info = FLEET_DEVICE
+        self._column = list(METRICS).index(metric)
+        self._attr_native_value = None
+        self._attr_extra_state_attributes = {"units": 0}
+
+    @property
+    def available(self) -> bool:
+        """Return if any unit reports the metric."""
+        return self._attr_native_value is not None
+
+    async def async_added_to_hass(self) -> None:
+        """Show the aggregates computed before the sensor was added."""
+        self._refresh()
 
-        self._attr_native_value = self.entity_description.value_fn(self._pluggit)
+    @callback
+    def async_update_from_fleet(self) -> None:
+        """Write the state if the statistic or its units changed."""
+        if self._refresh() and self.hass is not None:
+            self.async_write_ha_state()
 
-        if self._attr_native_value is None:
-            self._attr_available = False
-        else:
-            self._attr_available = True
+    def _refresh(self) -> bool:
+        value = self._fleet.aggregator.value(self._stat, self._metric)
+        units = {"units": int(self._fleet.aggregator.units[self._column])}
+        if (value, units) == (
+            self._attr_native_value,
+            self._attr_extra_state_attributes,
+        ):
+            return False
+        self._attr_native_value = value
+        self._attr_extra_state_attributes = units
+        return True
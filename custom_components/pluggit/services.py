@@ -0,0 +1,648 @@
+"""Services."""
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import asdict
+from datetime import datetime
+import functools
+import logging
+import os
+import threading
+import time
+
+from pymodbus import ModbusException
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import ATTR_CONFIG_ENTRY_ID, ATTR_NAME
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv, entity_platform
+from homeassistant.helpers.event import async_call_later
+
+from .const import CAPTURE, CONFIG_PROFILES, DOMAIN, POLLER, PROFILER, SERIAL_NUMBER
+from .pypluggit.blocks import MAX_BLOCK, MAX_WRITE_BLOCK
+from .pypluggit.capture import MAX_RATE, capture
+from .pypluggit.codec import DATA_TYPES, check, decode_as, encode_as
+from .pypluggit.const import PROFILE_REGISTERS, Registers, WeekProgram
+from .pypluggit.pluggit import ApplyResult, Pluggit
+from .pypluggit.profiling import Profiler
+from .util import help_time
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_READ_REGISTERS = "read_registers"
+SERVICE_WRITE_REGISTERS = "write_registers"
+SERVICE_SAVE_PROFILE = "save_profile"
+SERVICE_APPLY_PROFILE = "apply_profile"
+SERVICE_DELETE_PROFILE = "delete_profile"
+SERVICE_START_CAPTURE = "start_capture"
+SERVICE_STOP_CAPTURE = "stop_capture"
+SERVICE_START_PROFILING = "start_profiling"
+SERVICE_STOP_PROFILING = "stop_profiling"
+SERVICE_FLEET_COMMAND = "fleet_command"
+
+EVENT_CAPTURE_FINISHED = "pluggit_capture_finished"
+
+ATTR_REGISTERS = "registers"
+ATTR_ADDRESS = "address"
+ATTR_COUNT = "count"
+ATTR_DATA_TYPE = "data_type"
+ATTR_VALUES = "values"
+ATTR_DURATION = "duration"
+ATTR_RATE = "rate"
+ATTR_PATH = "path"
+ATTR_COMMAND = "command"
+ATTR_PROGRAM = "program"
+ATTR_MAX_PARALLEL = "max_parallel"
+
+# Longest capture in seconds.
+MAX_CAPTURE = 600
+# Longest profiling run in seconds.
+MAX_PROFILING = 3600
+
+# Register values a fleet command writes, from the week program number.
+FLEET_COMMANDS: dict[str, Callable[[int | None], dict[Registers, int]]] = {
+    "sync_clock": lambda _: {Registers.PRM_DATE_TIME_SET: help_time()},
+    "reset_filter": lambda _: {Registers.PRM_FILTER_RESET: 1},
+    "week_program": lambda program: {
+        Registers.PRM_NUM_OF_WEEK_PROGRAM: WeekProgram(program - 1).value
+    },
+    "bypass_open": lambda _: {Registers.PRM_BYPASS_POSITION: 255},
+    "bypass_close": lambda _: {Registers.PRM_BYPASS_POSITION: 0},
+}
+
+REGISTER_NAMES = [register.name for register in Registers]
+PROFILE_NAMES = [register.name for register in PROFILE_REGISTERS]
+
+
+def _register_values(values: dict[str, float]) -> dict[str, int | float]:
+    """Check named values against the data type of their register."""
+    try:
+        return {name: check(Registers[name], value) for name, value in values.items()}
+    except ValueError as err:
+        raise vol.Invalid(str(err)) from err
+
+
+READ_REGISTERS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Exclusive(ATTR_REGISTERS, "source"): vol.All(
+            cv.ensure_list, [vol.In(REGISTER_NAMES)]
+        ),
+        vol.Exclusive(ATTR_ADDRESS, "source"): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=0xFFFF)
+        ),
+        vol.Optional(ATTR_COUNT, default=2): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_BLOCK)
+        ),
+        vol.Optional(ATTR_DATA_TYPE, default="uint32"): vol.In(DATA_TYPES),
+    }
+)
+
+WRITE_REGISTERS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_ADDRESS): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=0xFFFF)
+        ),
+        vol.Optional(ATTR_DATA_TYPE, default="uint32"): vol.In(DATA_TYPES),
+        vol.Required(ATTR_VALUES): vol.Any(
+            vol.All({vol.In(REGISTER_NAMES): vol.Coerce(float)}, _register_values),
+            vol.All(cv.ensure_list, [vol.Coerce(float)]),
+        ),
+    }
+)
+
+SAVE_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_NAME): cv.string,
+        vol.Optional(ATTR_VALUES): vol.All(
+            {vol.In(PROFILE_NAMES): vol.Coerce(float)}, _register_values
+        ),
+    }
+)
+
+APPLY_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(ATTR_NAME): cv.string,
+    }
+)
+
+DELETE_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_NAME): cv.string,
+    }
+)
+
+START_CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_DURATION, default=60): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=MAX_CAPTURE)
+        ),
+        vol.Optional(ATTR_RATE, default=10): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1, max=MAX_RATE)
+        ),
+    }
+)
+
+STOP_CAPTURE_SCHEMA = vol.Schema({vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string})
+
+FLEET_COMMAND_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(ATTR_COMMAND): vol.In(FLEET_COMMANDS),
+        vol.Optional(ATTR_PROGRAM): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=len(WeekProgram))
+        ),
+        vol.Optional(ATTR_MAX_PARALLEL, default=8): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=64)
+        ),
+    }
+)
+
+START_PROFILING_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=60): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=MAX_PROFILING)
+        ),
+    }
+)
+
+
+def get_pluggit(hass: HomeAssistant, entry_id: str) -> Pluggit:
+    """Get the Pluggit of a loaded config entry."""
+    data = hass.data.get(DOMAIN, {}).get(entry_id)
+    if data is None:
+        raise ServiceValidationError(f"Config entry {entry_id} is not loaded")
+    return data[DOMAIN]
+
+
+
+async def async_read_registers(call: ServiceCall) -> ServiceResponse:
+    """Read named registers or a raw address range."""
+    pluggit = get_pluggit(call.hass, call.data[ATTR_CONFIG_ENTRY_ID])
+
+    if ATTR_REGISTERS in call.data:
+        registers = [Registers[name] for name in call.data[ATTR_REGISTERS]]
+
+        def read_named() -> ServiceResponse:
+            with pluggit.command():
+                values = pluggit.read_registers(registers)
+            return {
+                ATTR_VALUES: {
+                    register.name: values.get(register) for register in registers
+                }
+            }
+
+        return await call.hass.async_add_executor_job(read_named)
+
+    if ATTR_ADDRESS not in call.data:
+        raise ServiceValidationError("Either registers or address is required")
+
+    address = call.data[ATTR_ADDRESS]
+    count = call.data[ATTR_COUNT]
+    data_type = call.data[ATTR_DATA_TYPE]
+
+    def read_range() -> list[int]:
+        with pluggit.command():
+            return pluggit.read_words(address, count)
+
+    try:
+        words = await call.hass.async_add_executor_job(read_range)
+    except ModbusException as err:
+        raise HomeAssistantError(
+            f"Reading {count} words at {address} failed"
+        ) from err
+
+    return {
+        ATTR_ADDRESS: address,
+        ATTR_DATA_TYPE: data_type,
+        ATTR_VALUES: decode_as(words, data_type),
+        "words": words,
+    }
+
+
+async def async_write_registers(call: ServiceCall) -> None:
+    """Write named registers or raw values from an address.
+
+    Named values go out as one queued job of as many frames as the
+    registers need, raw values as a single frame of at most
+    MAX_WRITE_BLOCK words.
+    """
+    pluggit = get_pluggit(call.hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    values = call.data[ATTR_VALUES]
+
+    if isinstance(values, dict):
+        if ATTR_ADDRESS in call.data:
+            raise ServiceValidationError("Named values can't be used with address")
+        named = {Registers[name]: value for name, value in values.items()}
+        if not await call.hass.async_add_executor_job(pluggit.write_registers, named):
+            raise HomeAssistantError(f"Writing {', '.join(values)} failed")
+        return
+
+    if ATTR_ADDRESS not in call.data:
+        raise ServiceValidationError("A list of values needs an address")
+
+    address = call.data[ATTR_ADDRESS]
+    data_type = call.data[ATTR_DATA_TYPE]
+    try:
+        words = encode_as(values, data_type)
+    except ValueError as err:
+        raise ServiceValidationError(f"Values don't fit {data_type}: {err}") from err
+    if len(words) > MAX_WRITE_BLOCK:
+        raise ServiceValidationError(f"At most {MAX_WRITE_BLOCK} words per write")
+
+    try:
+        await call.hass.async_add_executor_job(pluggit.write_words, address, words)
+    except ModbusException as err:
+        raise HomeAssistantError(
+            f"Writing {len(words)} words at {address} failed"
+        ) from err
+
+
+def get_entry(hass: HomeAssistant, entry_id: str) -> ConfigEntry:
+    """Get a pluggit config entry."""
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if entry is None or entry.domain != DOMAIN:
+        raise ServiceValidationError(f"{entry_id} is no Pluggit config entry")
+    return entry
+
+
+def get_profile(hass: HomeAssistant, entry_id: str, name: str) -> dict[str, float]:
+    """Get a profile of the entry, or of another entry if it has none by name."""
+    entries = [get_entry(hass, entry_id), *hass.config_entries.async_entries(DOMAIN)]
+    for entry in entries:
+        if name in (profiles := entry.options.get(CONFIG_PROFILES, {})):
+            return profiles[name]
+    raise ServiceValidationError(f"Unknown profile {name}")
+
+
+@callback
+def update_profiles(
+    hass: HomeAssistant, entry: ConfigEntry, profiles: dict[str, dict]
+) -> None:
+    """Store profiles in the entry options."""
+    hass.config_entries.async_update_entry(
+        entry, options={**entry.options, CONFIG_PROFILES: profiles}
+    )
+
+
+async def async_save_profile(call: ServiceCall) -> None:
+    """Save given values or the unit's current settings as profile."""
+    entry = get_entry(call.hass, call.data[ATTR_CONFIG_ENTRY_ID])
+
+    if ATTR_VALUES in call.data:
+        values = dict(call.data[ATTR_VALUES])
+    else:
+        pluggit = get_pluggit(call.hass, entry.entry_id)
+        read = await call.hass.async_add_executor_job(
+            pluggit.read_registers, PROFILE_REGISTERS
+        )
+        missing = [r.name for r in PROFILE_REGISTERS if read.get(r) is None]
+        if missing:
+            raise HomeAssistantError(f"Reading {', '.join(missing)} failed")
+        values = {register.name: read[register] for register in PROFILE_REGISTERS}
+
+    profiles = dict(entry.options.get(CONFIG_PROFILES, {}))
+    profiles[call.data[ATTR_NAME]] = values
+    update_profiles(call.hass, entry, profiles)
+
+
+async def async_delete_profile(call: ServiceCall) -> None:
+    """Delete a profile."""
+    entry = get_entry(call.hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    profiles = dict(entry.options.get(CONFIG_PROFILES, {}))
+    if profiles.pop(call.data[ATTR_NAME], None) is None:
+        raise ServiceValidationError(f"Unknown profile {call.data[ATTR_NAME]}")
+    update_profiles(call.hass, entry, profiles)
+
+
+async def async_apply_profile(call: ServiceCall) -> ServiceResponse:
+    """Apply a profile to one or more units at the same time."""
+    hass = call.hass
+    name = call.data[ATTR_NAME]
+    # Resolve every unit before writing to any, so a bad entry can't leave
+    # the others half rolled out.
+    targets: dict[str, tuple[Pluggit, dict[Registers, int | float]]] = {}
+    for entry_id in call.data[ATTR_CONFIG_ENTRY_ID]:
+        profile = get_profile(hass, entry_id, name)
+        try:
+            values = {
+                Registers[key]: check(Registers[key], value)
+                for key, value in profile.items()
+            }
+        except ValueError as err:
+            raise ServiceValidationError(f"Profile {name} is invalid: {err}") from err
+        targets[entry_id] = (get_pluggit(hass, entry_id), values)
+
+    jobs = {
+        entry_id: hass.async_add_executor_job(pluggit.apply_registers, values)
+        for entry_id, (pluggit, values) in targets.items()
+    }
+
+    started = time.monotonic()
+    results: list[ApplyResult] = await asyncio.gather(*jobs.values())
+    _LOGGER.debug(
+        "Applied profile %s to %s units in %.2f s",
+        name,
+        len(results),
+        time.monotonic() - started,
+    )
+
+    response = {
+        entry_id: {
+            "unchanged": [register.name for register in result.unchanged],
+            "written": [register.name for register in result.written],
+            "mismatched": {
+                register.name: value for register, value in result.mismatched.items()
+            },
+        }
+        for entry_id, result in zip(jobs, results, strict=True)
+    }
+    failed = [
+        entry_id
+        for entry_id, result in zip(jobs, results, strict=True)
+        if not result.ok
+    ]
+    if failed and not call.return_response:
+        raise HomeAssistantError(
+            f"Profile {name} could not be verified on {', '.join(failed)}"
+        )
+    return response if call.return_response else None
+
+
+async def async_start_capture(call: ServiceCall) -> ServiceResponse:
+    """Start a capture in the background, return the file it goes to."""
+    hass = call.hass
+    entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+    pluggit = get_pluggit(hass, entry_id)
+    data = hass.data[DOMAIN][entry_id]
+    if CAPTURE in data:
+        raise ServiceValidationError("A capture is already running on this unit")
+
+    directory = hass.config.path(DOMAIN)
+    stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+    path = os.path.join(directory, f"capture-{data[SERIAL_NUMBER]}-{stamp}.pgcap")
+    duration = call.data[ATTR_DURATION]
+    rate = call.data[ATTR_RATE]
+    stop = data[CAPTURE] = threading.Event()
+
+    def run() -> dict:
+        os.makedirs(directory, exist_ok=True)
+        samples, stats = capture(pluggit, duration, rate, stop=stop)
+        samples.save(path)
+        return asdict(stats)
+
+    async def finish() -> None:
+        try:
+            stats = await hass.async_add_executor_job(run)
+        except Exception:
+            _LOGGER.exception("Capture on %s failed", entry_id)
+            return
+        finally:
+            if data.get(CAPTURE) is stop:
+                del data[CAPTURE]
+        _LOGGER.info(
+            "Captured %s samples at %.2f of %.2f Hz, jitter %.1f ms, to %s",
+            stats["samples"],
+            stats["rate"],
+            stats["requested_rate"],
+            1000 * stats["jitter"],
+            path,
+        )
+        hass.bus.async_fire(
+            EVENT_CAPTURE_FINISHED,
+            {ATTR_CONFIG_ENTRY_ID: entry_id, ATTR_PATH: path, **stats},
+        )
+
+    hass.async_create_background_task(finish(), f"{DOMAIN} capture {entry_id}")
+    return {ATTR_PATH: path}
+
+
+async def async_stop_capture(call: ServiceCall) -> None:
+    """End a running capture early, it is still saved."""
+    entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+    get_pluggit(call.hass, entry_id)
+    stop = call.hass.data[DOMAIN][entry_id].get(CAPTURE)
+    if stop is None:
+        raise ServiceValidationError("No capture is running on this unit")
+    stop.set()
+
+
+async def async_fleet_command(call: ServiceCall) -> ServiceResponse:
+    """Run a command on many units concurrently, return per-unit results.
+
+    Every unit is driven through its own connection, at most max_parallel
+    at the same time, so the whole fleet takes about as long as its
+    slowest units instead of the sum of all.
+    """
+    hass = call.hass
+    command = call.data[ATTR_COMMAND]
+    program = call.data.get(ATTR_PROGRAM)
+    if command == "week_program" and program is None:
+        raise ServiceValidationError("week_program needs a program")
+    entry_ids = call.data.get(ATTR_CONFIG_ENTRY_ID) or list(hass.data.get(DOMAIN, {}))
+    if not entry_ids:
+        raise ServiceValidationError("No pluggit entry is loaded")
+    pluggits = {entry_id: get_pluggit(hass, entry_id) for entry_id in entry_ids}
+    slots = asyncio.Semaphore(call.data[ATTR_MAX_PARALLEL])
+
+    async def run(pluggit: Pluggit) -> dict:
+        async with slots:
+            # Built per unit, so every clock gets the time it is set at.
+            values = FLEET_COMMANDS[command](program)
+            started = time.perf_counter()
+            ok = await hass.async_add_executor_job(pluggit.write_registers, values)
+            return {
+                "ok": ok,
+                "latency_ms": round(1000 * (time.perf_counter() - started), 1),
+            }
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(run(pluggit) for pluggit in pluggits.values()))
+    response = {
+        "elapsed_ms": round(1000 * (time.perf_counter() - started), 1),
+        "units": dict(zip(pluggits, results, strict=True)),
+    }
+    failed = [
+        entry_id
+        for entry_id, result in zip(pluggits, results, strict=True)
+        if not result["ok"]
+    ]
+    if failed and not call.return_response:
+        raise HomeAssistantError(f"{command} failed on {', '.join(failed)}")
+    return response if call.return_response else None
+
+
+@callback
+def instrument(hass: HomeAssistant, profiler: Profiler) -> list[Callable[[], None]]:
+    """Hook profiler into the refresh path of every loaded entry, return undos.
+
+    Transactions are phase io, poll cycles phase poll, entity updates,
+    polled or applied from the shared refresh, which decode and compute
+    states, phase update and state writes, which also run the icon
+    functions, phase state_write.
+    """
+    undo: list[Callable[[], None]] = []
+    for data in hass.data.get(DOMAIN, {}).values():
+        pluggit: Pluggit = data[DOMAIN]
+        pluggit.set_profiler(profiler)
+        undo.append(functools.partial(pluggit.set_profiler, None))
+        poller = data[POLLER]
+        poller.poll = profiler.wrap("poll", poller.poll)
+        undo.append(functools.partial(vars(poller).pop, "poll", None))
+
+    for platform in entity_platform.async_get_platforms(hass, DOMAIN):
+        for entity in platform.entities.values():
+            # Instance attributes shadow the methods until popped again.
+            if entity.should_poll and hasattr(entity, "update"):
+                entity.update = profiler.wrap("update", entity.update)
+                undo.append(functools.partial(vars(entity).pop, "update", None))
+            elif hasattr(entity, "apply_refresh"):
+                entity.apply_refresh = profiler.wrap("update", entity.apply_refresh)
+                undo.append(
+                    functools.partial(vars(entity).pop, "apply_refresh", None)
+                )
+            entity.async_write_ha_state = profiler.wrap(
+                "state_write", entity.async_write_ha_state
+            )
+            undo.append(
+                functools.partial(vars(entity).pop, "async_write_ha_state", None)
+            )
+    return undo
+
+
+async def async_start_profiling(call: ServiceCall) -> None:
+    """Profile the refresh path for duration seconds or until stopped."""
+    hass = call.hass
+    if PROFILER in hass.data:
+        raise ServiceValidationError("Profiling is already running")
+    if not hass.data.get(DOMAIN):
+        raise ServiceValidationError("No pluggit entry is loaded")
+
+    profiler = Profiler()
+    undo = instrument(hass, profiler)
+    profiler.start()
+
+    async def finish(_now: datetime) -> None:
+        await async_finish_profiling(hass)
+
+    undo.append(async_call_later(hass, call.data[ATTR_DURATION], finish))
+    hass.data[PROFILER] = (profiler, undo)
+    _LOGGER.info("Profiling started for %s s", call.data[ATTR_DURATION])
+
+
+async def async_finish_profiling(hass: HomeAssistant) -> ServiceResponse:
+    """Remove the hooks, save the profile and log its summary."""
+    profiler, undo = hass.data.pop(PROFILER)
+    for func in undo:
+        func()
+
+    stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+    path = hass.config.path(DOMAIN, f"profile-{stamp}.folded")
+
+    def save() -> None:
+        profiler.stop()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        profiler.save(path)
+
+    await hass.async_add_executor_job(save)
+    _LOGGER.warning("Profile written to %s\n%s", path, profiler.summary())
+    return {
+        ATTR_PATH: path,
+        "phases": {
+            name: {
+                "calls": phase.calls,
+                "wall_ms": round(1000 * phase.wall, 1),
+                "cpu_ms": round(1000 * phase.cpu, 1),
+            }
+            for name, phase in profiler.phases.items()
+        },
+        "decode_ms": round(1000 * profiler.decode_time(), 1),
+        "top": [
+            {"function": function, "self": own, "total": total}
+            for function, own, total in profiler.top()
+        ],
+    }
+
+
+async def async_stop_profiling(call: ServiceCall) -> ServiceResponse:
+    """Stop profiling early."""
+    if PROFILER not in call.hass.data:
+        raise ServiceValidationError("Profiling is not running")
+    response = await async_finish_profiling(call.hass)
+    return response if call.return_response else None
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the pluggit services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_READ_REGISTERS,
+        async_read_registers,
+        schema=READ_REGISTERS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_WRITE_REGISTERS,
+        async_write_registers,
+        schema=WRITE_REGISTERS_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SAVE_PROFILE, async_save_profile, schema=SAVE_PROFILE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY_PROFILE,
+        async_apply_profile,
+        schema=APPLY_PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DELETE_PROFILE,
+        async_delete_profile,
+        schema=DELETE_PROFILE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_CAPTURE,
+        async_start_capture,
+        schema=START_CAPTURE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_STOP_CAPTURE, async_stop_capture, schema=STOP_CAPTURE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_PROFILING,
+        async_start_profiling,
+        schema=START_PROFILING_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_PROFILING,
+        async_stop_profiling,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FLEET_COMMAND,
+        async_fleet_command,
+        schema=FLEET_COMMAND_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -1,9 +1,8 @@
 """Switch."""
 
-from collections.abc import Callable
-from dataclasses import dataclass
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, replace
 import logging
-import time
 from typing import Any
 
 from homeassistant.components.switch import (
@@ -12,15 +11,33 @@ from homeassistant.components.switch import (
     SwitchEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EntityCategory
+from homeassistant.const import STATE_ON, EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity import StateType
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.helpers.restore_state import RestoreEntity
 
-from .const import DOMAIN, SERIAL_NUMBER
-from .pypluggit.const import ActiveUnitMode
+from .const import (
+    CONFIG_BOOST_HUMIDITY_OFF,
+    CONFIG_BOOST_HUMIDITY_ON,
+    CONFIG_BOOST_INTERVAL,
+    CONFIG_BOOST_LEVEL,
+    CONFIG_BOOST_MIN_OFF,
+    CONFIG_BOOST_MIN_ON,
+    CONFIG_BOOST_VOC_OFF,
+    CONFIG_BOOST_VOC_ON,
+    DEVICE_INFO,
+    DOMAIN,
+    POLLER,
+    REFRESH,
+    SERIAL_NUMBER,
+)
+from .pypluggit.boost import BoostDecision, BoostRunner, BoostSettings
+from .pypluggit.const import ActiveUnitMode, Registers
 from .pypluggit.pluggit import Pluggit
+from .pypluggit.poller import Key, Poller
+from .refresh import PluggitRefresh
 
 _LOGGER = logging.getLogger(__name__)
 # pylint: disable=unnecessary-lambda
@@ -32,7 +49,7 @@ class PluggitSwitchEntityDescription(SwitchEntityDescription):
 
     on_fn: Callable[[Pluggit], None]
     off_fn: Callable[[Pluggit], None]
-    get_fn: Callable[[Pluggit], StateType]
+    field: Key
     is_on: Callable[[StateType], bool]
     set_icon: Callable[[StateType], str]
 
@@ -44,14 +61,32 @@ SWITCHES: tuple[PluggitSwitchEntityDescription, ...] = (
         entity_category=EntityCategory.CONFIG,
         device_class=SwitchDeviceClass.SWITCH,
         icon="mdi:weather-night",
-        on_fn=lambda device: device.set_unit_mode(ActiveUnitMode.NIGHT_MODE),
-        off_fn=lambda device: device.set_unit_mode(ActiveUnitMode.END_NIGHT_MODE),
-        get_fn=lambda device: device.get_night_mode_state(),
+        on_fn=lambda device: device.transition_to(ActiveUnitMode.NIGHT_MODE),
+        off_fn=lambda device: device.transition_to(ActiveUnitMode.END_NIGHT_MODE),
+        field=Registers.PRM_NIGHT_MODE_STATE,
         is_on=lambda value: help_night_mode(value),
         set_icon=None,
     ),
 )
 
+BOOST_OPTIONS = {
+    CONFIG_BOOST_HUMIDITY_ON: "humidity_on",
+    CONFIG_BOOST_HUMIDITY_OFF: "humidity_off",
+    CONFIG_BOOST_VOC_ON: "voc_on",
+    CONFIG_BOOST_VOC_OFF: "voc_off",
+    CONFIG_BOOST_LEVEL: "level",
+    CONFIG_BOOST_MIN_ON: "min_on",
+    CONFIG_BOOST_MIN_OFF: "min_off",
+}
+
+
+def boost_settings(options: dict[str, Any]) -> BoostSettings:
+    """Get boost settings from config entry options."""
+    return replace(
+        BoostSettings(),
+        **{name: options[key] for key, name in BOOST_OPTIONS.items() if key in options},
+    )
+
 
 def help_night_mode(value: int) -> bool | None:
     """Is night mode on."""
@@ -75,42 +110,49 @@ async def async_setup_entry(
 ) -> None:
     """Set up switch from a config entry."""
     data = hass.data[DOMAIN][entry.entry_id]
-    pluggit: Pluggit = data[DOMAIN]
-    serial_number = data[SERIAL_NUMBER]
+    refresh: PluggitRefresh = data[REFRESH]
+    device = data[DEVICE_INFO]
 
     async_add_entities(
-        (
-            PluggitSwitch(
-                pluggit=pluggit, serial_number=serial_number, description=description
+        PluggitSwitch(refresh=refresh, device=device, description=description)
+        for description in SWITCHES
+    )
+    async_add_entities(
+        [
+            PluggitBoostSwitch(
+                poller=data[POLLER],
+                settings=boost_settings(entry.options),
+                interval=entry.options.get(CONFIG_BOOST_INTERVAL, 5),
+                serial_number=data[SERIAL_NUMBER],
+                device=device,
             )
-            for description in SWITCHES
-        ),
-        update_before_add=True,
+        ]
     )
 
 
 class PluggitSwitch(SwitchEntity):
     """Pluggit switch."""
 
+    _attr_should_poll = False
+
     def __init__(
         self,
-        pluggit: Pluggit,
-        serial_number: int,
+        refresh: PluggitRefresh,
+        device: DeviceInfo,
         description: PluggitSwitchEntityDescription,
     ) -> None:
         """Initialise switch."""
 
-        self._pluggit = pluggit
+        self._refresh = refresh
+        self._pluggit = refresh.pluggit
+        self.refresh_keys = (description.field,)
         self.entity_description = description
-        self._serial_number = str(serial_number)
         self._attr_unique_id = description.key
         self._attr_has_entity_name = True
         self._attr_available = False
         self._attr_is_on = False
         self._attr_native_value = 0
-        self._attr_device_info = DeviceInfo(
-            name="Pluggit", identifiers={(DOMAIN, self._serial_number)}
-        )
+        self._attr_device_info = device
 
     @property
     def icon(self) -> str | None:
@@ -120,20 +162,27 @@ class PluggitSwitch(SwitchEntity):
 
         return self.entity_description.icon
 
-    def turn_on(self, **kwargs: Any) -> None:
+    async def async_added_to_hass(self) -> None:
+        """Refresh with the other entities of the unit."""
+        self.async_on_remove(self._refresh.add(self))
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the entity on."""
-        self.entity_description.on_fn(self._pluggit)
+        await self.hass.async_add_executor_job(
+            self.entity_description.on_fn, self._pluggit
+        )
+        await self._refresh.async_request(self)
 
-    def turn_off(self, **kwargs: Any) -> None:
+    async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the switch."""
-        self.entity_description.off_fn(self._pluggit)
-
-    def update(self) -> None:
-        """Fetch data for switch."""
-        # If the switch is pressed, there is an update for the status, but this update is to fast. So we wait here.
-        time.sleep(100 / 1000)
+        await self.hass.async_add_executor_job(
+            self.entity_description.off_fn, self._pluggit
+        )
+        await self._refresh.async_request(self)
 
-        self._attr_native_value = self.entity_description.get_fn(self._pluggit)
+    def apply_refresh(self, values: Mapping[Key, Any]) -> None:
+        """Set the state from a refreshed snapshot."""
+        self._attr_native_value = values.get(self.entity_description.field)
 
         if self._attr_native_value is None:
             self._attr_available = False
@@ -141,3 +190,71 @@ class PluggitSwitch(SwitchEntity):
         else:
             self._attr_available = True
             self._attr_is_on = self.entity_description.is_on(self._attr_native_value)
+
+
+class PluggitBoostSwitch(SwitchEntity, RestoreEntity):
+    """Switch of the local humidity and VOC boost controller."""
+
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        poller: Poller,
+        settings: BoostSettings,
+        interval: float,
+        serial_number: int,
+        device: DeviceInfo,
+    ) -> None:
+        """Initialise boost switch."""
+
+        self._runner = BoostRunner(
+            poller, settings, interval=interval, on_decision=self._on_decision
+        )
+        self._attr_unique_id = f"{serial_number}_humidity_boost"
+        self._attr_translation_key = "humidity_boost"
+        self._attr_icon = "mdi:water-percent-alert"
+        self._attr_has_entity_name = True
+        self._attr_is_on = False
+        self._attr_device_info = device
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the last decision of the controller."""
+        decision = self._runner.decision
+        if decision is None or not self._attr_is_on:
+            return None
+        return {
+            "boosting": decision.boosting,
+            "reason": decision.reason,
+            "speed_level": decision.level,
+            "base_level": decision.base_level,
+            "humidity": decision.humidity,
+            "voc": decision.voc,
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Resume the controller if it was on."""
+        state = await self.async_get_last_state()
+        if state is not None and state.state == STATE_ON:
+            await self.async_turn_on()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop the controller, ending a running boost."""
+        await self.hass.async_add_executor_job(self._runner.stop)
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Start the controller."""
+        self._runner.start()
+        self._attr_is_on = True
+        self.async_write_ha_state()
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Stop the controller, ending a running boost."""
+        await self.hass.async_add_executor_job(self._runner.stop)
+        self._attr_is_on = False
+        self.async_write_ha_state()
+
+    def _on_decision(self, decision: BoostDecision) -> None:
+        """Push a changed decision from the poller thread."""
+        if self.hass is not None:
+            self.hass.loop.call_soon_threadsafe(self.async_write_ha_state)
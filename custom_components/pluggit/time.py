@@ -1,10 +1,10 @@
 """Switch."""
 
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass
 from datetime import time as date_time
 import logging
-import time
+from typing import Any
 
 from homeassistant.components.time import TimeEntity, TimeEntityDescription
 from homeassistant.config_entries import ConfigEntry
@@ -14,8 +14,10 @@ from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity import StateType
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
-from .const import DOMAIN, SERIAL_NUMBER
+from .const import DEVICE_INFO, DOMAIN, REFRESH
 from .pypluggit.pluggit import Pluggit
+from .pypluggit.poller import Key
+from .refresh import PluggitRefresh
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,8 +28,8 @@ class PluggitTimeEntityDescription(TimeEntityDescription):
 
     set_hour_fn: Callable[[Pluggit, StateType], None]
     set_min_fn: Callable[[Pluggit, StateType], None]
-    get_hour_fn: Callable[[Pluggit], StateType]
-    get_min_fn: Callable[[Pluggit], StateType]
+    # Field decoded to hour and minute.
+    field: Key
 
 
 TIMES: tuple[PluggitTimeEntityDescription, ...] = (
@@ -37,8 +39,7 @@ TIMES: tuple[PluggitTimeEntityDescription, ...] = (
         entity_category=EntityCategory.CONFIG,
         set_hour_fn=lambda device, hour: device.set_night_mode_start_hour(hour),
         set_min_fn=lambda device, min: device.set_night_mode_start_min(min),
-        get_hour_fn=lambda device: device.get_night_mode_start_hour(),
-        get_min_fn=lambda device: device.get_night_mode_start_min(),
+        field="night_mode_start",
     ),
     PluggitTimeEntityDescription(
         key="end_time",
@@ -46,8 +47,7 @@ TIMES: tuple[PluggitTimeEntityDescription, ...] = (
         entity_category=EntityCategory.CONFIG,
         set_hour_fn=lambda device, hour: device.set_night_mode_end_hour(hour),
         set_min_fn=lambda device, min: device.set_night_mode_end_min(min),
-        get_hour_fn=lambda device: device.get_night_mode_end_hour(),
-        get_min_fn=lambda device: device.get_night_mode_end_min(),
+        field="night_mode_end",
     ),
 )
 
@@ -59,59 +59,59 @@ async def async_setup_entry(
 ) -> None:
     """Set up time from a config entry."""
     data = hass.data[DOMAIN][entry.entry_id]
-    pluggit: Pluggit = data[DOMAIN]
-    serial_number = data[SERIAL_NUMBER]
+    refresh: PluggitRefresh = data[REFRESH]
+    device = data[DEVICE_INFO]
 
     async_add_entities(
-        (
-            PluggitTime(
-                pluggit=pluggit, serial_number=serial_number, description=description
-            )
-            for description in TIMES
-        ),
-        update_before_add=True,
+        PluggitTime(refresh=refresh, device=device, description=description)
+        for description in TIMES
     )
 
 
 class PluggitTime(TimeEntity):
     """Pluggit time."""
 
+    _attr_should_poll = False
+
     def __init__(
         self,
-        pluggit: Pluggit,
-        serial_number: int,
+        refresh: PluggitRefresh,
+        device: DeviceInfo,
         description: PluggitTimeEntityDescription,
     ) -> None:
         """Initialise time."""
 
-        self._pluggit = pluggit
+        self._refresh = refresh
+        self._pluggit = refresh.pluggit
+        self.refresh_keys = (description.field,)
         self.entity_description = description
-        self._serial_number = str(serial_number)
         self._attr_unique_id = description.key
         self._attr_has_entity_name = True
         self._attr_available = False
         self._attr_native_value = None
-        self._attr_device_info = DeviceInfo(
-            name="Pluggit", identifiers={(DOMAIN, self._serial_number)}
-        )
+        self._attr_device_info = device
+
+    async def async_added_to_hass(self) -> None:
+        """Refresh with the other entities of the unit."""
+        self.async_on_remove(self._refresh.add(self))
 
-    def set_value(self, value: date_time) -> None:
+    async def async_set_value(self, value: date_time) -> None:
         """Update the current value."""
+        await self.hass.async_add_executor_job(self._set_value, value)
+        await self._refresh.async_request(self)
+
+    def _set_value(self, value: date_time) -> None:
         self.entity_description.set_hour_fn(self._pluggit, value.hour)
         self.entity_description.set_min_fn(self._pluggit, value.minute)
 
-    def update(self) -> None:
-        """Fetch data for time."""
-        # If a preset mode is set, there is an update. But this update is to fast,
-        # the mode on the device isn't ready. So we wait here 100ms.
-        time.sleep(100 / 1000)
-
-        hour = self.entity_description.get_hour_fn(self._pluggit)
-        minute = self.entity_description.get_min_fn(self._pluggit)
+    def apply_refresh(self, values: Mapping[Key, Any]) -> None:
+        """Set the time from a refreshed snapshot."""
+        value = values.get(self.entity_description.field)
 
-        if (hour or minute) is None:
+        if value is None:
             self._attr_available = False
             self._attr_native_value = None
         else:
+            hour, minute = value
             self._attr_available = True
             self._attr_native_value = date_time(hour=hour, minute=minute)
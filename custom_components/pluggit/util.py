@@ -0,0 +1,25 @@
+"""Helpers shared by the pluggit platforms."""
+
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.util.dt import as_timestamp, now
+
+from .const import DOMAIN
+from .pypluggit.pluggit import Pluggit
+
+
+def help_time() -> int:
+    """Get local time in seconds."""
+    time = now()
+    return int(as_timestamp(time) + time.utcoffset().total_seconds())
+
+
+def device_info(pluggit: Pluggit, serial_number: int) -> DeviceInfo:
+    """Get the device of a unit, reads its model and firmware, blocking."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, str(serial_number))},
+        name="Pluggit",
+        manufacturer="Pluggit",
+        model=pluggit.get_unit_type(),
+        sw_version=pluggit.get_firmware_version(),
+        serial_number=str(serial_number),
+    )
@@ -1,7 +1,8 @@
 """Valve (Bypass)."""
 
+from collections.abc import Mapping
 import logging
-import time
+from typing import Any
 
 from homeassistant.components.valve import ValveEntity, ValveEntityFeature, ValveState
 from homeassistant.config_entries import ConfigEntry
@@ -9,8 +10,10 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
-from .const import DOMAIN, SERIAL_NUMBER
-from .pypluggit.pluggit import ActiveUnitMode, Pluggit
+from .const import DEVICE_INFO, DOMAIN, REFRESH
+from .pypluggit.pluggit import ActiveUnitMode
+from .pypluggit.poller import Key
+from .refresh import PluggitRefresh
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -22,26 +25,25 @@ async def async_setup_entry(
 ) -> None:
     """Set up valve."""
     data = hass.data[DOMAIN][entry.entry_id]
-    pluggit: Pluggit = data[DOMAIN]
-    serial_number = data[SERIAL_NUMBER]
+    device = data[DEVICE_INFO]
 
-    async_add_entities(
-        [PluggitValve(pluggit=pluggit, serial_number=serial_number)],
-        update_before_add=True,
-    )
+    async_add_entities([PluggitValve(refresh=data[REFRESH], device=device)])
 
 
 class PluggitValve(ValveEntity):
     """Pluggit Valve (Bypass)."""
 
+    _attr_should_poll = False
+    refresh_keys = ("bypass_state",)
+
     def __init__(
         self,
-        pluggit: Pluggit,
-        serial_number: int,
+        refresh: PluggitRefresh,
+        device: DeviceInfo,
     ) -> None:
         """Initialise Pluggit valve."""
-        self._pluggit = pluggit
-        self._serial_number = str(serial_number)
+        self._refresh = refresh
+        self._pluggit = refresh.pluggit
         self._attr_unique_id = "manual_bypass"
         self._attr_translation_key = "manual_bypass"
         self._attr_has_entity_name = True
@@ -53,9 +55,7 @@ class PluggitValve(ValveEntity):
             ValveEntityFeature.CLOSE | ValveEntityFeature.OPEN
         )
         self._attr_state = None
-        self._attr_device_info = DeviceInfo(
-            name="Pluggit", identifiers={(DOMAIN, self._serial_number)}
-        )
+        self._attr_device_info = device
 
     @property
     def is_closed(self) -> bool:
@@ -113,12 +113,13 @@ class PluggitValve(ValveEntity):
 #        """Close valve."""
 #        self._pluggit.set_unit_mode(ActiveUnitMode.DESELECT_MANUAL_BYPASS)
 
-    def update(self) -> None:
-        """Fetch data for valve."""
-        # If the switch is pressed, there is an update for the status, but this update is to fast. So we wait here.
-        time.sleep(200 / 1000)
+    async def async_added_to_hass(self) -> None:
+        """Refresh with the other entities of the unit."""
+        self.async_on_remove(self._refresh.add(self))
 
-        result = self._pluggit.get_bypass_actual_state()
+    def apply_refresh(self, values: Mapping[Key, Any]) -> None:
+        """Set the state from a refreshed snapshot."""
+        result = values.get("bypass_state")
         if result is not None:
             self._attr_state = self.get_valve_state(result)
             self._attr_available = True
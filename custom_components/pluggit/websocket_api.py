@@ -0,0 +1,153 @@
+"""Websocket API."""
+
+import time
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.const import ATTR_CONFIG_ENTRY_ID
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN, POLLER
+from .pypluggit.const import Registers
+from .pypluggit.poller import Poller
+from .pypluggit.telemetry import TelemetryBatch, telemetry_row
+
+TELEMETRY_REGISTERS = (
+    Registers.PRM_RAM_IDX_T1,
+    Registers.PRM_RAM_IDX_T2,
+    Registers.PRM_RAM_IDX_T3,
+    Registers.PRM_RAM_IDX_T4,
+    Registers.PRM_RAM_IDX_RH3_CORRECTED,
+    Registers.PRM_HAL_TAHO_1,
+    Registers.PRM_HAL_TAHO_2,
+)
+
+# Fastest sampling a frontend may ask for, in seconds.
+MIN_INTERVAL = 0.5
+
+
+class TelemetryStream:
+    """Samples of one subscription, sent as batched column frames.
+
+    The poller thread adds samples, the event loop sends every pending
+    sample in one frame at most every batch seconds. Frames go out on
+    that fixed interval no matter how fast the frontend reads them; a
+    frontend wanting fewer, larger frames asks for a longer batch. The
+    samples wait in a TelemetryBatch, which drops the oldest when too
+    many pile up.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        connection: websocket_api.ActiveConnection,
+        msg_id: int,
+        registers: tuple[Registers, ...],
+        batch: float,
+    ) -> None:
+        """Init stream to msg_id of connection."""
+        self._hass = hass
+        self._connection = connection
+        self._msg_id = msg_id
+        self._registers = registers
+        self._batch = TelemetryBatch(registers, batch)
+        self._scheduled: CALLBACK_TYPE | None = None
+        self._closed = False
+
+    def sample(self, values: dict[Registers, Any]) -> None:
+        """Add a snapshot, called from the poller thread."""
+        row = telemetry_row(self._registers, values)
+        self._hass.loop.call_soon_threadsafe(self._add, time.time(), row)
+
+    @callback
+    def _add(self, stamp: float, row: list[float | None]) -> None:
+        if self._closed:
+            return
+        self._batch.add(stamp, row)
+        if self._scheduled is not None:
+            return
+        delay = self._batch.delay(time.monotonic())
+        if delay <= 0:
+            self._send()
+        else:
+            self._scheduled = async_call_later(self._hass, delay, self._async_flush)
+
+    @callback
+    def _async_flush(self, _now: Any) -> None:
+        self._scheduled = None
+        self._send()
+
+    @callback
+    def _send(self) -> None:
+        frame = self._batch.frame(time.monotonic())
+        if frame is not None:
+            self._connection.send_message(
+                websocket_api.event_message(self._msg_id, frame)
+            )
+
+    @callback
+    def cancel(self) -> None:
+        """Drop pending samples and stop sending."""
+        self._closed = True
+        if self._scheduled is not None:
+            self._scheduled()
+            self._scheduled = None
+        self._batch.clear()
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Register the pluggit websocket commands."""
+    websocket_api.async_register_command(hass, ws_subscribe_telemetry)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "pluggit/subscribe_telemetry",
+        vol.Required(ATTR_CONFIG_ENTRY_ID): str,
+        vol.Optional("registers"): vol.All(
+            [vol.In([register.name for register in Registers])], vol.Length(min=1)
+        ),
+        vol.Optional("interval", default=1.0): vol.All(
+            vol.Coerce(float), vol.Range(min=MIN_INTERVAL, max=3600)
+        ),
+        vol.Optional("batch"): vol.All(vol.Coerce(float), vol.Range(max=60)),
+    }
+)
+@callback
+def ws_subscribe_telemetry(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream telemetry of a unit, polled only while subscribed."""
+    data = hass.data.get(DOMAIN, {}).get(msg[ATTR_CONFIG_ENTRY_ID])
+    if data is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Config entry is not loaded"
+        )
+        return
+
+    registers = (
+        tuple(Registers[name] for name in msg.get("registers", ()))
+        or TELEMETRY_REGISTERS
+    )
+    interval = msg["interval"]
+    stream = TelemetryStream(
+        hass, connection, msg["id"], registers, max(interval, msg.get("batch", 0))
+    )
+    poller: Poller = data[POLLER]
+    unsubscribe = poller.subscribe(
+        registers, stream.sample, interval, changes_only=False
+    )
+
+    @callback
+    def unsubscribe_all() -> None:
+        unsubscribe()
+        stream.cancel()
+
+    connection.subscriptions[msg["id"]] = unsubscribe_all
+    connection.send_result(msg["id"])
@@ -0,0 +1,133 @@
+"""Measure the cold start cost of the pluggit integration against a budget.
+
+    python scripts/startup_benchmark.py
+    python scripts/startup_benchmark.py --trace field.pgtr --setup-budget 0.3
+
+Every import is timed in a fresh interpreter, the median of --runs is
+compared with its budget. The integration and its platforms are only
+timed where Home Assistant is installed. With a trace recorded by
+`python -m pypluggit --record`, setup is timed too: creating the unit,
+reading its device info and a first read of every register, answered
+from the trace. Exits 1 when anything is over budget.
+"""
+
+import argparse
+import json
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+INTEGRATION = ROOT / "custom_components" / "pluggit"
+
+PLATFORMS = (
+    "binary_sensor",
+    "button",
+    "fan",
+    "number",
+    "select",
+    "sensor",
+    "switch",
+    "time",
+    "valve",
+)
+
+_IMPORT = """
+import sys, time
+sys.path[:0] = {path!r}
+started = time.perf_counter()
+import {module}
+print(time.perf_counter() - started, "pymodbus.client" in sys.modules)
+"""
+
+
+def time_import(module: str, path: list[str], runs: int) -> tuple[float, bool]:
+    """Get median import time of module and whether it loaded the client."""
+    times = []
+    client = False
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _IMPORT.format(path=path, module=module)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.split()
+        times.append(float(out[0]))
+        client = out[1] == "True"
+    return statistics.median(times), client
+
+
+def time_setup(trace: Path) -> float:
+    """Get the time to set up a unit replayed from trace."""
+    sys.path.insert(0, str(INTEGRATION))
+    from pypluggit.const import Registers  # noqa: PLC0415
+    from pypluggit.pluggit import Pluggit  # noqa: PLC0415
+    from pypluggit.trace import ReplayClient  # noqa: PLC0415
+
+    started = time.perf_counter()
+    pluggit = Pluggit("replay", client=ReplayClient(trace, loop=True))
+    pluggit.get_unit_type()
+    pluggit.get_firmware_version()
+    pluggit.read_registers(list(Registers))
+    elapsed = time.perf_counter() - started
+    pluggit.close()
+    return elapsed
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Print timings as JSON, return 1 when over budget."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--library-budget", type=float, default=0.15, help="seconds, pypluggit"
+    )
+    parser.add_argument(
+        "--integration-budget",
+        type=float,
+        default=1.0,
+        help="seconds, integration with its platforms, Home Assistant included",
+    )
+    parser.add_argument("--setup-budget", type=float, default=0.5, help="seconds")
+    parser.add_argument("--trace", type=Path)
+    args = parser.parse_args(argv)
+
+    report: dict = {}
+    over = []
+
+    library, client = time_import("pypluggit.pluggit", [str(INTEGRATION)], args.runs)
+    report["library_s"] = round(library, 4)
+    # The Modbus client is loaded when the first unit is created, not before.
+    report["library_loads_client"] = client
+    if library > args.library_budget or client:
+        over.append("library")
+
+    try:
+        import homeassistant  # noqa: F401, PLC0415
+    except ImportError:
+        report["integration_s"] = None
+    else:
+        modules = "custom_components.pluggit, " + ", ".join(
+            f"custom_components.pluggit.{platform}" for platform in PLATFORMS
+        )
+        integration, _ = time_import(modules, [str(ROOT)], args.runs)
+        report["integration_s"] = round(integration, 4)
+        if integration > args.integration_budget:
+            over.append("integration")
+
+    if args.trace is not None:
+        setup = time_setup(args.trace)
+        report["setup_s"] = round(setup, 4)
+        if setup > args.setup_budget:
+            over.append("setup")
+
+    report["over_budget"] = over
+    print(json.dumps(report, indent=2))
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
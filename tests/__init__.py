@@ -0,0 +1 @@
+"""Tests of the bundled pypluggit library."""
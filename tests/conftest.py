@@ -0,0 +1,80 @@
+"""Fixtures for the pypluggit tests.
+
+pypluggit is loaded straight from its directory, the integration package
+around it needs Home Assistant.
+"""
+
+import importlib.util
+from pathlib import Path
+import sys
+
+from pymodbus.pdu import ExceptionResponse
+from pymodbus.pdu.register_message import (
+    ReadHoldingRegistersResponse,
+    WriteMultipleRegistersResponse,
+)
+import pytest
+
+_PATH = Path(__file__).parent.parent / "custom_components" / "pluggit" / "pypluggit"
+if "pypluggit" not in sys.modules:
+    _spec = importlib.util.spec_from_file_location(
+        "pypluggit", _PATH / "__init__.py", submodule_search_locations=[str(_PATH)]
+    )
+    _module = importlib.util.module_from_spec(_spec)
+    sys.modules["pypluggit"] = _module
+    _spec.loader.exec_module(_module)
+
+READ = 0x03
+WRITE = 0x10
+
+
+class FakeClient:
+    """Modbus client holding the words of a unit in memory.
+
+    Reads touching an address of refused are answered with the exception
+    code refused maps it to, writes are stored unless refused too.
+    """
+
+    def __init__(self, words: dict[int, int] | None = None) -> None:
+        self.words: dict[int, int] = dict(words or {})
+        self.refused: dict[int, int] = {}
+        self.requests: list[tuple[int, int, int]] = []
+
+    def read_holding_registers(self, address: int, count: int = 1, **kwargs):
+        self.requests.append((READ, address, count))
+        if code := self._refusal(address, count):
+            return ExceptionResponse(READ, code)
+        words = [self.words.get(addr, 0) for addr in range(address, address + count)]
+        return ReadHoldingRegistersResponse(registers=words)
+
+    def write_registers(self, address: int, values: list[int], **kwargs):
+        self.requests.append((WRITE, address, len(values)))
+        if code := self._refusal(address, len(values)):
+            return ExceptionResponse(WRITE, code)
+        self.words.update(zip(range(address, address + len(values)), values))
+        return WriteMultipleRegistersResponse(address=address, count=len(values))
+
+    def close(self) -> None:
+        pass
+
+    def _refusal(self, address: int, count: int) -> int:
+        for addr in range(address, address + count):
+            if addr in self.refused:
+                return self.refused[addr]
+        return 0
+
+
+@pytest.fixture
+def client() -> FakeClient:
+    """Return an empty fake unit."""
+    return FakeClient()
+
+
+@pytest.fixture
+def pluggit(client: FakeClient):
+    """Return a Pluggit talking to the fake unit."""
+    from pypluggit.pluggit import Pluggit
+
+    ret = Pluggit("fake", client=client)
+    yield ret
+    ret.close()
@@ -0,0 +1,55 @@
+"""Tests of the anomaly detection."""
+
+import numpy as np
+
+from pypluggit.anomaly import PROBLEMS, AnomalyDetector, sample_row
+from pypluggit.const import Registers
+
+IMBALANCE = PROBLEMS.index("tacho_imbalance")
+IMPLAUSIBLE = PROBLEMS.index("temperature_implausible")
+
+
+def _sample(taho2: float = 1000.0, t1: float = 10.0) -> list[float]:
+    return sample_row(
+        {
+            Registers.PRM_HAL_TAHO_1: 1000.0,
+            Registers.PRM_HAL_TAHO_2: taho2,
+            Registers.PRM_RAM_IDX_T1: t1,
+            Registers.PRM_RAM_IDX_T2: 18.0,
+            Registers.PRM_RAM_IDX_T3: 21.0,
+            Registers.PRM_RAM_IDX_T4: 13.0,
+            Registers.PRM_ROM_IDX_SPEED_LEVEL: 2,
+        }
+    )
+
+
+def test_units_are_checked_independently() -> None:
+    detector = AnomalyDetector(units=0)
+    detector.add("a")
+    detector.add("b")
+    for _ in range(detector.settings.window):
+        problems = detector.update_units({"a": _sample(), "b": _sample(taho2=500.0)})
+    assert not problems["a"][IMBALANCE]
+    assert problems["b"][IMBALANCE]
+
+
+def test_removed_unit_takes_its_history() -> None:
+    detector = AnomalyDetector(units=0)
+    for unit in "abc":
+        detector.add(unit)
+    for _ in range(detector.settings.window):
+        detector.update_units({"a": _sample(taho2=500.0), "c": _sample()})
+    detector.remove("a")
+    problems = detector.update_units({"c": _sample()})
+    assert list(problems) == ["b", "c"]
+    assert not problems["c"].any()
+    assert detector.problems.shape == (2, len(PROBLEMS))
+
+
+def test_missing_sample_keeps_unit() -> None:
+    detector = AnomalyDetector(units=0)
+    detector.add("a")
+    detector.add("b")
+    problems = detector.update_units({"a": _sample(t1=99.0)})
+    assert problems["a"][IMPLAUSIBLE]
+    assert not np.any(problems["b"])
@@ -0,0 +1,36 @@
+"""Tests of verified batch writes."""
+
+from pypluggit.codec import encode
+from pypluggit.const import REGISTER_DIC, Registers
+from pypluggit.pluggit import Pluggit
+
+from .conftest import FakeClient
+
+TMAX = Registers.PRM_BYPASS_TMAX
+TMAX_ADDRESS = REGISTER_DIC[TMAX][0]
+
+
+class ClampingUnit(FakeClient):
+    """Unit that stores at most 25 °C for the bypass tmax."""
+
+    def write_registers(self, address: int, values: list[int], **kwargs):
+        ret = super().write_registers(address, values, **kwargs)
+        if address <= TMAX_ADDRESS < address + len(values):
+            self.words.update(zip((TMAX_ADDRESS, TMAX_ADDRESS + 1), encode(TMAX, 25.0)))
+        return ret
+
+
+def test_apply_reads_back_from_the_unit() -> None:
+    unit = Pluggit("fake", client=ClampingUnit())
+    result = unit.apply_registers({TMAX: 30.0})
+    unit.close()
+    assert result.written == [TMAX]
+    assert result.mismatched == {TMAX: 25.0}
+
+
+def test_apply_verifies_with_the_unit_while_polls_are_paused() -> None:
+    unit = Pluggit("fake", client=ClampingUnit())
+    with unit.pause_polls():
+        result = unit.apply_registers({TMAX: 30.0})
+    unit.close()
+    assert result.mismatched == {TMAX: 25.0}
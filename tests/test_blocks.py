@@ -0,0 +1,30 @@
+"""Tests of block read planning."""
+
+from pypluggit.blocks import Block, plan_blocks
+
+
+def test_near_spans_share_a_block() -> None:
+    assert plan_blocks([(10, 2), (14, 2), (100, 2)], max_gap=16) == [
+        Block(10, 6),
+        Block(100, 2),
+    ]
+
+
+def test_gap_over_max_gap_splits() -> None:
+    assert plan_blocks([(10, 2), (30, 2)], max_gap=4) == [Block(10, 2), Block(30, 2)]
+
+
+def test_block_never_exceeds_max_count() -> None:
+    blocks = plan_blocks(((address, 2) for address in range(0, 300, 2)), max_count=125)
+    assert all(block.count <= 125 for block in blocks)
+    assert sum(block.count for block in blocks) == 300
+
+
+def test_avoided_address_is_not_bridged() -> None:
+    assert plan_blocks([(10, 2), (14, 2)], avoid={12}) == [Block(10, 2), Block(14, 2)]
+
+
+def test_unsorted_and_overlapping_spans_merge() -> None:
+    assert plan_blocks([(14, 2), (10, 6), (10, 6), (12, 2)], max_gap=0) == [
+        Block(10, 6)
+    ]
@@ -0,0 +1,136 @@
+"""Tests of the humidity and VOC boost controller."""
+
+import pytest
+
+from pypluggit.boost import MANUAL_STATE, BoostController, BoostRunner, BoostSettings
+from pypluggit.codec import encode
+from pypluggit.const import REGISTER_DIC, Registers
+from pypluggit.poller import Poller
+
+from .conftest import FakeClient
+
+SETTINGS = BoostSettings(
+    humidity_on=70, humidity_off=60, voc_on=1200, voc_off=900, level=3, min_on=300
+)
+
+
+class Unit:
+    """Speed level the controller writes to."""
+
+    def __init__(self, level: int = 1) -> None:
+        self.level = level
+        self.writes: list[int] = []
+        self.fail = False
+
+    def write(self, level: int) -> bool:
+        if self.fail:
+            return False
+        self.writes.append(level)
+        self.level = level
+        return True
+
+
+@pytest.fixture
+def unit() -> Unit:
+    return Unit()
+
+
+@pytest.fixture
+def controller(unit: Unit) -> BoostController:
+    return BoostController(SETTINGS, unit.write)
+
+
+def _step(controller, unit, now, humidity=50.0, voc=500.0, state=MANUAL_STATE):
+    return controller.step(now, humidity, voc, unit.level, state)
+
+
+def test_boost_has_hysteresis(controller: BoostController, unit: Unit) -> None:
+    assert _step(controller, unit, 0, humidity=70).reason == "humidity"
+    assert unit.level == 3
+    # Between the thresholds the boost holds.
+    assert _step(controller, unit, 400, humidity=65).reason == "high"
+    decision = _step(controller, unit, 500, humidity=60)
+    assert decision.reason == "clear"
+    assert not decision.boosting
+    assert unit.writes == [3, 1]
+    # Between the thresholds no new boost starts either.
+    assert _step(controller, unit, 1000, humidity=65).reason == "idle"
+
+
+def test_voc_starts_a_boost(controller: BoostController, unit: Unit) -> None:
+    assert _step(controller, unit, 0, voc=1300).reason == "voc"
+    assert _step(controller, unit, 400, voc=1000).reason == "high"
+
+
+def test_min_on_and_min_off(controller: BoostController, unit: Unit) -> None:
+    _step(controller, unit, 0, humidity=80)
+    assert _step(controller, unit, 100, humidity=50).reason == "min_on"
+    assert _step(controller, unit, 300, humidity=50).reason == "clear"
+    assert _step(controller, unit, 330, humidity=80).reason == "min_off"
+    assert _step(controller, unit, 360, humidity=80).reason == "humidity"
+    assert unit.writes == [3, 1, 3]
+
+
+def test_manual_change_overrides(controller: BoostController, unit: Unit) -> None:
+    _step(controller, unit, 0, humidity=80)
+    unit.level = 4
+    decision = _step(controller, unit, 10, humidity=80)
+    assert decision.reason == "override"
+    assert not decision.boosting
+    # The user's level is kept, nothing is restored.
+    assert unit.writes == [3]
+    assert _step(controller, unit, 400, humidity=50).reason == "idle"
+
+
+def test_leaving_manual_mode_overrides(
+    controller: BoostController, unit: Unit
+) -> None:
+    _step(controller, unit, 0, humidity=80)
+    assert _step(controller, unit, 10, humidity=80, state=3).reason == "override"
+    assert _step(controller, unit, 400, humidity=80, state=3).reason == "not_manual"
+
+
+def test_no_boost_at_or_above_the_boost_level(
+    controller: BoostController, unit: Unit
+) -> None:
+    unit.level = 3
+    assert _step(controller, unit, 0, humidity=80).reason == "already_high"
+    assert unit.writes == []
+
+
+def test_failed_write_keeps_state(controller: BoostController, unit: Unit) -> None:
+    unit.fail = True
+    assert _step(controller, unit, 0, humidity=80).reason == "write_failed"
+    assert not controller.boosting
+    unit.fail = False
+    assert _step(controller, unit, 10, humidity=80).reason == "humidity"
+
+
+def test_missing_values(controller: BoostController, unit: Unit) -> None:
+    assert controller.step(0, 80, None, None, MANUAL_STATE).reason == "unavailable"
+    # A missing sensor neither starts nor holds a boost.
+    assert _step(controller, unit, 0, humidity=None, voc=None).reason == "idle"
+
+
+def test_runner_boosts_through_the_poller(pluggit, client: FakeClient) -> None:
+    values = {
+        Registers.PRM_RAM_IDX_RH3_CORRECTED: 80,
+        Registers.PRM_VOC: 500,
+        Registers.PRM_ROM_IDX_SPEED_LEVEL: 1,
+        Registers.PRM_CURRENT_BL_STATE: MANUAL_STATE,
+    }
+    for register, value in values.items():
+        address = REGISTER_DIC[register][0]
+        client.words.update(zip(range(address, address + 2), encode(register, value)))
+    poller = Poller(pluggit)
+    poller.stop()
+    decisions = []
+    runner = BoostRunner(poller, SETTINGS, on_decision=decisions.append)
+    runner.start()
+    poller.poll()
+    assert decisions[-1].reason == "humidity"
+    assert pluggit.get_speed_level() == 3
+
+    # Stopping a running boost restores the level it started from.
+    runner.stop()
+    assert pluggit.get_speed_level() == 1
@@ -0,0 +1,74 @@
+"""Tests of the high frequency capture."""
+
+import math
+import threading
+
+from pypluggit.capture import MAX_RATE, CaptureData, capture
+from pypluggit.codec import encode
+from pypluggit.const import REGISTER_DIC, Registers
+
+from .conftest import READ, FakeClient
+
+T1 = Registers.PRM_RAM_IDX_T1
+T2 = Registers.PRM_RAM_IDX_T2
+TAHO = Registers.PRM_HAL_TAHO_1
+REGISTERS = (T1, T2, TAHO)
+
+
+def _set(client: FakeClient, register: Registers, value: float) -> None:
+    address = REGISTER_DIC[register][0]
+    client.words.update(zip(range(address, address + 2), encode(register, value)))
+
+
+def test_samples_at_a_fixed_rate(pluggit, client: FakeClient) -> None:
+    _set(client, T1, 21.5)
+    _set(client, T2, 18.0)
+    blocks = len(pluggit.plan_reads(REGISTERS, max_gap=125))
+    pluggit.read_registers(REGISTERS)
+    warm_up = len(client.requests)
+    client.requests.clear()
+
+    data, stats = capture(pluggit, 0.5, rate=MAX_RATE * 2, registers=REGISTERS)
+    assert stats.requested_rate == MAX_RATE
+    assert 5 <= stats.samples <= 10
+    assert len(data) == stats.samples
+    assert list(data.times) == sorted(data.times)
+    assert data.row(0) == {T1: 21.5, T2: 18.0, TAHO: 0.0}
+    # After one read up front every sample reads the planned blocks only.
+    reads = len([r for r in client.requests if r[0] == READ])
+    assert reads == warm_up + blocks * len(data)
+
+
+def test_refused_register_is_nan(pluggit, client: FakeClient) -> None:
+    _set(client, T1, 21.5)
+    client.refused[REGISTER_DIC[TAHO][0]] = 0x02
+    data, stats = capture(pluggit, 0.2, rate=10, registers=REGISTERS)
+    assert stats.samples
+    assert stats.errors == 0
+    assert data.row(0)[T1] == 21.5
+    assert math.isnan(data.row(0)[TAHO])
+
+
+def test_failed_reads_are_counted(pluggit, client: FakeClient) -> None:
+    client.refused[REGISTER_DIC[T1][0]] = 0x06
+    data, stats = capture(pluggit, 0.2, rate=10, registers=(T1,))
+    assert len(data) == 0
+    assert stats.errors >= 1
+
+
+def test_stop_ends_early(pluggit) -> None:
+    stop = threading.Event()
+    stop.set()
+    data, stats = capture(pluggit, 60, rate=10, registers=REGISTERS, stop=stop)
+    assert len(data) == 0
+    assert stats.duration < 1
+
+
+def test_save_and_load(pluggit, client: FakeClient, tmp_path) -> None:
+    _set(client, T1, 21.5)
+    data, _ = capture(pluggit, 0.2, rate=10, registers=REGISTERS)
+    data.save(tmp_path / "capture.pgcap")
+    loaded = CaptureData.load(tmp_path / "capture.pgcap")
+    assert loaded.registers == REGISTERS
+    assert list(loaded.times) == list(data.times)
+    assert loaded.row(0) == data.row(0)
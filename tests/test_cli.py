@@ -0,0 +1,23 @@
+"""Tests of the command line tool."""
+
+import argparse
+
+import pytest
+
+from pypluggit.__main__ import _assignment
+from pypluggit.const import Registers
+
+
+def test_assignment_parses_numbers() -> None:
+    assert _assignment("PRM_BYPASS_TMAX=24") == (Registers.PRM_BYPASS_TMAX, 24)
+    assert _assignment("PRM_BYPASS_TMAX=24.5") == (Registers.PRM_BYPASS_TMAX, 24.5)
+    assert _assignment("PRM_DATE_TIME_SET=0x10") == (Registers.PRM_DATE_TIME_SET, 16)
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["PRM_DATE_TIME_SET=1.5", "PRM_DATE_TIME_SET=-1", "PRM_NOPE=1", "PRM_BYPASS_TMAX"],
+)
+def test_assignment_rejects(text: str) -> None:
+    with pytest.raises(argparse.ArgumentTypeError):
+        _assignment(text)
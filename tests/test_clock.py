@@ -0,0 +1,34 @@
+"""Tests of the locally tracked device clock."""
+
+from pypluggit.codec import encode
+from pypluggit.const import REGISTER_DIC, Registers
+from pypluggit.pluggit import Pluggit
+
+from .conftest import FakeClient
+
+
+def test_clock_follows_a_batched_time_write(client: FakeClient) -> None:
+    address = REGISTER_DIC[Registers.PRM_DATE_TIME][0]
+    client.words.update(
+        zip((address, address + 1), encode(Registers.PRM_DATE_TIME, 1000))
+    )
+    unit = Pluggit("fake", local_time=lambda: 1000, client=client)
+    assert abs(unit.get_device_time() - 1000) <= 1
+
+    assert unit.write_registers({Registers.PRM_DATE_TIME_SET: 5000})
+    assert abs(unit.get_device_time() - 5000) <= 1
+    assert unit.get_clock_drift() == 0
+    unit.close()
+
+
+def test_failed_time_write_keeps_the_device_clock(client: FakeClient) -> None:
+    address = REGISTER_DIC[Registers.PRM_DATE_TIME][0]
+    client.words.update(
+        zip((address, address + 1), encode(Registers.PRM_DATE_TIME, 1000))
+    )
+    client.refused[REGISTER_DIC[Registers.PRM_DATE_TIME_SET][0]] = 0x04
+    unit = Pluggit("fake", local_time=lambda: 1000, client=client)
+
+    unit.set_date_time(5000)
+    assert abs(unit.get_device_time() - 1000) <= 1
+    unit.close()
@@ -0,0 +1,63 @@
+"""Tests of the filter clogging predictor."""
+
+from pypluggit.clogging import DAY, FilterPredictor
+from pypluggit.const import Registers
+
+
+def _sample(remaining: int, default: int = 180, rpm: float = 1000.0) -> dict:
+    return {
+        Registers.PRM_HAL_TAHO_1: rpm,
+        Registers.PRM_HAL_TAHO_2: rpm,
+        Registers.PRM_ROM_IDX_SPEED_LEVEL: 2,
+        Registers.PRM_FILTER_REMAINING_TIME: remaining,
+        Registers.PRM_FILTER_DEFAULT_TIME: default,
+    }
+
+
+def _learn(predictor: FilterPredictor, start: float, days: int) -> None:
+    for step in range(days * 24):
+        now = start + step * 3600
+        rpm = 1000 * (1 + 0.001 * step / 24)
+        predictor.add(now, _sample(180 - step // 24, rpm=rpm))
+
+
+def test_nothing_is_learned_before_a_reset() -> None:
+    predictor = FilterPredictor()
+    for day in range(30):
+        predictor.add(day * DAY, _sample(90 - day))
+    assert predictor.reset_time is None
+    assert predictor.baselines == {}
+    assert predictor.predict(30 * DAY) is None
+
+
+def test_reset_starts_learning_and_forecasts() -> None:
+    predictor = FilterPredictor()
+    predictor.add(0, _sample(3))
+    _learn(predictor, DAY, 20)
+    assert predictor.reset_time == DAY
+    assert predictor.predict(21 * DAY) is not None
+
+
+def test_raising_the_default_time_is_no_reset() -> None:
+    predictor = FilterPredictor()
+    predictor.add(0, _sample(3))
+    predictor.add(DAY, _sample(180))
+    predictor.add(50 * DAY, _sample(130))
+    # Default raised from 180 to 270 days, remaining grows by the same.
+    predictor.add(51 * DAY, _sample(219, default=270))
+    assert predictor.reset_time == DAY
+
+
+def test_state_from_before_resets_were_required_is_dropped() -> None:
+    predictor = FilterPredictor()
+    predictor.restore({"reset_time": 5.0, "remaining": 80, "fit": {"n": 3}})
+    assert predictor.reset_time is None
+    assert predictor.remaining == 80
+    assert predictor.fit.n == 0
+
+    learned = FilterPredictor()
+    learned.add(0, _sample(3))
+    _learn(learned, DAY, 2)
+    restored = FilterPredictor()
+    restored.restore(learned.to_dict())
+    assert restored.to_dict() == learned.to_dict()
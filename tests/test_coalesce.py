@@ -0,0 +1,101 @@
+"""Tests of write coalescing and no-op dropping."""
+
+import threading
+
+from pypluggit.coalesce import WriteCoalescer
+from pypluggit.const import REGISTER_DIC, Registers
+
+from .conftest import WRITE, FakeClient
+
+
+def test_last_write_wins() -> None:
+    sent = []
+    done = threading.Event()
+
+    def flush(register, value):
+        sent.append((register, value))
+        done.set()
+
+    coalescer = WriteCoalescer(flush, delay=0.05)
+    for value in (12, 13, 14):
+        coalescer.write(Registers.PRM_BYPASS_TMIN, value)
+    assert coalescer.pending(Registers.PRM_BYPASS_TMIN) == 14
+    assert done.wait(1)
+    assert sent == [(Registers.PRM_BYPASS_TMIN, 14)]
+    assert coalescer.pending(Registers.PRM_BYPASS_TMIN) is None
+
+
+def test_discard_drops_pending() -> None:
+    sent = []
+    coalescer = WriteCoalescer(lambda *args: sent.append(args))
+    coalescer.write(Registers.PRM_BYPASS_TMIN, 12)
+    coalescer.discard(Registers.PRM_BYPASS_TMIN)
+    coalescer.flush()
+    assert sent == []
+
+
+def test_unchanged_value_is_not_written(pluggit, client: FakeClient) -> None:
+    pluggit.set_bypass_tmin(13.5)
+    pluggit.close()
+    client.requests.clear()
+
+    pluggit_again = type(pluggit)("fake", client=client)
+    pluggit_again.get_bypass_tmin()
+    pluggit_again.set_bypass_tmin(13.5)
+    pluggit_again.close()
+    assert not [request for request in client.requests if request[0] == WRITE]
+
+
+def test_changed_value_is_written_once(pluggit, client: FakeClient) -> None:
+    for value in (12.0, 13.0, 14.0):
+        pluggit.set_bypass_tmin(value)
+    assert pluggit.get_bypass_tmin() == 14.0
+    pluggit.close()
+    assert len([request for request in client.requests if request[0] == WRITE]) == 1
+    assert type(pluggit)("fake", client=client).get_bypass_tmin() == 14.0
+
+
+def test_refused_write_is_not_cached(pluggit, client: FakeClient) -> None:
+    address = REGISTER_DIC[Registers.PRM_BYPASS_TMIN][0]
+    client.refused[address] = 0x03
+    pluggit.set_bypass_tmin(13.5)
+    pluggit._coalescer.flush()  # noqa: SLF001
+    assert pluggit.cached_words(address, 2) is None
+
+    # The same value again is a real write once the unit takes it.
+    del client.refused[address]
+    client.requests.clear()
+    pluggit.set_bypass_tmin(13.5)
+    pluggit._coalescer.flush()  # noqa: SLF001
+    assert (WRITE, address, 2) in client.requests
+    assert pluggit.get_bypass_tmin() == 13.5
+
+
+def test_refused_read_is_not_cached(pluggit, client: FakeClient) -> None:
+    address = REGISTER_DIC[Registers.PRM_BYPASS_TMIN][0]
+    client.refused[address] = 0x04
+    assert pluggit.get_bypass_tmin() is None
+    assert pluggit.cached_words(address, 2) is None
+
+
+def test_registers_are_debounced_separately() -> None:
+    sent = []
+    coalescer = WriteCoalescer(lambda *args: sent.append(args), delay=10)
+    coalescer.write(Registers.PRM_BYPASS_TMIN, 12)
+    coalescer.write(Registers.PRM_BYPASS_TMAX, 24)
+    coalescer.write(Registers.PRM_BYPASS_TMIN, 13)
+    coalescer.flush()
+    assert sorted(sent, key=lambda item: item[0].name) == [
+        (Registers.PRM_BYPASS_TMAX, 24),
+        (Registers.PRM_BYPASS_TMIN, 13),
+    ]
+
+
+def test_pending_value_is_read_without_io(pluggit, client: FakeClient) -> None:
+    pluggit.set_bypass_tmin(12.0)
+    client.requests.clear()
+    assert pluggit.get_bypass_tmin() == 12.0
+    assert pluggit.read_registers([Registers.PRM_BYPASS_TMIN]) == {
+        Registers.PRM_BYPASS_TMIN: 12.0
+    }
+    assert client.requests == []
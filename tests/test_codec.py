@@ -0,0 +1,62 @@
+"""Tests of register encoding."""
+
+import pytest
+
+from pypluggit.codec import (
+    check,
+    decode,
+    decode_as,
+    decode_words,
+    encode,
+    encode_as,
+)
+from pypluggit.const import REGISTER_DIC, Registers
+
+
+@pytest.mark.parametrize(
+    ("register", "value"),
+    [
+        (Registers.PRM_RAM_IDX_T1, 21.5),
+        (Registers.PRM_DATE_TIME, 1_700_000_000),
+        (Registers.PRM_CURRENT_BL_STATE, 4),
+    ],
+)
+def test_round_trip(register: Registers, value) -> None:
+    assert decode(register, encode(register, value)) == value
+
+
+def test_low_word_first() -> None:
+    assert encode(Registers.PRM_DATE_TIME, 0x00010002) == [0x0002, 0x0001]
+
+
+def test_decode_words_skips_incomplete_registers() -> None:
+    t1 = REGISTER_DIC[Registers.PRM_RAM_IDX_T1][0]
+    words = dict(zip((t1, t1 + 1, t1 + 2), [*encode(Registers.PRM_RAM_IDX_T1, 1.0), 0]))
+    registers = [Registers.PRM_RAM_IDX_T1, Registers.PRM_RAM_IDX_T2]
+    assert decode_words(registers, words) == {Registers.PRM_RAM_IDX_T1: 1.0}
+
+
+@pytest.mark.parametrize("value", [1.5, -1, 2**32])
+def test_check_rejects_what_uint32_cannot_hold(value) -> None:
+    with pytest.raises(ValueError):
+        check(Registers.PRM_DATE_TIME_SET, value)
+
+
+def test_check_coerces_to_register_type() -> None:
+    assert check(Registers.PRM_DATE_TIME_SET, 7.0) == 7
+    assert isinstance(check(Registers.PRM_DATE_TIME_SET, 7.0), int)
+    assert check(Registers.PRM_RAM_IDX_T1, 21.5) == 21.5
+
+
+@pytest.mark.parametrize(("values", "data_type"), [([1.5], "uint16"), ([-1], "uint32")])
+def test_encode_as_raises_value_error(values, data_type) -> None:
+    with pytest.raises(ValueError):
+        encode_as(values, data_type)
+
+
+def test_raw_types_match_register_types() -> None:
+    words = encode(Registers.PRM_RAM_IDX_T1, 21.5)
+    assert decode_as(words, "float32") == [21.5]
+    assert encode_as([21.5], "float32") == words
+    assert decode_as([0x0002, 0x0001, 0xFFFF], "uint32") == [0x00010002]
+    assert decode_as([0xFFFF, 0xFFFF], "int16") == [-1, -1]
@@ -0,0 +1,158 @@
+"""Tests of the fleet collector without a network."""
+
+import asyncio
+import csv
+from datetime import datetime
+
+import pytest
+
+from pypluggit import collector as collector_module
+from pypluggit.codec import encode
+from pypluggit.collector import Collector
+from pypluggit.const import REGISTER_DIC, Registers
+
+from .conftest import READ, FakeClient
+
+T1 = Registers.PRM_RAM_IDX_T1
+T2 = Registers.PRM_RAM_IDX_T2
+REGISTERS = (T1, T2)
+
+
+class AsyncFakeClient:
+    """Async front of a FakeClient, like AsyncModbusTcpClient."""
+
+    connected = True
+
+    def __init__(self, client: FakeClient) -> None:
+        self.client = client
+
+    async def read_holding_registers(self, address: int, count: int = 1, **kwargs):
+        return self.client.read_holding_registers(address, count)
+
+
+def _address(register: Registers) -> int:
+    return REGISTER_DIC[register][0]
+
+
+def _unit() -> FakeClient:
+    client = FakeClient()
+    for register, value in ((T1, 21.5), (T2, 18.0)):
+        words = encode(register, value)
+        client.words.update(enumerate(words, _address(register)))
+    return client
+
+
+def _collector(tmp_path, **kwargs) -> Collector:
+    return Collector(["unit"], tmp_path, registers=REGISTERS, fmt="csv", **kwargs)
+
+
+def _read(collector: Collector, client: FakeClient):
+    return asyncio.run(collector._read("unit", AsyncFakeClient(client)))
+
+
+def test_read_decodes_sample(tmp_path) -> None:
+    assert _read(_collector(tmp_path), _unit()) == {T1: 21.5, T2: 18.0}
+
+
+def test_refused_register_is_read_around(tmp_path) -> None:
+    collector = _collector(tmp_path)
+    client = _unit()
+    client.refused[_address(T2)] = 0x02
+    assert _read(collector, client) == {T1: 21.5}
+    assert collector.stats.errors == 0
+
+    # Later samples skip the refused address without bisecting again.
+    client.requests.clear()
+    assert _read(collector, client) == {T1: 21.5}
+    assert client.requests == [(READ, _address(T1), 2)]
+
+
+def test_busy_unit_fails_sample(tmp_path) -> None:
+    collector = _collector(tmp_path)
+    client = _unit()
+    client.refused[_address(T2)] = 0x06
+    assert _read(collector, client) is None
+    assert collector.stats.errors == 1
+
+    # A busy reply is no reason to stop reading the register.
+    del client.refused[_address(T2)]
+    assert _read(collector, client) == {T1: 21.5, T2: 18.0}
+
+
+def _stamp(hour: int, minute: int) -> float:
+    return datetime(2026, 1, 1, hour, minute).timestamp()
+
+
+def _rows(path) -> list[list[str]]:
+    with path.open(newline="", encoding="ascii") as file:
+        return list(csv.reader(file))
+
+
+def test_flush_splits_files_by_hour(tmp_path) -> None:
+    collector = _collector(tmp_path)
+    collector._append("unit", _stamp(10, 59), {T1: 21.5, T2: 18.0})
+    collector._append("unit", _stamp(11, 0), {T1: 22.0})
+    asyncio.run(collector.flush())
+    collector._close_archives()
+
+    first = _rows(tmp_path / "unit" / "2026-01-01T10.csv")
+    assert first == [
+        ["time", "PRM_RAM_IDX_T1", "PRM_RAM_IDX_T2"],
+        [str(_stamp(10, 59)), "21.5", "18.0"],
+    ]
+    second = _rows(tmp_path / "unit" / "2026-01-01T11.csv")
+    assert second[1] == [str(_stamp(11, 0)), "22.0", "nan"]
+    assert collector.stats.flushed_rows == 2
+    assert collector.stats.buffered == 0
+
+
+def test_full_buffer_drops_and_flushes(tmp_path) -> None:
+    collector = _collector(tmp_path, max_buffered=2)
+
+    async def fill() -> None:
+        for minute in range(3):
+            collector._append("unit", _stamp(10, minute), {T1: 21.5})
+        await collector._flush_task
+
+    asyncio.run(fill())
+    assert collector.stats.samples == 2
+    assert collector.stats.dropped == 1
+    assert collector.stats.flushed_rows == 2
+
+
+def test_failed_write_keeps_samples(tmp_path, monkeypatch) -> None:
+    collector = _collector(tmp_path)
+    write = collector_module._Archive.write
+    calls = []
+
+    def flaky(self, columns) -> None:
+        calls.append(len(columns))
+        if len(calls) == 1:
+            raise OSError("disk full")
+        write(self, columns)
+
+    monkeypatch.setattr(collector_module._Archive, "write", flaky)
+    collector._append("unit", _stamp(10, 0), {T1: 21.5})
+    assert not asyncio.run(collector._try_flush())
+    assert collector.stats.flush_errors == 1
+    assert collector.stats.buffered == 1
+
+    # Samples taken while the write failed follow the kept ones.
+    collector._append("unit", _stamp(10, 1), {T1: 22.0})
+    asyncio.run(collector.flush())
+    collector._close_archives()
+    rows = _rows(tmp_path / "unit" / "2026-01-01T10.csv")
+    assert [row[1] for row in rows[1:]] == ["21.5", "22.0"]
+
+
+def test_write_error_is_raised_by_flush(tmp_path, monkeypatch) -> None:
+    collector = _collector(tmp_path)
+
+    def broken(self, columns) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(collector_module._Archive, "write", broken)
+    collector._append("unit", _stamp(10, 0), {T1: 21.5})
+    with pytest.raises(OSError):
+        asyncio.run(collector.flush())
+    assert collector.stats.buffered == 1
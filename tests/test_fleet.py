@@ -0,0 +1,48 @@
+"""Tests of the fleet aggregates."""
+
+import pytest
+
+from pypluggit.const import Registers
+from pypluggit.fleet import METRICS, STATS, FleetAggregator
+
+
+def test_statistics_over_units() -> None:
+    fleet = FleetAggregator()
+    for unit, temperature in enumerate((20.0, 22.0, 24.0)):
+        fleet.set(unit, {Registers.PRM_RAM_IDX_T3: temperature})
+    fleet.compute()
+    assert fleet.value("min", "t3_extract") == 20.0
+    assert fleet.value("mean", "t3_extract") == 22.0
+    assert fleet.value("max", "t3_extract") == 24.0
+    assert fleet.value("p90", "t3_extract") == pytest.approx(23.6)
+    assert fleet.value("mean", "voc") is None
+
+
+def test_removed_unit_leaves_the_statistics() -> None:
+    fleet = FleetAggregator()
+    fleet.set("a", {Registers.PRM_RAM_IDX_T3: 20.0})
+    fleet.set("b", {Registers.PRM_RAM_IDX_T3: 30.0})
+    fleet.remove("a")
+    fleet.set("b", {Registers.PRM_RAM_IDX_RH3_CORRECTED: 40})
+    fleet.compute()
+    assert fleet.value("min", "t3_extract") == 30.0
+    assert fleet.value("max", "humidity") == 40.0
+    assert len(fleet) == 1
+
+
+def test_none_is_missing_and_counted_out() -> None:
+    fleet = FleetAggregator()
+    fleet.set("a", {Registers.PRM_VOC: 400})
+    fleet.set("b", {Registers.PRM_VOC: None})
+    fleet.set("c", {Registers.PRM_VOC: 600})
+    fleet.compute()
+    assert fleet.value("mean", "voc") == 500.0
+    assert fleet.units[list(METRICS).index("voc")] == 2
+
+
+def test_empty_fleet_has_no_values() -> None:
+    fleet = FleetAggregator()
+    fleet.set("a", {Registers.PRM_VOC: 400})
+    fleet.remove("a")
+    fleet.compute()
+    assert all(fleet.value(stat, "voc") is None for stat in STATS)
@@ -0,0 +1,61 @@
+"""Tests of the mode timer."""
+
+from pypluggit.modetime import ModeTimer
+
+
+def test_counts_time_in_each_state() -> None:
+    timer = ModeTimer()
+    timer.observe(0, 1)
+    timer.observe(60, 2)
+    assert timer.elapsed(90, 1) == 60
+    assert timer.elapsed(90, 2) == 30
+    assert timer.at(90) == {1: 60, 2: 30}
+
+
+def test_unknown_state_counts_nowhere() -> None:
+    timer = ModeTimer()
+    timer.observe(0, 1)
+    timer.observe(10, None)
+    assert timer.at(100) == {1: 10}
+
+
+def test_reset_carries_the_state_in_progress() -> None:
+    timer = ModeTimer()
+    timer.observe(0, 1)
+    timer.reset(100)
+    assert timer.start == 100
+    assert timer.elapsed(130, 1) == 30
+
+
+def test_reset_before_a_late_transition() -> None:
+    timer = ModeTimer()
+    timer.observe(200, 1)
+    # The period started before the state did.
+    timer.reset(100)
+    assert timer.elapsed(230, 1) == 30
+
+
+def test_restore_resumes_with_the_next_state() -> None:
+    timer = ModeTimer()
+    timer.observe(0, 1)
+    data = timer.to_dict(50)
+
+    restored = ModeTimer()
+    restored.restore(data)
+    assert restored.at(1000) == {1: 50}
+    restored.observe(1000, 2)
+    assert restored.at(1010) == {1: 50, 2: 10}
+
+
+def test_returning_to_a_state_adds_up() -> None:
+    timer = ModeTimer()
+    timer.observe(0, 1)
+    timer.observe(10, 2)
+    timer.observe(20, 1)
+    assert timer.at(25) == {1: 15, 2: 10}
+
+
+def test_clock_going_back_counts_nothing() -> None:
+    timer = ModeTimer()
+    timer.observe(100, 1)
+    assert timer.elapsed(50, 1) == 0
@@ -0,0 +1,116 @@
+"""Tests of the change subscriptions."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from pypluggit import poller as poller_module
+from pypluggit.codec import encode
+from pypluggit.const import REGISTER_DIC, Registers
+from pypluggit.poller import Poller
+
+from .conftest import READ, FakeClient
+
+T1 = Registers.PRM_RAM_IDX_T1
+T2 = Registers.PRM_RAM_IDX_T2
+
+
+def _set(client: FakeClient, register: Registers, value: float) -> None:
+    address = REGISTER_DIC[register][0]
+    client.words.update(zip(range(address, address + 2), encode(register, value)))
+
+
+@pytest.fixture
+def clock(monkeypatch) -> list[float]:
+    now = [1000.0]
+    fake_time = SimpleNamespace(monotonic=lambda: now[0])
+    monkeypatch.setattr(poller_module, "time", fake_time)
+    return now
+
+
+@pytest.fixture
+def poller(pluggit, clock):
+    ret = Poller(pluggit, interval=10)
+    # Cycles are run by the tests, not by the poll thread.
+    ret.stop()
+    return ret
+
+
+def test_only_changes_are_delivered(poller: Poller, client: FakeClient, clock) -> None:
+    _set(client, T1, 20.0)
+    _set(client, T2, 15.0)
+    calls = []
+    poller.subscribe([T1, T2], calls.append)
+
+    poller.poll()
+    assert calls == [{T1: 20.0, T2: 15.0}]
+    clock[0] += 10
+    poller.poll()
+    assert len(calls) == 1
+    _set(client, T2, 16.0)
+    clock[0] += 10
+    poller.poll()
+    assert calls[-1] == {T2: 16.0}
+
+
+def test_every_cycle_without_changes_only(poller: Poller, client: FakeClient, clock):
+    _set(client, T1, 20.0)
+    calls = []
+    poller.subscribe([T1], calls.append, changes_only=False)
+    for _ in range(3):
+        poller.poll()
+        clock[0] += 10
+    assert calls == [{T1: 20.0}] * 3
+
+
+def test_subscriptions_keep_their_own_interval(
+    poller: Poller, client: FakeClient, clock
+) -> None:
+    fast, slow = [], []
+    poller.subscribe([T1], fast.append, interval=5, changes_only=False)
+    poller.subscribe([T2], slow.append, interval=60, changes_only=False)
+    assert poller.poll() == clock[0] + 5
+
+    client.requests.clear()
+    clock[0] += 5
+    assert poller.poll() == clock[0] + 5
+    assert (len(fast), len(slow)) == (2, 1)
+    # Only the registers of the due subscription are read.
+    t2 = REGISTER_DIC[T2][0]
+    assert all(
+        not (address <= t2 < address + count)
+        for function, address, count in client.requests
+        if function == READ
+    )
+
+
+def test_unsubscribed_gets_nothing(poller: Poller, client: FakeClient, clock) -> None:
+    calls = []
+    unsubscribe = poller.subscribe([T1], calls.append, changes_only=False)
+    poller.poll()
+    unsubscribe()
+    client.requests.clear()
+    clock[0] += 10
+    assert poller.poll() is None
+    assert len(calls) == 1
+    assert client.requests == []
+
+
+def test_failing_callback_spares_the_others(poller: Poller, clock) -> None:
+    calls = []
+
+    def fail(_values) -> None:
+        raise RuntimeError
+
+    poller.subscribe([T1], fail)
+    poller.subscribe([T1], calls.append)
+    poller.poll()
+    assert len(calls) == 1
+
+
+def test_fields_are_decoded(poller: Poller, client: FakeClient) -> None:
+    client.words.update({4: 7, 6: 1})
+    calls = []
+    poller.subscribe(["serial_number"], calls.append)
+    poller.poll()
+    assert calls == [{"serial_number": (1 << 32) + 7}]
@@ -0,0 +1,78 @@
+"""Tests of the caching Modbus proxy."""
+
+import asyncio
+import struct
+
+import pytest
+
+from pypluggit.proxy import ModbusProxy
+
+from .conftest import READ, WRITE, FakeClient
+
+
+def _process(proxy: ModbusProxy, pdu: bytes) -> bytes:
+    return asyncio.run(proxy._process(pdu))  # noqa: SLF001
+
+
+def _read(address: int, count: int) -> bytes:
+    return struct.pack(">BHH", READ, address, count)
+
+
+@pytest.fixture
+def proxy(pluggit, client: FakeClient) -> ModbusProxy:
+    client.words.update({100: 1, 101: 2, 102: 3})
+    return ModbusProxy(pluggit, max_age=30)
+
+
+def test_second_read_is_served_from_cache(
+    proxy: ModbusProxy, client: FakeClient
+) -> None:
+    assert _process(proxy, _read(100, 3)) == bytes([READ, 6, 0, 1, 0, 2, 0, 3])
+    assert _process(proxy, _read(101, 2)) == bytes([READ, 4, 0, 2, 0, 3])
+    assert (proxy.hits, proxy.misses) == (1, 1)
+    assert [request[0] for request in client.requests] == [READ]
+
+
+def test_written_words_are_served_from_cache(
+    proxy: ModbusProxy, client: FakeClient
+) -> None:
+    pdu = struct.pack(">BHHBHH", WRITE, 200, 2, 4, 7, 8)
+    assert _process(proxy, pdu) == pdu[:5]
+    assert client.words[200] == 7
+    assert _process(proxy, _read(200, 2)) == bytes([READ, 4, 0, 7, 0, 8])
+    assert proxy.misses == 0
+
+
+def test_write_single_register(proxy: ModbusProxy, client: FakeClient) -> None:
+    pdu = struct.pack(">BHH", 0x06, 300, 9)
+    assert _process(proxy, pdu) == pdu
+    assert client.words[300] == 9
+
+
+@pytest.mark.parametrize(
+    ("code", "answer"),
+    [(0x02, 0x02), (0x06, 0x0B)],
+)
+def test_refusals_are_passed_on(
+    proxy: ModbusProxy, client: FakeClient, code: int, answer: int
+) -> None:
+    client.refused[101] = code
+    assert _process(proxy, _read(100, 3)) == bytes([READ | 0x80, answer])
+
+
+@pytest.mark.parametrize(
+    ("pdu", "answer"),
+    [
+        (_read(100, 0), bytes([READ | 0x80, 0x03])),
+        (_read(100, 126), bytes([READ | 0x80, 0x03])),
+        (bytes([READ, 0]), bytes([READ | 0x80, 0x03])),
+        (struct.pack(">BHHBH", WRITE, 200, 2, 2, 7), bytes([WRITE | 0x80, 0x03])),
+        (struct.pack(">BHHB", WRITE, 200, 2, 4), bytes([WRITE | 0x80, 0x03])),
+        (struct.pack(">BHH", 0x04, 0, 1), bytes([0x84, 0x01])),
+    ],
+)
+def test_bad_requests_are_refused(
+    proxy: ModbusProxy, client: FakeClient, pdu: bytes, answer: bytes
+) -> None:
+    assert _process(proxy, pdu) == answer
+    assert client.requests == []
@@ -0,0 +1,118 @@
+"""Tests of the telemetry store."""
+
+import math
+import os
+
+import pytest
+
+from pypluggit.store import (
+    TelemetryStore,
+    decode_times,
+    decode_values,
+    encode_times,
+    encode_values,
+)
+
+COLUMNS = ("t1", "t2")
+
+
+def _fill(store: TelemetryStore, rows: int, start: float = 1_700_000_000.0) -> None:
+    for row in range(rows):
+        store.append(start + row, [20 + row / 100, None if row % 7 == 0 else row])
+
+
+def test_round_trip(tmp_path) -> None:
+    path = tmp_path / "unit.pgts"
+    store = TelemetryStore(path, COLUMNS, chunk_rows=64)
+    _fill(store, 200)
+    store.close()
+
+    store = TelemetryStore(path)
+    assert store.columns == COLUMNS
+    assert len(store) == 200
+    assert store.chunks == 4
+    times, values = store.query()
+    assert times[0] == 1_700_000_000.0
+    assert times[-1] == 1_700_000_199.0
+    assert values["t1"][150] == pytest.approx(21.5, abs=1e-5)
+    assert math.isnan(values["t2"][7])
+    assert values["t2"][8] == 8
+    store.close()
+
+
+def test_query_range_and_columns(tmp_path) -> None:
+    store = TelemetryStore(tmp_path / "unit.pgts", COLUMNS, chunk_rows=64)
+    _fill(store, 200)
+    times, values = store.query(1_700_000_100.0, 1_700_000_109.0, ("t2",))
+    assert list(values) == ["t2"]
+    assert len(times) == 10
+    assert values["t2"][0] == 100
+    store.close()
+
+
+def test_rows_out_of_order_are_refused(tmp_path) -> None:
+    store = TelemetryStore(tmp_path / "unit.pgts", COLUMNS)
+    store.append(10.0, [1, 2])
+    with pytest.raises(ValueError):
+        store.append(9.0, [1, 2])
+    store.close()
+
+
+def test_torn_chunk_is_cut_off(tmp_path) -> None:
+    path = tmp_path / "unit.pgts"
+    store = TelemetryStore(path, COLUMNS, chunk_rows=64)
+    _fill(store, 128)
+    store.close()
+    size = path.stat().st_size
+    # A crash in the middle of writing the second chunk.
+    os.truncate(path, size - 10)
+
+    store = TelemetryStore(path)
+    assert store.recovered > 0
+    assert len(store) == 64
+    assert store.span == (1_700_000_000.0, 1_700_000_063.0)
+    # Appending after recovery continues from the good chunks.
+    store.append(1_700_000_064.0, [1, 2])
+    store.close()
+    assert len(TelemetryStore(path)) == 65
+
+
+def test_time_and_value_codecs_round_trip() -> None:
+    times = [1_700_000_000.0, 1_700_000_000.5, 1_700_000_007.123, 1_700_000_007.2]
+    assert decode_times(encode_times(times)) == times
+    values = decode_values(encode_values([1.5, None, -3.25, 1e6]))
+    assert values[0] == 1.5
+    assert math.isnan(values[1])
+    assert list(values[2:]) == [-3.25, 1e6]
+
+
+def test_corrupt_last_chunk_is_cut_off(tmp_path) -> None:
+    path = tmp_path / "unit.pgts"
+    store = TelemetryStore(path, COLUMNS, chunk_rows=64)
+    _fill(store, 128)
+    store.close()
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    store = TelemetryStore(path)
+    assert len(store) == 64
+    store.close()
+
+
+def test_query_spans_chunks_and_buffered_rows(tmp_path) -> None:
+    store = TelemetryStore(tmp_path / "unit.pgts", COLUMNS, chunk_rows=64)
+    _fill(store, 100)
+    store.append(1_700_000_100.0, {"t1": 5.0})
+    times, values = store.query(1_700_000_060.0)
+    assert len(times) == 41
+    assert math.isnan(values["t2"][-1])
+    assert values["t1"][-1] == 5.0
+    store.close()
+
+
+def test_other_columns_are_refused(tmp_path) -> None:
+    path = tmp_path / "unit.pgts"
+    TelemetryStore(path, COLUMNS).close()
+    with pytest.raises(ValueError):
+        TelemetryStore(path, ("t3",))
@@ -0,0 +1,33 @@
+"""Tests of the register sweep."""
+
+from pypluggit.sweep import Snapshot, diff, sweep
+
+
+def test_diff_decodes_changed_values() -> None:
+    before = Snapshot(words={10: 1, 11: 0, 12: 0, 13: 0})
+    after = Snapshot(words={10: 1, 11: 0, 12: 0, 13: 0x41AC})
+    assert diff(before, after) == [
+        {
+            "address": 12,
+            "name": None,
+            "before": {"uint32": 0, "float32": 0.0},
+            "after": {"uint32": 0x41AC0000, "float32": 21.5},
+        }
+    ]
+
+
+class Refused(Exception):
+    """Refused read in the sweep tests."""
+
+
+def test_sweep_bisects_refused_words_and_skips_failures() -> None:
+    def read(address: int, count: int) -> list[int] | None:
+        if address <= 5 < address + count:
+            raise Refused
+        if address <= 20 < address + count:
+            return None
+        return [address + offset for offset in range(count)]
+
+    snapshot = sweep(read, Refused, start=0, end=24, block=8)
+    assert snapshot.unreadable == [5]
+    assert sorted(snapshot.words) == [*range(5), *range(6, 16)]
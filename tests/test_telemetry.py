@@ -0,0 +1,48 @@
+"""Tests of the telemetry frames."""
+
+import math
+
+from pypluggit.const import Registers
+from pypluggit.telemetry import TelemetryBatch, telemetry_row
+
+T1 = Registers.PRM_RAM_IDX_T1
+TAHO = Registers.PRM_HAL_TAHO_1
+REGISTERS = (T1, TAHO)
+
+
+def test_row_is_rounded_and_missing_is_none() -> None:
+    assert telemetry_row(REGISTERS, {T1: 21.456}) == [21.46, None]
+    assert telemetry_row(REGISTERS, {T1: math.nan, TAHO: 1200}) == [None, 1200]
+
+
+def test_frame_holds_columns_of_all_pending_samples() -> None:
+    batch = TelemetryBatch(REGISTERS, batch=1.0)
+    batch.add(10.0001, [21.5, 1200])
+    batch.add(11.0, [21.6, None])
+    assert batch.frame(100.0) == {
+        "t": [10.0, 11.0],
+        "values": {"PRM_RAM_IDX_T1": [21.5, 21.6], "PRM_HAL_TAHO_1": [1200, None]},
+        "dropped": 0,
+    }
+    assert len(batch) == 0
+    assert batch.frame(200.0) is None
+
+
+def test_frames_wait_for_the_batch_interval() -> None:
+    batch = TelemetryBatch(REGISTERS, batch=2.0)
+    assert batch.delay(100.0) == 0
+    batch.add(1.0, [1, 2])
+    batch.frame(100.0)
+    assert batch.delay(100.5) == 1.5
+    assert batch.delay(103.0) == 0
+
+
+def test_oldest_samples_are_dropped_and_counted() -> None:
+    batch = TelemetryBatch(REGISTERS, batch=1.0, max_pending=3)
+    for stamp in range(5):
+        batch.add(float(stamp), [stamp, stamp])
+    frame = batch.frame(0.0)
+    assert frame["t"] == [2.0, 3.0, 4.0]
+    assert frame["dropped"] == 2
+    batch.add(5.0, [5, 5])
+    assert batch.frame(1.0)["dropped"] == 0
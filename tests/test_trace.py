@@ -0,0 +1,47 @@
+"""Tests of Modbus record and replay."""
+
+import struct
+
+import pytest
+
+from pypluggit.pluggit import Pluggit
+from pypluggit.trace import RecordingClient, ReplayClient, load, summary
+
+from .conftest import FakeClient
+
+
+def test_replay_answers_like_the_recording(tmp_path, client: FakeClient) -> None:
+    path = tmp_path / "session.pgtr"
+    recorded = Pluggit("fake", client=RecordingClient(client, path))
+    recorded.set_bypass_tmax(24.0)
+    recorded.close()
+    recorded = Pluggit("fake", client=RecordingClient(client, path))
+    value = recorded.get_bypass_tmax()
+    recorded.close()
+
+    _, records = load(path)
+    assert summary(records)["reads"] == 1
+    replayed = Pluggit("fake", client=ReplayClient(path))
+    assert replayed.get_bypass_tmax() == value == 24.0
+    replayed.close()
+
+
+def test_refusal_keeps_its_exception_code(tmp_path, client: FakeClient) -> None:
+    path = tmp_path / "session.pgtr"
+    client.refused[0] = 0x06
+    recorder = RecordingClient(client, path)
+    assert recorder.read_holding_registers(0, count=2).isError()
+    recorder.close()
+
+    _, records = load(path)
+    assert summary(records)["refused"] == 1
+    replayed = ReplayClient(path).read_holding_registers(0, count=2)
+    assert replayed.isError()
+    assert replayed.exception_code == 0x06
+
+
+def test_other_format_version_is_refused(tmp_path) -> None:
+    path = tmp_path / "old.pgtr"
+    path.write_bytes(struct.pack("<4sBd", b"PGTR", 1, 0.0))
+    with pytest.raises(ValueError):
+        load(path)
@@ -0,0 +1,113 @@
+"""Tests of compound unit mode transitions."""
+
+import pytest
+
+from pypluggit import pluggit as pluggit_module
+from pypluggit.codec import decode, encode
+from pypluggit.const import (
+    REGISTER_DIC,
+    UNIT_MODE_STATE,
+    ActiveUnitMode,
+    Registers,
+    SpeedLevelFan,
+)
+from pypluggit.pluggit import Pluggit
+from pypluggit.worker import Priority
+
+from .conftest import FakeClient
+
+STATE = REGISTER_DIC[Registers.PRM_CURRENT_BL_STATE][0]
+REQUEST = REGISTER_DIC[Registers.PRM_RAM_IDX_UNIT_MODE][0]
+SPEED = REGISTER_DIC[Registers.PRM_ROM_IDX_SPEED_LEVEL][0]
+STATES = {mode.value: state for mode, state in UNIT_MODE_STATE.items()}
+
+
+class LaggingUnit(FakeClient):
+    """Unit showing a requested mode only after a few reads of its state."""
+
+    def __init__(self, state: int, lag: int) -> None:
+        super().__init__()
+        self._set_state(state)
+        self.lag = lag
+        self._pending: int | None = None
+        self._reads_left = 0
+
+    def read_holding_registers(self, address: int, count: int = 1, **kwargs):
+        if address == STATE and self._pending is not None:
+            if self._reads_left == 0:
+                self._set_state(self._pending)
+                self._pending = None
+            self._reads_left -= 1
+        return super().read_holding_registers(address, count, **kwargs)
+
+    def write_registers(self, address: int, values: list[int], **kwargs):
+        ret = super().write_registers(address, values, **kwargs)
+        if address == REQUEST:
+            request = decode(Registers.PRM_RAM_IDX_UNIT_MODE, values)
+            if request in STATES:
+                self._pending = STATES[request]
+                self._reads_left = self.lag
+            elif request & 0x8000:
+                self._set_state(UNIT_MODE_STATE[ActiveUnitMode.WEEK_PROGRAM_MODE])
+        return ret
+
+    def _set_state(self, state: int) -> None:
+        self.words.update(
+            zip((STATE, STATE + 1), encode(Registers.PRM_CURRENT_BL_STATE, state))
+        )
+
+
+@pytest.fixture(autouse=True)
+def _fast_settle(monkeypatch) -> None:
+    monkeypatch.setattr(pluggit_module, "MODE_POLL", 0)
+    monkeypatch.setattr(pluggit_module, "MODE_GAP", 0)
+
+
+def _speed(client: FakeClient) -> int:
+    words = [client.words[SPEED], client.words[SPEED + 1]]
+    return decode(Registers.PRM_ROM_IDX_SPEED_LEVEL, words)
+
+
+def test_speed_is_set_once_the_mode_settles() -> None:
+    away = UNIT_MODE_STATE[ActiveUnitMode.AWAY_MODE]
+    client = LaggingUnit(away, lag=3)
+    unit = Pluggit("fake", client=client)
+    assert unit.transition_to(ActiveUnitMode.MANUAL_MODE, SpeedLevelFan.LEVEL_3)
+    unit.close()
+    assert _speed(client) == 3
+    # One END_AWAY and one MANUAL request, no repeat for the slow read back.
+    assert [r for r in client.requests if r[1] == REQUEST] == [
+        (0x10, REQUEST, 2),
+        (0x10, REQUEST, 2),
+    ]
+
+
+def test_speed_is_not_written_when_the_mode_never_settles(monkeypatch, caplog) -> None:
+    monkeypatch.setattr(pluggit_module, "MODE_SETTLE", 0)
+    away = UNIT_MODE_STATE[ActiveUnitMode.AWAY_MODE]
+    client = LaggingUnit(away, lag=100)
+    unit = Pluggit("fake", client=client)
+    unit.transition_to(ActiveUnitMode.MANUAL_MODE, SpeedLevelFan.LEVEL_3)
+    unit.close()
+    assert SPEED not in client.words
+    assert "not set" in caplog.text
+
+
+def test_mode_is_confirmed_outside_the_write_job() -> None:
+    away = UNIT_MODE_STATE[ActiveUnitMode.AWAY_MODE]
+    client = LaggingUnit(away, lag=3)
+    unit = Pluggit("fake", client=client)
+    submit = unit._worker.submit
+    priorities = []
+
+    def record(job, priority):
+        priorities.append(priority)
+        return submit(job, priority)
+
+    unit._worker.submit = record
+    unit.transition_to(ActiveUnitMode.MANUAL_MODE, SpeedLevelFan.LEVEL_3)
+    unit.close()
+    # Exit and request in one write job, the speed in another, and every
+    # read of the mode a command job of its own.
+    assert priorities.count(Priority.WRITE) == 2
+    assert priorities.count(Priority.COMMAND) == len(priorities) - 2 > 1
@@ -0,0 +1,145 @@
+"""Tests of bisecting refused reads and remembering the refused addresses."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+from pypluggit.blocks import Block, async_bisect_read, bisect_read
+from pypluggit.codec import encode
+from pypluggit.const import REGISTER_DIC, Registers
+from pypluggit import pluggit as pluggit_module
+from pypluggit.pluggit import IDENTITY_RETRY, Pluggit
+from pypluggit.unreadable import UnreadableIndex
+
+from .conftest import READ, FakeClient
+
+T1 = Registers.PRM_RAM_IDX_T1
+T1_ADDRESS = REGISTER_DIC[T1][0]
+
+
+def _address(register: Registers) -> int:
+    return REGISTER_DIC[register][0]
+
+
+def _unit(client: FakeClient, tmp_path) -> tuple[Pluggit, UnreadableIndex]:
+    client.words.update({4: 1234, 6: 1, 24: 0x030E})
+    index = UnreadableIndex(tmp_path / "unreadable")
+    return Pluggit("fake", client=client, unreadable_index=index), index
+
+
+def test_illegal_address_is_remembered(client: FakeClient, tmp_path) -> None:
+    pluggit, index = _unit(client, tmp_path)
+    client.refused[T1_ADDRESS] = 0x02
+    assert pluggit.read_registers([T1]) == {}
+    pluggit.close()
+    assert T1_ADDRESS in index.get("4294968530-3.14")
+
+
+def test_busy_reply_never_reaches_the_index(client: FakeClient, tmp_path) -> None:
+    pluggit, index = _unit(client, tmp_path)
+    client.refused[T1_ADDRESS] = 0x06
+    assert pluggit.read_registers([T1]) == {}
+    assert index.get("4294968530-3.14") == set()
+
+    # Once the unit is no longer busy the register reads again.
+    del client.refused[T1_ADDRESS]
+    client.requests.clear()
+    assert T1 in pluggit.read_registers([T1])
+    assert (READ, T1_ADDRESS, 2) in client.requests
+    pluggit.close()
+
+
+def test_identity_is_retried_after_backoff(
+    client: FakeClient, tmp_path, monkeypatch
+) -> None:
+    now = [0.0]
+    fake_time = SimpleNamespace(monotonic=lambda: now[0], sleep=time.sleep)
+    monkeypatch.setattr(pluggit_module, "time", fake_time)
+    pluggit, index = _unit(client, tmp_path)
+    index.add("4294968530-3.14", {T1_ADDRESS})
+    firmware = (READ, _address(Registers.PRM_FW_VERSION), 2)
+    # The firmware version can't be read, so the identity stays unknown.
+    client.refused[firmware[1]] = 0x06
+
+    pluggit.read_registers([T1])
+    pluggit.read_registers([T1])
+    assert client.requests.count(firmware) == 1
+
+    # The index is only consulted once the identity is known.
+    del client.refused[firmware[1]]
+    now[0] = IDENTITY_RETRY
+    client.requests.clear()
+    assert pluggit.read_registers([T1]) == {}
+    assert (READ, T1_ADDRESS, 2) not in client.requests
+    pluggit.read_registers([T1])
+    assert client.requests.count(firmware) == 1
+    pluggit.close()
+
+
+def test_refused_block_is_bisected_and_remembered(pluggit, client: FakeClient) -> None:
+    t1, t2 = Registers.PRM_RAM_IDX_T1, Registers.PRM_RAM_IDX_T4
+    client.words.update(zip(range(_address(t1), _address(t1) + 2), encode(t1, 21.5)))
+    client.words.update(zip(range(_address(t2), _address(t2) + 2), encode(t2, 18.0)))
+    # A word between the two registers the unit refuses to read.
+    gap = _address(t1) + 2
+    assert gap < _address(t2)
+    client.refused[gap] = 0x02
+
+    assert pluggit.read_registers([t1, t2]) == {t1: 21.5, t2: 18.0}
+
+    client.requests.clear()
+    assert pluggit.read_registers([t1, t2]) == {t1: 21.5, t2: 18.0}
+    # Known unreadable words are left out of the plan, no more refusals.
+    assert all(
+        not (address <= gap < address + count)
+        for function, address, count in client.requests
+        if function == READ
+    )
+
+
+class Refused(Exception):
+    """Refused read in the bisect_read tests."""
+
+
+def _reader(refused: set[int], failing: set[int] = frozenset()):
+    def read(block: Block) -> list[int] | None:
+        addresses = range(block.address, block.end)
+        if any(address in refused for address in addresses):
+            raise Refused
+        if any(address in failing for address in addresses):
+            return None
+        return list(addresses)
+
+    return read
+
+
+def test_bisect_read_finds_refused_gap() -> None:
+    words, unreadable = bisect_read([(10, 2), (14, 2)], _reader({12}), Refused)
+    assert words == {10: 10, 11: 11, 14: 14, 15: 15}
+    assert unreadable == {12, 13}
+
+
+def test_bisect_read_refused_span() -> None:
+    words, unreadable = bisect_read([(10, 2), (14, 2)], _reader({14}), Refused)
+    assert words == {10: 10, 11: 11}
+    assert unreadable == {14, 15}
+
+
+def test_bisect_read_failure_is_not_unreadable() -> None:
+    words, unreadable = bisect_read(
+        [(10, 2), (14, 2)], _reader({12}, failing={14}), Refused
+    )
+    assert words == {10: 10, 11: 11}
+    assert unreadable == set()
+
+
+def test_async_bisect_read_matches_bisect_read() -> None:
+    read = _reader({12})
+
+    async def async_read(block: Block) -> list[int] | None:
+        return read(block)
+
+    spans = [(10, 2), (14, 2), (20, 1)]
+    assert asyncio.run(async_bisect_read(spans, async_read, Refused)) == (
+        bisect_read(spans, read, Refused)
+    )
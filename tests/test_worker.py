@@ -0,0 +1,102 @@
+"""Tests of the priority I/O worker."""
+
+import threading
+import time
+
+import pytest
+
+from pypluggit.worker import IOWorker, Priority
+
+from .conftest import FakeClient
+
+
+def _queued(worker: IOWorker) -> int:
+    return worker._queue.qsize()  # noqa: SLF001
+
+
+class Recorder:
+    """Worker jobs that log their name once run, the first one blocks."""
+
+    def __init__(self, worker: IOWorker) -> None:
+        self.worker = worker
+        self.order: list[str] = []
+        self.busy = threading.Event()
+        self.release = threading.Event()
+        self.threads: list[threading.Thread] = []
+
+    def job(self, name: str):
+        def run(_client) -> str:
+            if name == "busy":
+                self.busy.set()
+                self.release.wait(5)
+            self.order.append(name)
+            return name
+
+        return run
+
+    def submit(self, name: str, priority: Priority) -> None:
+        queued = _queued(self.worker)
+        thread = threading.Thread(
+            target=self.worker.submit, args=(self.job(name), priority)
+        )
+        thread.start()
+        self.threads.append(thread)
+        deadline = time.monotonic() + 5
+        while _queued(self.worker) <= queued:
+            assert time.monotonic() < deadline
+            time.sleep(0.001)
+
+    def finish(self) -> list[str]:
+        self.release.set()
+        for thread in self.threads:
+            thread.join(5)
+        return self.order
+
+
+@pytest.fixture
+def recorder():
+    worker = IOWorker(FakeClient())
+    ret = Recorder(worker)
+    thread = threading.Thread(
+        target=worker.submit, args=(ret.job("busy"), Priority.POLL)
+    )
+    thread.start()
+    ret.threads.append(thread)
+    # The worker thread runs busy and blocks, later jobs queue behind it.
+    assert ret.busy.wait(5)
+    yield ret
+    ret.release.set()
+    worker.close()
+
+
+def test_write_overtakes_queued_polls(recorder: Recorder) -> None:
+    for index in range(3):
+        recorder.submit(f"poll{index}", Priority.POLL)
+    recorder.submit("write", Priority.WRITE)
+    assert recorder.finish() == ["busy", "write", "poll0", "poll1", "poll2"]
+
+
+def test_commands_run_before_polls_after_writes(recorder: Recorder) -> None:
+    recorder.submit("poll", Priority.POLL)
+    recorder.submit("command", Priority.COMMAND)
+    recorder.submit("write", Priority.WRITE)
+    assert recorder.finish() == ["busy", "write", "command", "poll"]
+
+
+def test_nested_submit_runs_inline() -> None:
+    worker = IOWorker(FakeClient())
+    try:
+        result = worker.submit(
+            lambda _client: worker.submit(lambda _inner: "inner", Priority.WRITE)
+        )
+    finally:
+        worker.close()
+    assert result == "inner"
+
+
+def test_close_drains_pending_jobs() -> None:
+    worker = IOWorker(FakeClient())
+    assert worker.submit(lambda _client: 1) == 1
+    worker.close()
+    with pytest.raises(RuntimeError):
+        worker.submit(lambda _client: 2)